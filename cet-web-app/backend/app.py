@@ -1,6 +1,6 @@
 # D:\CET_Prediction\cet-web-app\backend\app.py
 
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify, stream_with_context
 from flask_cors import CORS
 from dotenv import load_dotenv
 from flask_jwt_extended import JWTManager
@@ -9,7 +9,13 @@ from routes.college_directory import college_directory_bp
 from routes.college_comparison_routes import college_comparison_bp
 from routes.chatbot_route import chatbot_bp
 from routes.resource_vault_route import resource_vault_bp  # ✅ NEW: Resource Vault import
-import pandas as pd
+from services import runtime
+from utils import logger as app_logging
+from utils.data_snapshot import BACKEND_DIR, load_table
+from utils.frame_records import frame_records
+from utils.http_cache import cached_json
+from utils.streaming import frame_rows, stream_format, stream_rows
+from utils.data_registry import get_dataset, memory_report
 import os
 
 # Load environment variables
@@ -18,6 +24,9 @@ load_dotenv()
 app = Flask(__name__)
 CORS(app)
 
+# Structured logging: LOG_LEVEL env + per-request debug (X-Debug header / ?debug=1)
+app_logging.init_app(app)
+
 # ============================================================
 # JWT Configuration
 # ============================================================
@@ -40,7 +49,7 @@ try:
     comparison_csv_path = 'data/merged_cutoff_2021_2025.csv'
     if os.path.exists(comparison_csv_path):
         print(f"📂 Loading comparison data...")
-        comparison_df = pd.read_csv(comparison_csv_path)
+        comparison_df = get_dataset(comparison_csv_path)
         comparison_df['year'] = comparison_df['year'].astype(str)
         print(f"✅ Loaded comparison data: {len(comparison_df):,} records")
     else:
@@ -59,10 +68,18 @@ app.register_blueprint(chatbot_bp, url_prefix='/api/chatbot')
 app.register_blueprint(resource_vault_bp)  # ✅ NEW: Register Resource Vault blueprint
 print("✅ All blueprints registered (including chatbot & resource vault)")
 
+_shared = memory_report()
+print(f"📦 Shared datasets: {len(_shared['datasets'])} "
+      f"({_shared['total_dataset_bytes'] / 1024 / 1024:.1f} MB), models: {len(_shared['models'])}")
+
 @app.route('/', methods=['GET'])
 def home():
     endpoints = {
         'health': 'GET /api/health',
+        'readiness': 'GET /api/ready',
+        'reload_data': 'POST /api/reload',
+        'reload_status': 'GET /api/reload/status',
+        'debug_memory': 'GET /api/debug/memory',
         'model_info': 'GET /api/model-info',
         'predict': 'POST /api/predict',
         
@@ -138,6 +155,57 @@ def health():
         }
     })
 
+@app.route('/api/ready', methods=['GET'])
+def readiness():
+    """
+    Readiness probe: 200 once predictor, comparator and college directory
+    are built for the active data version, 503 while warming up.
+    """
+    status = runtime.current().status()
+    return jsonify({'success': True, **status}), 200 if status['ready'] else 503
+
+@app.route('/api/reload', methods=['POST'])
+def reload_data():
+    """
+    Rebuild predictor/comparator/directory from the current data and model
+    files in the background and swap them in atomically.
+    Query: ?wait=1 to respond after the swap (200 with the reload result,
+    500 if it failed; 202 Accepted without wait). Requires the
+    X-Reload-Token header when RELOAD_TOKEN is set.
+    """
+    if not runtime.reload_allowed(request.headers.get('X-Reload-Token')):
+        return jsonify({'success': False, 'error': 'Invalid reload token'}), 403
+
+    wait = request.args.get('wait', '').lower() in ('1', 'true', 'yes')
+    result = runtime.reload(wait=wait)
+    if not result['started']:
+        return jsonify({'success': False, **result}), 409
+    if not wait:
+        return jsonify({'success': True, **result}), 202
+    if result['last_reload'].get('status') != 'ok':
+        return jsonify({'success': False, **result}), 500
+    return jsonify({'success': True, **result}), 200
+
+@app.route('/api/reload/status', methods=['GET'])
+def reload_status():
+    """Active data/model version and outcome of the last reload"""
+    return jsonify({'success': True, **runtime.reload_status()})
+
+@app.route('/api/debug/memory', methods=['GET'])
+def debug_memory():
+    """
+    Memory of this worker: shared datasets (pandas deep memory_usage, and
+    the size with default dtypes), component-owned tables and process RSS
+    """
+    state = runtime.current()
+    predictor = state.get('predictor')
+    comparator = state.get('comparator')
+    report = memory_report({
+        'predictor.college_data': getattr(predictor, 'college_data', None),
+        'comparator.cutoff_data': getattr(comparator, 'cutoff_data', None)
+    })
+    return jsonify({'success': True, 'version': state.version, **report})
+
 @app.route('/api/test-blueprint', methods=['GET'])
 def test_blueprint():
     return jsonify({
@@ -155,45 +223,93 @@ def test_blueprint():
         ]
     })
 
+# Rows per /api/colleges/dataset page (default) and per streamed chunk
+DATASET_PAGE_SIZE = int(os.getenv('DATASET_PAGE_SIZE', '1000'))
+DATASET_MAX_PAGE_SIZE = int(os.getenv('DATASET_MAX_PAGE_SIZE', '10000'))
+DATASET_STREAM_CHUNK = 2000
+
+def _dataset_request(df, streamed):
+    """(offset, limit or None for 'all', columns) from the query string; ValueError on bad input"""
+    offset = int(request.args.get('offset', 0))
+    limit = request.args.get('limit', '')
+    if limit == 'all' or (streamed and not limit):
+        limit = None
+    else:
+        limit = int(limit) if limit else DATASET_PAGE_SIZE
+        if not 0 < limit <= DATASET_MAX_PAGE_SIZE:
+            raise ValueError(f"limit must be between 1 and {DATASET_MAX_PAGE_SIZE}, or 'all'")
+    if offset < 0:
+        raise ValueError("offset must be a non-negative integer")
+
+    fields = request.args.get('fields')
+    columns = list(df.columns)
+    if fields:
+        requested = [f.strip() for f in fields.split(',') if f.strip()]
+        unknown = [f for f in requested if f not in columns]
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(unknown)} (available: {', '.join(columns)})")
+        columns = requested
+    return offset, limit, columns
+
+def _stream_dataset(df, offset, columns):
+    """Full table from `offset` as one JSON document, encoded chunk by chunk"""
+    total = len(df)
+    header = app.json.dumps({'success': True, 'total': total, 'offset': offset,
+                             'limit': None, 'columns': columns})
+    yield header[:-1] + ',"data":['
+    for start in range(offset, total, DATASET_STREAM_CHUNK):
+        chunk = app.json.dumps(frame_records(df, start, start + DATASET_STREAM_CHUNK, columns))
+        yield ('' if start == offset else ',') + chunk[1:-1]
+    yield f'],"count":{max(total - offset, 0)}}}'
+
 @app.route('/api/colleges/dataset', methods=['GET'])
+@cached_json(version=lambda: runtime.current().version, maxsize=64)
 def get_college_dataset():
+    """
+    Flattened CAP dataset from the shared in-memory copy (data registry).
+    
+    Paged: offset (default 0), limit (default DATASET_PAGE_SIZE, at most
+    DATASET_MAX_PAGE_SIZE) and fields (comma separated column names). Pages
+    are encoded once per data version (cached_json); limit=all streams the
+    whole table in chunks instead (not cached). ?format=ndjson|csv (or
+    Accept: application/x-ndjson) streams rows, all of them unless a limit
+    is given.
+    """
     try:
-        file_path = 'backend/data/flattened_CAP_data done.xlsx'
-        
-        print(f"📂 Looking for file at: {file_path}")
-        print(f"📁 Current working directory: {os.getcwd()}")
-        print(f"🔍 File exists: {os.path.exists(file_path)}")
-        
-        if not os.path.exists(file_path):
-            absolute_path = 'D:/CET_Prediction/cet-web-app/backend/data/flattened_CAP_data done.xlsx'
-            if os.path.exists(absolute_path):
-                file_path = absolute_path
-                print(f"✅ Found file at absolute path: {file_path}")
-            else:
-                return jsonify({
-                    'success': False,
-                    'error': f'Excel file not found at: {file_path}',
-                    'current_directory': os.getcwd(),
-                    'files_in_data_dir': os.listdir('backend/data') if os.path.exists('backend/data') else 'Directory not found'
-                }), 404
+        df = get_dataset(os.path.join(BACKEND_DIR, 'data', 'flattened_CAP_data done.xlsx'))
         
-        print("📊 Reading Excel file...")
-        df = pd.read_excel(file_path)
+        try:
+            fmt = stream_format()
+            offset, limit, columns = _dataset_request(df, streamed=fmt is not None)
+        except ValueError as e:
+            return jsonify({'success': False, 'error': str(e)}), 400
         
-        df = df.where(pd.notna(df), None)
+        if fmt:
+            stop = offset + limit if limit is not None else None
+            return stream_rows(frame_rows(df, columns, offset, stop), fmt,
+                               columns=columns, filename='cap_dataset')
         
-        data = df.to_dict('records')
+        if limit is None:
+            return Response(stream_with_context(_stream_dataset(df, offset, columns)),
+                            mimetype='application/json')
         
-        print(f"✅ Successfully loaded {len(data)} records")
+        data = frame_records(df, offset, offset + limit, columns)
+        next_offset = offset + len(data)
         
         return jsonify({
             'success': True,
             'data': data,
             'count': len(data),
-            'columns': list(df.columns),
+            'total': len(df),
+            'offset': offset,
+            'limit': limit,
+            'next_offset': next_offset if next_offset < len(df) else None,
+            'columns': columns,
             'sample_size': min(5, len(data))
         })
         
+    except FileNotFoundError as e:
+        return jsonify({'success': False, 'error': f'Dataset not found: {e}'}), 404
     except Exception as e:
         print(f"❌ Error loading dataset: {str(e)}")
         import traceback
@@ -225,7 +341,7 @@ def directory_stats():
                     'files_in_data_dir': os.listdir('backend/data') if os.path.exists('backend/data') else []
                 }), 404
         
-        df = pd.read_excel(dir_path, nrows=5)
+        df = load_table(dir_path, nrows=5)
         
         return jsonify({
             'success': True,
@@ -476,7 +592,7 @@ if __name__ == '__main__':
     if os.path.exists(comparison_csv):
         print(f"  ✅ Comparison data: {comparison_csv}")
         try:
-            test_df = pd.read_csv(comparison_csv)
+            test_df = load_table(comparison_csv)
             print(f"     📊 Records: {len(test_df):,}")
             
             branch_col = None
@@ -508,4 +624,7 @@ if __name__ == '__main__':
     print("✅ Server starting...")
     print("="*60 + "\n")
     
+    # Build the college directory in the background; /api/ready reports progress
+    runtime.warm_up()
+
     app.run(debug=True, port=5000, host='0.0.0.0')
\ No newline at end of file
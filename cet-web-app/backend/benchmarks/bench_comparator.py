@@ -0,0 +1,86 @@
+"""
+Benchmark: CollegeComparator.compare_colleges for 2, 5 and 10 colleges.
+
+Compares the indexed lookups (utils.cutoff_index.CutoffIndex) against
+full-table boolean masks (college code, branch, category) over the cutoff
+store, and checks both return the same records.
+
+Run from the backend directory:
+    python benchmarks/bench_comparator.py
+"""
+import contextlib
+import io
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.chdir(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('LOG_LEVEL', 'WARNING')
+
+from utils.college_comparator import CollegeComparator
+
+BRANCH = 'Computer Engineering'
+CATEGORY = 'GOPENS'
+SIZES = [2, 5, 10]
+REPEAT = 20
+
+
+def scan(df, comparator, college_code, branch, branch_normalized, category):
+    """Previous lookup: boolean masks over the whole table"""
+    if df.empty:
+        return []
+    rows = df[df['college_code'] == college_code]
+    rows = rows[(rows['branch_name'].str.lower() == branch.lower()) |
+                (rows['branch_normalized'] == branch_normalized)]
+    rows = rows[rows['category'] == category].copy()
+    rows['college_url'] = comparator.college_urls.get(college_code, '')
+    return rows.to_dict('records')
+
+
+def compare_by_scan(comparator, college_codes, branch, category):
+    """compare_colleges with a scan-based get_college_data"""
+    branch_normalized = comparator.normalize_branch(branch)
+    result = {}
+    for college_code in college_codes:
+        data = scan(comparator.cutoff_data, comparator, college_code, branch, branch_normalized, category)
+        data.sort(key=lambda x: x['year'])
+        result[college_code] = data
+    return result
+
+
+def timed(fn, repeat=REPEAT):
+    """Best-of-N wall time in milliseconds (comparator output silenced)"""
+    best = float('inf')
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn()
+            best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    with contextlib.redirect_stdout(io.StringIO()):
+        comparator = CollegeComparator()
+    table = comparator.cutoff_data
+    print(f"Cutoff store rows: {len(table)}")
+
+    random.seed(0)
+    codes = sorted(table['college_code'].unique())
+    print(f"{'colleges':>8} {'scan ms':>10} {'index ms':>10} {'speedup':>8}")
+    for size in SIZES:
+        sample = random.sample(codes, size)
+        with contextlib.redirect_stdout(io.StringIO()):
+            expected = compare_by_scan(comparator, sample, BRANCH, CATEGORY)
+            actual = comparator.compare_colleges(sample, BRANCH, CATEGORY)
+        assert actual == expected, f"indexed comparison differs for {sample}"
+
+        scan_ms = timed(lambda: compare_by_scan(comparator, sample, BRANCH, CATEGORY))
+        index_ms = timed(lambda: comparator.compare_colleges(sample, BRANCH, CATEGORY))
+        print(f"{size:>8} {scan_ms:>10.2f} {index_ms:>10.2f} {scan_ms / index_ms:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
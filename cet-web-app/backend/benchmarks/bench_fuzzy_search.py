@@ -0,0 +1,134 @@
+"""
+Benchmark: /api/search lookups replayed from a query log, plain vs fuzzy.
+
+Each logged query runs against the predictor's search indexes
+(services.predictor search_indexes) as the endpoint would: plain
+(substring, the default) and fuzzy (?fuzzy=1: aliases and typos). Reports
+per mode how many queries found anything, how often the intended result
+(third log column) is in the top 1 / top 5, and the per-query latency
+with the word-match cache cleared (cold) and over an in-order replay of
+the whole log (warm, as typeahead runs it). Queries whose intended result
+fuzzy search misses are listed at the end.
+
+Log format (benchmarks/search_queries.tsv): type <TAB> query [<TAB> expected]
+
+Run from the backend directory:
+    python benchmarks/bench_fuzzy_search.py [query_log.tsv]
+"""
+import contextlib
+import io
+import os
+import re
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('LOG_LEVEL', 'WARNING')
+
+with contextlib.redirect_stdout(io.StringIO()):
+    from app import app  # noqa: F401  (registers the runtime components)
+    from services import runtime
+    runtime.warm_up(wait=True)
+
+DEFAULT_LOG = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'search_queries.tsv')
+LIMIT = 20
+REPEAT = 20
+# Fuzzy lookups should stay under this per query (cold cache, p95)
+BUDGET_US = 1000
+
+
+def read_log(path):
+    """[(type, query, expected or None)] from a tab-separated query log"""
+    entries = []
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            line = line.rstrip('\n')
+            if not line.strip() or line.startswith('#'):
+                continue
+            fields = line.split('\t')
+            expected = fields[2].strip().lower() if len(fields) > 2 and fields[2].strip() else None
+            entries.append((fields[0], fields[1], expected))
+    return entries
+
+
+def lookup(index, search_type, query, fuzzy):
+    """Ranked values like /api/search returns them ([] for an invalid pattern)"""
+    try:
+        return index.search_values(query, ranked=True, limit=LIMIT,
+                                   regex=search_type == 'college', fuzzy=fuzzy)
+    except re.error:
+        return []
+
+
+def cold_us(index, search_type, query, fuzzy):
+    """Median microseconds of one lookup with the fuzzy word cache cleared"""
+    times = []
+    for _ in range(REPEAT):
+        index.fuzzy._word_matches.cache_clear()
+        start = time.perf_counter()
+        lookup(index, search_type, query, fuzzy)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1e6
+
+
+def rank_of(results, expected):
+    for rank, value in enumerate(results):
+        if expected in value.lower():
+            return rank
+    return None
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(q * (len(values) - 1))))]
+
+
+def main():
+    path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_LOG
+    entries = read_log(path)
+    indexes = runtime.current().get('predictor').search_indexes
+    print(f"{len(entries)} queries from {os.path.relpath(path)}")
+
+    misses = []
+    print(f"\n{'mode':<6} {'found':>7} {'top1':>7} {'top5':>7} {'p50 us':>8} {'p95 us':>8} {'max us':>8} "
+          f"{'replay us/q':>12}")
+    for fuzzy in (False, True):
+        found = top1 = top5 = judged = 0
+        cold = []
+        for search_type, query, expected in entries:
+            index = indexes[search_type]
+            results = lookup(index, search_type, query, fuzzy)
+            found += bool(results)
+            cold.append(cold_us(index, search_type, query, fuzzy))
+            if expected is None:
+                continue
+            judged += 1
+            rank = rank_of(results, expected)
+            top1 += rank == 0
+            top5 += rank is not None and rank < 5
+            if fuzzy and (rank is None or rank >= 5):
+                misses.append((search_type, query, expected, results[:3]))
+
+        # In-order replay with the word cache live, as the endpoint sees the log
+        for index in indexes.values():
+            index.fuzzy._word_matches.cache_clear()
+        start = time.perf_counter()
+        for search_type, query, _ in entries:
+            lookup(indexes[search_type], search_type, query, fuzzy)
+        replay = (time.perf_counter() - start) / len(entries) * 1e6
+
+        mode = 'fuzzy' if fuzzy else 'plain'
+        print(f"{mode:<6} {found:>3}/{len(entries):<3} {top1:>3}/{judged:<3} {top5:>3}/{judged:<3} "
+              f"{percentile(cold, 0.5):>8.0f} {percentile(cold, 0.95):>8.0f} {max(cold):>8.0f} {replay:>12.0f}")
+        if fuzzy and percentile(cold, 0.95) > BUDGET_US:
+            print(f"⚠️ fuzzy p95 above the {BUDGET_US} us budget")
+
+    if misses:
+        print("\nIntended result not in the fuzzy top 5:")
+        for search_type, query, expected, results in misses:
+            print(f"  {search_type:<8} {query!r:<28} want {expected!r}, got {results}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+"""
+Benchmark: requests/sec of the static list endpoints with and without the
+pre-encoded payload cache (utils.http_cache.cached_json).
+
+"before" calls the undecorated view (re-derive + jsonify on every request)
+inside a request context; "after" goes through the decorated view, both for
+a plain GET and a conditional GET answered with 304. Also checks that the
+cached body is byte-identical to a fresh render.
+
+Run from the backend directory:
+    python benchmarks/bench_payload_cache.py
+"""
+import contextlib
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('LOG_LEVEL', 'WARNING')
+
+with contextlib.redirect_stdout(io.StringIO()):
+    from app import app
+    from services import runtime
+    runtime.warm_up(wait=True)
+
+ENDPOINTS = [
+    '/api/colleges/directory',
+    '/api/colleges/stats',
+    '/api/filters',
+    '/api/colleges/cities',
+    '/api/colleges/types',
+    '/api/resources/documents',
+    '/api/resources/scholarships',
+    '/api/resources/summary',
+]
+DURATION = 1.0
+
+
+def rate(fn, duration=DURATION):
+    """Calls per second of `fn` over ~`duration` seconds (output silenced)"""
+    calls = 0
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        while time.perf_counter() - start < duration:
+            fn()
+            calls += 1
+    return calls / (time.perf_counter() - start)
+
+
+def main():
+    print(f"{'endpoint':<30} {'bytes':>9} {'gzip':>8} {'before/s':>10} {'after/s':>10} {'304/s':>10}")
+    for path in ENDPOINTS:
+        endpoint, _ = app.url_map.bind('localhost').match(path)
+        view = app.view_functions[endpoint]
+        raw_view = view.__wrapped__
+
+        def before():
+            with app.test_request_context(path):
+                result = raw_view()
+                response = result[0] if isinstance(result, tuple) else result
+                return response.get_data()
+
+        def after(headers=None):
+            with app.test_request_context(path, headers=headers or {}):
+                return view().get_data()
+
+        # Warm the cache, then compare against a fresh render
+        with app.test_request_context(path, headers={'Accept-Encoding': 'gzip'}):
+            first = view()
+        if isinstance(first, tuple):
+            print(f"{path:<30} not cached: status {first[1]}")
+            continue
+        etag = first.get_etag()[0]
+        cached = after()
+        fresh = before()
+        if path != '/api/colleges/directory':  # only its timestamp differs per render
+            assert cached == fresh, f"cached body differs for {path}"
+        conditional = {'If-None-Match': f'"{etag}"'}
+        with app.test_request_context(path, headers=conditional):
+            assert view().status_code == 304
+
+        gz = first.headers.get('Content-Encoding') == 'gzip'
+        print(f"{path:<30} {len(cached):>9} {(len(first.get_data()) if gz else '-'):>8} "
+              f"{rate(before):>10.0f} {rate(after):>10.0f} "
+              f"{rate(lambda: after(conditional)):>10.0f}")
+
+
+if __name__ == '__main__':
+    main()
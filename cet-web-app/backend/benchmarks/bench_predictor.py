@@ -0,0 +1,55 @@
+"""
+Benchmark: multi-branch prediction cost vs number of requested branches.
+
+Compares the single-pass CollegePredictor.predict_multiple_branches against
+running predict_colleges once per branch (the previous behaviour).
+
+Run from the backend directory:
+    python benchmarks/bench_predictor.py
+"""
+import contextlib
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('LOG_LEVEL', 'WARNING')
+
+from services.predictor import CollegePredictor
+
+BRANCHES = [
+    'Computer Engineering', 'Information Technology', 'Mechanical Engineering',
+    'Civil Engineering', 'Electrical Engineering', 'Electronics',
+    'Artificial Intelligence', 'Chemical Engineering'
+]
+REQUEST = dict(rank=15000, percentile=88.5, category='OBC', gender='Male', city=None)
+REPEAT = 20
+
+
+def timed(fn, repeat=REPEAT):
+    """Best-of-N wall time in milliseconds (predictor output silenced)"""
+    best = float('inf')
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn()
+            best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def per_branch_loop(predictor, branches):
+    for branch in branches:
+        predictor.predict_colleges(branch=branch, limit=100, **REQUEST)
+
+
+if __name__ == '__main__':
+    with contextlib.redirect_stdout(io.StringIO()):
+        predictor = CollegePredictor()
+
+    print(f"{'branches':>8} {'batched ms':>12} {'per-branch ms':>14} {'speedup':>8}")
+    for n in [1, 2, 4, 8]:
+        branches = BRANCHES[:n]
+        batched = timed(lambda: predictor.predict_multiple_branches(branches=branches, limit=100, **REQUEST))
+        looped = timed(lambda: per_branch_loop(predictor, branches))
+        print(f"{n:>8} {batched:>12.2f} {looped:>14.2f} {looped / batched:>7.1f}x")
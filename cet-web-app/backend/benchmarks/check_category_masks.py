@@ -0,0 +1,89 @@
+"""
+Check + timing for the precomputed allowed-category bitmask of
+CollegePredictor (_allowed_category_mask).
+
+For every category (CATEGORY_MAP keys in several spellings plus unknown
+ones) and every gender spelling, asserts the mask read from the bitmask
+equals the one built per request before: category_mask() of
+_get_allowed_categories(), minus the ladies-only codes for males. Then
+times both and checks a few predictions end to end.
+
+Run from the backend directory:
+    python benchmarks/check_category_masks.py
+"""
+import contextlib
+import io
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('LOG_LEVEL', 'WARNING')
+
+from services.predictor import CollegePredictor
+
+GENDERS = [None, '', 'M', 'm', 'Male', ' male ', 'F', 'f', 'Female', 'FEMALE', 'Other']
+EXTRA_CATEGORIES = ['open', ' obc ', 'Nt1', 'tfws', 'GOPENS', 'UNKNOWN', '']
+REPEAT = 2000
+
+
+def previous_mask(predictor, category, gender):
+    """Per-request construction the bitmask replaces"""
+    category_ok = predictor.index.category_mask(predictor._get_allowed_categories(category, gender))
+    if predictor.normalize_gender(gender) == 'M':
+        category_ok &= ~predictor._ladies_only_mask
+    return category_ok
+
+
+def timed_us(fn, repeat=REPEAT):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def main():
+    with contextlib.redirect_stdout(io.StringIO()):
+        predictor = CollegePredictor()
+
+    categories = list(predictor.CATEGORY_MAP) + EXTRA_CATEGORIES
+    checked = 0
+    for category in categories:
+        for gender in GENDERS:
+            expected = previous_mask(predictor, category, gender)
+            actual = predictor._allowed_category_mask(category, gender)
+            assert actual.dtype == bool and actual.shape == expected.shape
+            assert np.array_equal(actual, expected), f"mask differs for ({category!r}, {gender!r})"
+            # Same set of codes as the list itself
+            allowed = set(predictor._get_allowed_categories(category, gender))
+            present = set(predictor.index.category_values[actual])
+            assert present == allowed & set(predictor.index.category_values), (category, gender)
+            checked += 1
+    print(f"✅ {checked} (category, gender) inputs: bitmask == _get_allowed_categories "
+          f"({len(predictor._category_bit)} precomputed combinations, "
+          f"{len(predictor.index.category_values)} category codes)")
+
+    before = timed_us(lambda: previous_mask(predictor, 'OBC', 'Male'))
+    after = timed_us(lambda: predictor._allowed_category_mask('OBC', 'Male'))
+    print(f"category filter per request: {before:.1f} us -> {after:.1f} us")
+
+    # End to end: the same predictions as with the per-request lists
+    requests = [('OBC', 'Male'), ('OPEN', 'Female'), ('SC', None), ('EWS', 'M'), ('TFWS', 'F')]
+    for category, gender in requests:
+        kwargs = dict(rank=20000, percentile=85.0, category=category, gender=gender, branch=None, limit=50)
+        with contextlib.redirect_stdout(io.StringIO()):
+            new = predictor.predict_colleges(**kwargs)
+            bitmask_mask = predictor._allowed_category_mask
+            predictor._allowed_category_mask = lambda c, g: previous_mask(predictor, c, g)
+            try:
+                old = predictor.predict_colleges(**kwargs)
+            finally:
+                predictor._allowed_category_mask = bitmask_mask
+        assert new == old, f"predictions differ for ({category}, {gender})"
+    print(f"✅ {len(requests)} predictions identical")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""
+Differential check + timing for services.ranking.
+
+Compares best_per_college / top_k_per_group against the original pandas
+pipeline (sort by closeness/closing_percentile/Type_Weight ->
+groupby('college_name').first() -> sort -> head(limit)) on random data with
+many ties, then times both on a realistic candidate count.
+
+Run from the backend directory:
+    python benchmarks/check_ranking.py
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.ranking import best_per_college, top_k_per_group
+
+
+def make_candidates(rng, n, n_colleges):
+    # Coarse values so closeness/cutoff/weight ties are frequent
+    return pd.DataFrame({
+        'college': rng.integers(0, n_colleges, n),
+        'closeness': rng.integers(0, 8, n) / 2.0,
+        'closing_percentile': rng.integers(0, 5, n) * 10.0,
+        'Type_Weight': rng.choice([0.7, 0.85, 1.0], n),
+    })
+
+
+def reference(df, limit):
+    """Original pandas pipeline; returns row positions in ranked order"""
+    df = df.sort_values(['closeness', 'closing_percentile', 'Type_Weight'],
+                        ascending=[True, False, False])
+    df = df.reset_index().groupby('college').first()
+    df = df.sort_values(['closeness', 'closing_percentile', 'Type_Weight'],
+                        ascending=[True, False, False])
+    return df['index'].head(limit).to_numpy()
+
+
+def vectorised(df, limit):
+    groups = np.zeros(len(df), dtype=np.int32)
+    college = df['college'].to_numpy()
+    closeness = df['closeness'].to_numpy()
+    cutoff = df['closing_percentile'].to_numpy()
+    weight = df['Type_Weight'].to_numpy()
+    best = best_per_college(groups, college, int(college.max()) + 1,
+                            closeness, cutoff, weight, np.arange(len(df)))
+    return top_k_per_group(groups, best, college, closeness, cutoff, weight, limit)
+
+
+def timed(fn, repeat=20):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    rng = np.random.default_rng(0)
+
+    for trial in range(500):
+        n = int(rng.integers(1, 400))
+        df = make_candidates(rng, n, int(rng.integers(1, 60)))
+        limit = int(rng.integers(1, 80))
+        expected, actual = reference(df, limit), vectorised(df, limit)
+        assert np.array_equal(expected, actual), f"mismatch in trial {trial}"
+    print("✅ 500 random cases identical to the pandas pipeline")
+
+    df = make_candidates(rng, 20000, 350)
+    print(f"{'limit':>6} {'pandas (ms)':>12} {'ranking (ms)':>13}")
+    for limit in (10, 50, 100):
+        print(f"{limit:>6} {timed(lambda: reference(df, limit)):>12.2f} "
+              f"{timed(lambda: vectorised(df, limit)):>13.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,34 @@
+# backend/gunicorn.conf.py
+"""
+Gunicorn settings:  gunicorn -c gunicorn.conf.py app:app
+
+preload_app loads the model and datasets (utils.data_registry) once in the
+master and warms the lazy components (college directory) before forking, so
+workers share those pages copy-on-write and are ready immediately.
+"""
+import gc
+import os
+
+bind = os.getenv('GUNICORN_BIND', f"0.0.0.0:{os.getenv('PORT', '5000')}")
+workers = int(os.getenv('WEB_CONCURRENCY', '2'))
+threads = int(os.getenv('GUNICORN_THREADS', '4'))
+timeout = int(os.getenv('GUNICORN_TIMEOUT', '120'))
+preload_app = True
+
+
+def when_ready(server):
+    if server.cfg.preload_app:
+        # Synchronous: no build thread may be running while workers fork
+        from services import runtime
+        runtime.warm_up(wait=True)
+
+    # Move everything loaded so far into the permanent generation: the cyclic
+    # GC then never touches (and un-shares) those objects in the workers
+    gc.collect()
+    gc.freeze()
+
+
+def post_worker_init(worker):
+    # Without preload each worker warms up in the background (no-op when warm)
+    from services import runtime
+    runtime.warm_up()
@@ -9,7 +9,10 @@ import sys
 # Add parent directory to path to import utils
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from services import runtime
 from utils.college_comparator import CollegeComparator
+from utils.http_cache import cached_json
+from utils.streaming import frame_rows, stream_format, stream_rows
 
 college_comparison_bp = Blueprint('college_comparison', __name__)
 
@@ -19,12 +22,8 @@ cache = Cache(config={
     'CACHE_DEFAULT_TIMEOUT': 300
 })
 
-# Initialize comparator globally
-print("\n" + "="*60)
-print("🔧 Initializing College Comparator...")
-print("="*60)
 
-try:
+def _build_comparator():
     comparator = CollegeComparator(
         merged_data_path='data/merged_cutoff_2021_2025.csv',
         individual_data_dir='data/cutoff_trends',
@@ -32,11 +31,15 @@ try:
         main_data_path='data/flattened_CAP_data done.xlsx'
     )
     print("✅ College Comparator initialized successfully")
-except Exception as e:
-    print(f"❌ Failed to initialize College Comparator: {e}")
-    import traceback
-    traceback.print_exc()
-    comparator = None
+    return comparator
+
+
+# Initialize comparator globally: one instance per runtime version (services/runtime.py)
+print("\n" + "="*60)
+print("🔧 Initializing College Comparator...")
+print("="*60)
+
+runtime.register('comparator', _build_comparator)
 
 print("="*60 + "\n")
 
@@ -46,11 +49,14 @@ print("="*60 + "\n")
 @college_comparison_bp.route('/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
+    state = runtime.current()
     return jsonify({
         'status': 'ok',
         'timestamp': time.time(),
         'message': 'College comparison service is running',
-        'comparator_loaded': comparator is not None
+        'comparator_loaded': state.get('comparator') is not None,
+        'data_version': state.version,
+        'data_loaded_at': state.loaded_at
     }), 200
 
 # ============================================================================
@@ -58,8 +64,13 @@ def health_check():
 # ============================================================================
 @college_comparison_bp.route('/colleges', methods=['GET'])
 def get_colleges():
-    """Get all colleges with optional city/type filters"""
+    """
+    Get all colleges with optional city/type filters
+    
+    ?format=ndjson|csv (or Accept: application/x-ndjson) streams the rows
+    """
     try:
+        comparator = runtime.current().get('comparator')
         if comparator is None:
             return jsonify({'error': 'Comparator not initialized'}), 500
         
@@ -72,7 +83,19 @@ def get_colleges():
         # Remove None values
         filters = {k: v for k, v in filters.items() if v}
         
+        try:
+            fmt = stream_format()
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
         print(f"📡 Getting colleges with filters: {filters}")
+        if fmt:
+            df_colleges = comparator.get_all_colleges_frame(filters)
+            if df_colleges is None:
+                return stream_rows(iter(()), fmt, filename='colleges')
+            return stream_rows(frame_rows(df_colleges), fmt,
+                               columns=list(df_colleges.columns), filename='colleges')
+        
         colleges = comparator.get_all_colleges(filters)
         
         elapsed = time.time() - start_time
@@ -93,6 +116,7 @@ def get_colleges():
 def search_colleges():
     """Search colleges by name"""
     try:
+        comparator = runtime.current().get('comparator')
         if comparator is None:
             return jsonify({'error': 'Comparator not initialized'}), 500
         
@@ -105,9 +129,10 @@ def search_colleges():
             'type': request.args.get('type')
         }
         filters = {k: v for k, v in filters.items() if v}
+        fuzzy = request.args.get('fuzzy', '').lower() in ('1', 'true', 'yes')
         
-        print(f"🔍 Searching colleges: '{query}' with filters: {filters}")
-        colleges = comparator.search_colleges(query, filters)
+        print(f"🔍 Searching colleges: '{query}' with filters: {filters}{' (fuzzy)' if fuzzy else ''}")
+        colleges = comparator.search_colleges(query, filters, fuzzy=fuzzy)
         
         print(f"✅ Found {len(colleges)} colleges")
         return jsonify(colleges), 200
@@ -125,6 +150,7 @@ def search_colleges():
 def get_branches():
     """Get branches, optionally filtered to common ones for selected colleges"""
     try:
+        comparator = runtime.current().get('comparator')
         if comparator is None:
             return jsonify({'error': 'Comparator not initialized'}), 500
         
@@ -176,6 +202,7 @@ def get_branches():
 def get_categories():
     """Get categories, optionally filtered to common ones for selected colleges and branch"""
     try:
+        comparator = runtime.current().get('comparator')
         if comparator is None:
             return jsonify({'error': 'Comparator not initialized'}), 500
         
@@ -224,9 +251,11 @@ def get_categories():
 # GET CITIES
 # ============================================================================
 @college_comparison_bp.route('/colleges/cities', methods=['GET'])
+@cached_json(version=lambda: runtime.current().version)
 def get_cities():
     """Get all available cities"""
     try:
+        comparator = runtime.current().get('comparator')
         if comparator is None:
             return jsonify({'error': 'Comparator not initialized'}), 500
         
@@ -247,9 +276,11 @@ def get_cities():
 # GET COLLEGE TYPES
 # ============================================================================
 @college_comparison_bp.route('/colleges/types', methods=['GET'])
+@cached_json(version=lambda: runtime.current().version)
 def get_types():
     """Get normalized college types"""
     try:
+        comparator = runtime.current().get('comparator')
         if comparator is None:
             return jsonify({'error': 'Comparator not initialized'}), 500
         
@@ -264,8 +295,16 @@ def get_types():
 # ============================================================================
 @college_comparison_bp.route('/colleges/compare', methods=['POST'])
 def compare_colleges():
-    """Compare multiple colleges for specific branch and category"""
+    """
+    Compare multiple colleges for specific branch and category
+    
+    With "format": "columnar" the response carries every year and metric in
+    one payload (years x colleges rank/percentile arrays, trend slopes and
+    stats) instead of per-college record lists, so the comparison page
+    needs no follow-up /trends, /stats or /trend-analysis calls.
+    """
     try:
+        comparator = runtime.current().get('comparator')
         if comparator is None:
             return jsonify({'error': 'Comparator not initialized'}), 500
         
@@ -275,6 +314,7 @@ def compare_colleges():
         college_codes = data.get('college_codes', [])
         branch = data.get('branch')
         category = data.get('category')
+        response_format = data.get('format', 'records')
         
         if not college_codes or not branch or not category:
             return jsonify({
@@ -282,6 +322,29 @@ def compare_colleges():
                 'required': ['college_codes', 'branch', 'category']
             }), 400
         
+        if response_format not in ('records', 'columnar'):
+            return jsonify({
+                'error': 'Invalid format',
+                'allowed': ['records', 'columnar']
+            }), 400
+        
+        if response_format == 'columnar':
+            comparison = comparator.compare_colleges_columnar(college_codes, branch, category)
+            elapsed = time.time() - start_time
+            print(f"✅ Columnar comparison of {len(college_codes)} colleges "
+                  f"({len(comparison['years'])} years) in {elapsed:.3f}s")
+            return jsonify({
+                **comparison,
+                'metadata': {
+                    'branch': branch,
+                    'category': category,
+                    'colleges_compared': len(college_codes),
+                    'total_records': sum(s['records'] for s in comparison['stats']),
+                    'format': 'columnar',
+                    'timestamp': time.time()
+                }
+            }), 200
+        
         print(f"\n📊 Comparing colleges:")
         print(f"   Colleges: {college_codes}")
         print(f"   Branch: {branch}")
@@ -327,6 +390,7 @@ def compare_colleges():
 def get_college_by_code(college_code):
     """Get specific college by code"""
     try:
+        comparator = runtime.current().get('comparator')
         if comparator is None:
             return jsonify({'error': 'Comparator not initialized'}), 500
         
@@ -348,6 +412,7 @@ def get_college_by_code(college_code):
 def get_college_stats(college_code):
     """Get comprehensive statistics for a college"""
     try:
+        comparator = runtime.current().get('comparator')
         if comparator is None:
             return jsonify({'error': 'Comparator not initialized'}), 500
         
@@ -369,6 +434,7 @@ def get_college_stats(college_code):
 def get_cutoff_trends(college_code):
     """Get cutoff trends for specific college, branch, and category"""
     try:
+        comparator = runtime.current().get('comparator')
         if comparator is None:
             return jsonify({'error': 'Comparator not initialized'}), 500
         
@@ -408,6 +474,7 @@ def get_cutoff_trends(college_code):
 def get_trend_analysis(college_code):
     """Get trend analysis for specific college, branch, and category"""
     try:
+        comparator = runtime.current().get('comparator')
         if comparator is None:
             return jsonify({'error': 'Comparator not initialized'}), 500
         
@@ -435,6 +502,7 @@ def get_trend_analysis(college_code):
 def get_category_info(category_code):
     """Get display name and description for category code"""
     try:
+        comparator = runtime.current().get('comparator')
         if comparator is None:
             return jsonify({'error': 'Comparator not initialized'}), 500
         
@@ -458,6 +526,7 @@ def get_category_info(category_code):
 def get_recommendations():
     """Get college recommendations based on rank and preferences"""
     try:
+        comparator = runtime.current().get('comparator')
         if comparator is None:
             return jsonify({'error': 'Comparator not initialized'}), 500
         
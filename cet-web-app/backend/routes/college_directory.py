@@ -5,15 +5,18 @@ import pandas as pd
 import os
 from datetime import datetime
 import numpy as np
-import joblib
 import traceback
 
+from services import runtime
+from services.directory_index import DirectoryIndex
+from utils import data_registry
+from utils.http_cache import cached_json
+from utils.streaming import stream_format, stream_rows
+
 college_directory_bp = Blueprint('college_directory', __name__)
 
-# Cache for loaded data
-_colleges_cache = None
-_predictor_model = None
-_main_college_data = None
+# The built directory lives in the versioned runtime state (services/runtime.py);
+# model and CAP data come from the shared registry (utils/data_registry.py)
 
 def find_file(filename, search_dirs=None):
     """Helper to find files in multiple locations"""
@@ -35,94 +38,175 @@ def find_file(filename, search_dirs=None):
     return None
 
 def load_predictor_model():
-    """Load the same XGBoost model used in predictor"""
-    global _predictor_model, _main_college_data
-    
-    if _predictor_model is not None and _main_college_data is not None:
-        return _predictor_model, _main_college_data
-    
+    """Load the same XGBoost model used in predictor (shared via the data registry)"""
     try:
         # Load XGBoost model
         model_path = find_file('xgb_cap_model.pkl', ['model', 'backend/model'])
         
         if model_path and os.path.exists(model_path):
-            _predictor_model = joblib.load(model_path)
+            model = data_registry.get_model(model_path)
             print(f"✅ Loaded XGBoost model from: {model_path}")
         else:
             print(f"⚠️ XGBoost model not found. Searched in: model/, backend/model/")
-            _predictor_model = None
+            model = None
         
         # Load main college data
         data_path = find_file('flattened_CAP_data done.xlsx')
         
         if data_path and os.path.exists(data_path):
-            _main_college_data = pd.read_excel(data_path)
-            print(f"✅ Loaded college data: {len(_main_college_data)} records from {data_path}")
+            main_data = data_registry.get_dataset(data_path)
+            print(f"✅ Loaded college data: {len(main_data)} records from {data_path}")
         else:
             print(f"⚠️ Main college data not found")
-            _main_college_data = None
+            main_data = None
         
-        return _predictor_model, _main_college_data
+        return model, main_data
         
     except Exception as e:
         print(f"❌ Error loading predictor model: {e}")
         traceback.print_exc()
         return None, None
 
+TYPE_WEIGHTS = {
+    "Government": 1.00,
+    "Autonomous / Government": 0.95,
+    "State Technological University": 0.90,
+    "University Department": 0.85,
+    "Autonomous / Aided": 0.80,
+    "Autonomous / Private": 0.75,
+    "Deemed University": 0.70,
+    "State Private University": 0.65,
+    "Private (Unaided)": 0.60,
+    "Deemed University (Off-Campus)": 0.55
+}
+
 def get_type_weight(college_type):
     """Get type weight same as predictor"""
-    type_weight_mapping = {
-        "Government": 1.00,
-        "Autonomous / Government": 0.95,
-        "State Technological University": 0.90,
-        "University Department": 0.85,
-        "Autonomous / Aided": 0.80,
-        "Autonomous / Private": 0.75,
-        "Deemed University": 0.70,
-        "State Private University": 0.65,
-        "Private (Unaided)": 0.60,
-        "Deemed University (Off-Campus)": 0.55
-    }
-    return type_weight_mapping.get(college_type, 0.60)
+    return TYPE_WEIGHTS.get(college_type, 0.60)
+
+def predict_cutoffs_for_colleges(college_types, historical_cutoffs, model=None, main_data=None):
+    """
+    Predict cutoffs for many colleges with one batched model call
+    (same method as predictor). Colleges without a historical cutoff use
+    C_normalized = 0.5.
+
+    Returns:
+        np.ndarray of predicted percentiles, rounded to 2 decimals
+    """
+    historical = np.asarray(historical_cutoffs, dtype=float)
+    fallback = np.where(historical > 0, historical, 0.0)
+    if model is None or main_data is None or len(historical) == 0:
+        return fallback
 
-def predict_cutoff_for_college(college_type, historical_cutoff=None, model=None, main_data=None):
-    """Predict cutoff using the same method as predictor"""
-    if model is None or main_data is None:
-        return float(historical_cutoff) if historical_cutoff and historical_cutoff > 0 else 0.0
-    
     try:
-        type_weight = get_type_weight(college_type)
-        
         min_cutoff = float(main_data['closing_percentile'].min())
         max_cutoff = float(main_data['closing_percentile'].max())
-        
-        if historical_cutoff and historical_cutoff > 0:
-            c_normalized = (float(historical_cutoff) - min_cutoff) / (max_cutoff - min_cutoff)
-        else:
-            c_normalized = 0.5
-        
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            c_normalized = np.where(
+                historical > 0, (historical - min_cutoff) / (max_cutoff - min_cutoff), 0.5
+            )
+
         X = pd.DataFrame({
-            'C_normalized': [c_normalized],
-            'Type_Weight': [type_weight]
+            'C_normalized': c_normalized,
+            'Type_Weight': [get_type_weight(t) for t in college_types]
         })
-        
-        predicted = float(model.predict(X)[0])
-        predicted_percentile = ((predicted - 0.0) / (1.0 - 0.0)) * 100.0
-        
-        return round(float(predicted_percentile), 2)
-        
+
+        predicted = model.predict(X).astype(float) * 100.0
+        return np.array([round(v, 2) for v in predicted.tolist()])
+
     except Exception as e:
         print(f"Error predicting cutoff: {e}")
-        return float(historical_cutoff) if historical_cutoff and historical_cutoff > 0 else 0.0
+        return fallback
+
+def predict_cutoff_for_college(college_type, historical_cutoff=None, model=None, main_data=None):
+    """Predict cutoff using the same method as predictor"""
+    historical = float(historical_cutoff) if historical_cutoff else 0.0
+    return float(predict_cutoffs_for_colleges([college_type], [historical], model, main_data)[0])
+
+def load_directory_index():
+    """DirectoryIndex of the active runtime version (built on first use)"""
+    index = runtime.current().get('directory')
+    if index is None:
+        raise RuntimeError("College directory could not be loaded")
+    return index
 
 def load_college_data():
+    """College directory of the active runtime version (built on first use)"""
+    return load_directory_index().colleges
+
+
+def _clean_str_column(df, column, default='', upper=False):
+    """str(value).strip() (optionally .upper()) for every value of `column`, or `default` if it's missing"""
+    if column not in df.columns:
+        uniques, codes = [default], np.zeros(len(df), dtype=np.intp)
+    else:
+        codes, uniques = pd.factorize(df[column], use_na_sentinel=False)
+    # Clean each distinct value once, then expand
+    cleaned = [str(value).strip() for value in uniques]
+    if upper:
+        cleaned = [value.upper() for value in cleaned]
+    return np.array(cleaned, dtype=object)[codes].tolist()
+
+
+def _merge_cutoff_records(colleges_dict, main_data):
+    """
+    Attach every cutoff record of `main_data` to its college in `colleges_dict`
+    (type, unique branches, per category_branch cutoff lists, positive
+    historical cutoffs). Returns the number of merged records.
+    """
+    codes = pd.Series(_clean_str_column(main_data, 'college_code'), index=main_data.index)
+
+    # Extract code from name if needed
+    if 'college_name' in main_data.columns and (codes == '').any():
+        name_codes = main_data['college_name'].astype(str).str.split('-').str[0].str.strip()
+        use_name = (codes == '') & name_codes.str.isdigit()
+        codes = codes.where(~use_name, name_codes)
+
+    matched = codes.isin(colleges_dict.keys()).to_numpy()
+    records = main_data[matched]
+    codes = codes[matched].tolist()
+    if not codes:
+        return 0
+
+    branches = _clean_str_column(records, 'branch_name', 'Computer Engineering')
+    categories = _clean_str_column(records, 'category', 'GOPENS', upper=True)
+    types = _clean_str_column(records, 'type', 'Unknown')
+    cutoffs = (records['closing_percentile'].astype(float).tolist()
+               if 'closing_percentile' in records.columns else [0.0] * len(codes))
+    if 'closing_rank' in records.columns:
+        ranks = records['closing_rank']
+        ranks = [int(r) if r else None for r in ranks.where(ranks.notna(), 0).tolist()]
+    else:
+        ranks = [None] * len(codes)
+
+    # Last known type per college
+    known_types = {code: college_type for code, college_type in zip(codes, types) if college_type != 'Unknown'}
+    for code, college_type in known_types.items():
+        colleges_dict[code]['type'] = college_type
+
+    # Unique branches in first-seen order (set semantics instead of list scans)
+    for code, branch in dict.fromkeys(zip(codes, branches)):
+        if branch:
+            colleges_dict[code]['branches'].append(branch)
+
+    # Cutoff entries per "CATEGORY_branch" key, plus positive historical cutoffs
+    for code, branch, category, cutoff, rank in zip(codes, branches, categories, cutoffs, ranks):
+        college = colleges_dict[code]
+        college['cutoff_data'].setdefault(f"{category}_{branch}", []).append({
+            'percentile': cutoff,
+            'rank': rank,
+            'category': category,
+            'branch': branch
+        })
+        if cutoff > 0:
+            college['historical_cutoffs'].append(cutoff)
+
+    return len(codes)
+
+
+def build_college_directory():
     """Load and merge college directory with cutoff data + ML predictions"""
-    global _colleges_cache
-    
-    if _colleges_cache is not None:
-        print("📦 Using cached college data")
-        return _colleges_cache
-    
     try:
         print("\n" + "="*60)
         print("🔄 Loading College Directory")
@@ -139,22 +223,23 @@ def load_college_data():
                 "Colleges_URL.xlsx not found. Please ensure it's in data/ or backend/data/ folder"
             )
         
-        df_directory = pd.read_excel(directory_path)
+        df_directory = data_registry.get_dataset(directory_path)
         print(f"✅ Loaded {len(df_directory)} colleges from: {directory_path}")
         
-        # 2. Initialize colleges dictionary
+        # 2. Initialize colleges dictionary (later duplicate codes overwrite earlier ones)
         colleges_dict = {}
-        
-        for _, row in df_directory.iterrows():
-            college_code = str(row.get('College Code', '')).strip()
+        directory_columns = [
+            _clean_str_column(df_directory, column)
+            for column in ['College Code', 'College Name', 'City', 'URL']
+        ]
+        for college_code, name, city, url in zip(*directory_columns):
             if not college_code:
                 continue
-            
             colleges_dict[college_code] = {
                 'College Code': college_code,
-                'College Name': str(row.get('College Name', '')).strip(),
-                'City': str(row.get('City', '')).strip(),
-                'URL': str(row.get('URL', '')).strip(),
+                'College Name': name,
+                'City': city,
+                'URL': url,
                 'type': 'Unknown',
                 'branches': [],
                 'cutoff_data': {},
@@ -166,83 +251,37 @@ def load_college_data():
         # 3. Add cutoff data if available
         if main_data is not None:
             print(f"📊 Merging with {len(main_data)} cutoff records...")
-            
-            merged_count = 0
-            for _, row in main_data.iterrows():
-                college_name = str(row.get('college_name', ''))
-                college_code = str(row.get('college_code', '')).strip()
-                
-                # Extract code from name if needed
-                if not college_code and college_name:
-                    parts = college_name.split('-')
-                    if len(parts) > 0 and parts[0].strip().isdigit():
-                        college_code = parts[0].strip()
-                
-                if not college_code or college_code not in colleges_dict:
-                    continue
-                
-                merged_count += 1
-                
-                branch = str(row.get('branch_name', 'Computer Engineering')).strip()
-                category = str(row.get('category', 'GOPENS')).strip().upper()
-                cutoff = float(row.get('closing_percentile', 0))
-                cutoff_rank = int(row.get('closing_rank', 0)) if pd.notna(row.get('closing_rank')) else None
-                college_type = str(row.get('type', 'Unknown')).strip()
-                
-                if college_type != 'Unknown':
-                    colleges_dict[college_code]['type'] = college_type
-                
-                if branch and branch not in colleges_dict[college_code]['branches']:
-                    colleges_dict[college_code]['branches'].append(branch)
-                
-                key = f"{category}_{branch}"
-                if key not in colleges_dict[college_code]['cutoff_data']:
-                    colleges_dict[college_code]['cutoff_data'][key] = []
-                
-                colleges_dict[college_code]['cutoff_data'][key].append({
-                    'percentile': float(cutoff),
-                    'rank': int(cutoff_rank) if cutoff_rank else None,
-                    'category': category,
-                    'branch': branch
-                })
-                
-                if cutoff > 0:
-                    colleges_dict[college_code]['historical_cutoffs'].append(cutoff)
-            
+            merged_count = _merge_cutoff_records(colleges_dict, main_data)
             print(f"✅ Merged cutoff data for {merged_count} records")
         else:
             print("⚠️ No cutoff data available - skipping merge")
         
-        # 4. Calculate cutoffs
+        # 4. Calculate cutoffs (historical stats per college, one batched model call)
         print("\n🤖 Calculating cutoffs...")
-        colleges_with_data = 0
-        colleges_with_predictions = 0
+        college_list = list(colleges_dict.values())
         
-        for college_code, college_data in colleges_dict.items():
-            # Historical average - convert to native Python float
+        historical_stats = []
+        for college_data in college_list:
             if college_data['historical_cutoffs']:
-                avg_historical = round(float(np.mean(college_data['historical_cutoffs'])), 2)
-                min_historical = round(float(min(college_data['historical_cutoffs'])), 2)
-                max_historical = round(float(max(college_data['historical_cutoffs'])), 2)
-                has_cutoff = True
-                colleges_with_data += 1
+                cutoffs = np.array(college_data['historical_cutoffs'])
+                historical_stats.append((
+                    round(float(np.mean(cutoffs)), 2),
+                    round(float(cutoffs.min()), 2),
+                    round(float(cutoffs.max()), 2),
+                    True
+                ))
             else:
-                avg_historical = 0.0
-                min_historical = 0.0
-                max_historical = 0.0
-                has_cutoff = False
-            
-            # ML Prediction - ensure it returns native Python float
-            predicted_cutoff = float(predict_cutoff_for_college(
-                college_data['type'],
-                avg_historical,
-                model,
-                main_data
-            ))
-            
-            if predicted_cutoff > 0:
-                colleges_with_predictions += 1
-            
+                historical_stats.append((0.0, 0.0, 0.0, False))
+        
+        predictions = predict_cutoffs_for_colleges(
+            [c['type'] for c in college_list],
+            [stats[0] for stats in historical_stats],
+            model,
+            main_data
+        )
+        
+        for college_data, (avg_historical, min_historical, max_historical, has_cutoff), predicted_cutoff \
+                in zip(college_list, historical_stats, predictions.tolist()):
             # Store results - all as native Python types
             college_data['historical_cutoff'] = float(avg_historical)
             college_data['min_cutoff'] = float(min_historical)
@@ -252,15 +291,18 @@ def load_college_data():
             college_data['branch_count'] = int(len(college_data['branches']))
             college_data['display_cutoff'] = float(predicted_cutoff if predicted_cutoff > 0 else avg_historical)
         
-        # Convert to list and cache
-        _colleges_cache = list(colleges_dict.values())
+        colleges_with_data = sum(1 for stats in historical_stats if stats[3])
+        colleges_with_predictions = int((predictions > 0).sum())
+        
+        # List is cached per version by the runtime
+        colleges = college_list
         
-        print(f"\n✅ Successfully processed {len(_colleges_cache)} colleges")
+        print(f"\n✅ Successfully processed {len(colleges)} colleges")
         print(f"   📈 With historical data: {colleges_with_data}")
         print(f"   🤖 With ML predictions: {colleges_with_predictions}")
         print("="*60 + "\n")
         
-        return _colleges_cache
+        return colleges
         
     except Exception as e:
         print(f"\n❌ CRITICAL ERROR loading college data:")
@@ -272,11 +314,27 @@ def load_college_data():
         print("="*60 + "\n")
         raise
 
+# Built (with its filter index) on first use, once per runtime version
+runtime.register('directory', lambda: DirectoryIndex(build_college_directory()), lazy=True)
+
 @college_directory_bp.route('/colleges/directory', methods=['GET'])
+@cached_json(version=lambda: runtime.current().version)
 def get_college_directory():
-    """Get college directory with ML-predicted cutoffs"""
+    """
+    Get college directory with ML-predicted cutoffs
+    
+    ?format=ndjson|csv (or Accept: application/x-ndjson) streams the
+    colleges instead of one JSON document
+    """
     try:
+        try:
+            fmt = stream_format()
+        except ValueError as e:
+            return jsonify({'success': False, 'error': str(e)}), 400
+        
         colleges = load_college_data()
+        if fmt:
+            return stream_rows(colleges, fmt, filename='college_directory')
         
         cities = sorted(set([c['City'] for c in colleges if c['City']]))
         all_branches = set()
@@ -289,7 +347,8 @@ def get_college_directory():
             'total': len(colleges),
             'cities': cities,
             'branches': sorted(list(all_branches)),
-            'timestamp': datetime.now().isoformat()
+            # Cached per data version: when that version was loaded, not render time
+            'data_version_loaded_at': runtime.current().loaded_at
         })
         
     except Exception as e:
@@ -307,38 +366,45 @@ def get_college_directory():
 
 @college_directory_bp.route('/colleges/filter', methods=['GET'])
 def filter_colleges():
-    """Filter colleges"""
+    """
+    Filter colleges (sorted by display_cutoff).
+
+    Optional paging/projection: limit, offset, and fields (comma separated
+    field names, or 'summary' to leave out cutoff_data/historical_cutoffs)
+    """
     try:
         city = request.args.get('city', 'ALL')
         search = request.args.get('search', '').lower()
         has_cutoff = request.args.get('has_cutoff', 'all')
         
-        colleges = load_college_data()
+        index = load_directory_index()
         
-        filtered = []
-        for college in colleges:
-            if city != 'ALL' and college['City'] != city:
-                continue
-            
-            if search:
-                college_name = college['College Name'].lower()
-                college_code = str(college['College Code']).lower()
-                if search not in college_name and search not in college_code:
-                    continue
-            
-            if has_cutoff == 'yes' and not college['has_cutoff']:
-                continue
-            elif has_cutoff == 'no' and college['has_cutoff']:
-                continue
-            
-            filtered.append(college)
+        try:
+            offset = int(request.args.get('offset', 0))
+            limit = request.args.get('limit')
+            limit = int(limit) if limit not in (None, '') else None
+            if offset < 0 or (limit is not None and limit < 0):
+                raise ValueError("limit and offset must be non-negative integers")
+            fields = index.resolve_fields(request.args.get('fields'))
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
         
-        filtered.sort(key=lambda x: x['display_cutoff'], reverse=True)
+        rows = index.filter(city=city, search=search, has_cutoff=has_cutoff)
+        colleges = index.page(rows, offset=offset, limit=limit, fields=fields)
+        
+        total = int(len(rows))
+        next_offset = offset + len(colleges)
         
         return jsonify({
             'success': True,
-            'colleges': filtered,
-            'total': len(filtered)
+            'colleges': colleges,
+            'total': total,
+            'offset': offset,
+            'limit': limit,
+            'next_offset': next_offset if next_offset < total else None
         })
         
     except Exception as e:
@@ -348,6 +414,7 @@ def filter_colleges():
         }), 500
 
 @college_directory_bp.route('/colleges/stats', methods=['GET'])
+@cached_json(version=lambda: runtime.current().version)
 def get_college_stats():
     """Get statistics"""
     try:
@@ -394,8 +461,7 @@ def add_to_option_form(college_code):
         category = data.get('category', 'GOPENS').upper()
         branch = data.get('branch', 'Computer Engineering')
         
-        colleges = load_college_data()
-        college = next((c for c in colleges if c['College Code'] == college_code), None)
+        college = load_directory_index().by_code.get(college_code)
         
         if not college:
             return jsonify({
@@ -457,18 +523,33 @@ def add_to_option_form(college_code):
 
 @college_directory_bp.route('/colleges/refresh', methods=['POST'])
 def refresh_cache():
-    """Clear cache and reload"""
-    global _colleges_cache, _predictor_model, _main_college_data
-    
-    _colleges_cache = None
-    _predictor_model = None
-    _main_college_data = None
-    
+    """
+    Reload data/model files into a new runtime version and swap it in.
+    Requires the X-Reload-Token header when RELOAD_TOKEN is set (like /api/reload).
+    """
+    if not runtime.reload_allowed(request.headers.get('X-Reload-Token')):
+        return jsonify({'success': False, 'error': 'Invalid reload token'}), 403
     try:
+        result = runtime.reload(wait=True)
+        last_reload = result['last_reload']
+        if not result['started']:
+            return jsonify({
+                'success': False,
+                'error': result['message'],
+                'version': result['active']['version']
+            }), 409
+        if last_reload.get('status') != 'ok':
+            return jsonify({
+                'success': False,
+                'error': last_reload.get('error'),
+                'version': result['active']['version']
+            }), 500
+
         load_college_data()
         return jsonify({
             'success': True,
-            'message': 'Cache refreshed successfully'
+            'message': 'Cache refreshed successfully',
+            'version': result['active']['version']
         })
     except Exception as e:
         return jsonify({
@@ -1,20 +1,91 @@
+import os
+
 from flask import Blueprint, request, jsonify
+from services import runtime
 from services.predictor import CollegePredictor
-import traceback
+from utils.cache import LRUCache
+from utils.http_cache import cached_json
+from utils.logger import get_logger, set_request_debug
+
+logger = get_logger('predict_route')
 
 # ==========================================
 # Blueprint Setup
 # ==========================================
 predict_bp = Blueprint('predict', __name__)
 
-# Initialize Predictor
-try:
+# Initialize Predictor (one instance per runtime version, see services/runtime.py)
+def _build_predictor():
     predictor = CollegePredictor()
-    print("✅ College Predictor initialized successfully")
-except Exception as e:
-    print(f"❌ Failed to initialize predictor: {e}")
-    traceback.print_exc()
-    predictor = None
+    logger.info("✅ College Predictor initialized successfully")
+    return predictor
+
+
+runtime.register('predictor', _build_predictor)
+
+# Result cache for /api/predict (PREDICT_CACHE_SIZE=0 disables it)
+PREDICT_LIMIT = 100
+CACHE_SIZE = int(os.getenv('PREDICT_CACHE_SIZE', '512'))
+CACHE_TTL = float(os.getenv('PREDICT_CACHE_TTL', '600'))
+# Opt-in percentile bucketing: with N decimals, requests whose percentiles
+# round to the same value share one cache entry, i.e. get the answer computed
+# for whichever of them came first. Unset: the exact percentile is the key.
+_percentile_decimals = os.getenv('PREDICT_CACHE_PERCENTILE_DECIMALS', '').strip()
+PERCENTILE_DECIMALS = int(_percentile_decimals) if _percentile_decimals else None
+
+prediction_cache = LRUCache(maxsize=CACHE_SIZE, ttl=CACHE_TTL, name='predict') if CACHE_SIZE > 0 else None
+
+
+def _cache_key(predictor, category, gender, city, branches, limit, percentile):
+    """
+    Canonical cache key for a prediction request. Rank is not part of it
+    because predictions depend on the percentile only. Repeated branches are
+    dropped but their order is kept: predict_multiple_branches lets the first
+    branch win when several match the same seat, so reordered lists can
+    give different results.
+    """
+    return (
+        category,
+        predictor.normalize_gender(gender),
+        city or None,
+        tuple(dict.fromkeys(branches)),
+        limit,
+        percentile if PERCENTILE_DECIMALS is None else round(percentile, PERCENTILE_DECIMALS)
+    )
+
+
+def _run_prediction(predictor, rank, percentile, category, gender, city, branches):
+    """Predictions + statistics, served from the cache when possible"""
+    def compute():
+        if branches:
+            predictions = predictor.predict_multiple_branches(
+                rank=rank,
+                percentile=percentile,
+                category=category,
+                branches=branches,
+                gender=gender,  # NEW: Pass gender
+                city=city,
+                limit=PREDICT_LIMIT
+            )
+        else:
+            predictions = predictor.predict_colleges(
+                rank=rank,
+                percentile=percentile,
+                category=category,
+                gender=gender,  # NEW: Pass gender
+                city=city,
+                limit=PREDICT_LIMIT
+            )
+        return predictions, predictor.get_statistics(predictions)
+
+    if prediction_cache is None:
+        return compute()
+
+    # Entries built against an older model/dataset are dropped here
+    prediction_cache.bind_version(predictor.version)
+    key = _cache_key(predictor, category, gender, city, branches or [], PREDICT_LIMIT, percentile)
+    # Always computed with the percentile the user sent
+    return prediction_cache.get_or_compute(key, compute)
 
 
 # ==========================================
@@ -32,11 +103,13 @@ def predict_colleges():
         "category": "OPEN",
         "gender": "Male",  // NEW: Added gender support
         "city": "Pune",
-        "branches": ["Computer Engineering"]
+        "branches": ["Computer Engineering"],
+        "debug": false      // optional: verbose diagnostics for this request only
     }
     
     Returns colleges sorted by historical cutoff (high to low)
     """
+    predictor = runtime.current().get('predictor')
     if not predictor:
         return jsonify({
             'success': False,
@@ -52,6 +125,9 @@ def predict_colleges():
                 'error': 'No data provided'
             }), 400
 
+        if data.get('debug'):
+            set_request_debug(True)
+
         # Extract parameters (INCLUDING GENDER)
         rank = data.get('rank')
         percentile = data.get('percentile')
@@ -83,34 +159,15 @@ def predict_colleges():
         if gender:
             gender = str(gender).strip()
             if gender not in ['Male', 'Female', 'M', 'F', 'Other']:
-                print(f"⚠️ Invalid gender value: {gender}, ignoring")
+                logger.warning(f"⚠️ Invalid gender value: {gender}, ignoring")
                 gender = None
         else:
-            print("⚠️ Gender not provided in request")
+            logger.debug("⚠️ Gender not provided in request")
 
-        # Make prediction (WITH GENDER)
-        if branches and len(branches) > 0:
-            predictions = predictor.predict_multiple_branches(
-                rank=int(rank),
-                percentile=float(percentile),
-                category=category,
-                branches=branches,
-                gender=gender,  # NEW: Pass gender
-                city=city,
-                limit=100
-            )
-        else:
-            predictions = predictor.predict_colleges(
-                rank=int(rank),
-                percentile=float(percentile),
-                category=category,
-                gender=gender,  # NEW: Pass gender
-                city=city,
-                limit=100
-            )
-
-        # Calculate statistics
-        stats = predictor.get_statistics(predictions)
+        # Make prediction (WITH GENDER), cached on normalised inputs
+        predictions, stats = _run_prediction(
+            predictor, int(rank), float(percentile), category, gender, city, branches
+        )
 
         return jsonify({
             'success': True,
@@ -129,20 +186,39 @@ def predict_colleges():
         })
 
     except Exception as e:
-        print(f"❌ Prediction error: {e}")
-        traceback.print_exc()
+        logger.exception(f"❌ Prediction error: {e}")
         return jsonify({
             'success': False,
             'error': str(e)
         }), 500
 
 
+# ==========================================
+# Prediction Cache Stats Endpoint
+# ==========================================
+@predict_bp.route('/api/predict/cache-stats', methods=['GET'])
+def prediction_cache_stats():
+    """Hit/miss/eviction counters of the /api/predict result cache"""
+    if prediction_cache is None:
+        return jsonify({
+            'success': True,
+            'enabled': False
+        })
+
+    return jsonify({
+        'success': True,
+        'enabled': True,
+        'cache': prediction_cache.stats()
+    })
+
+
 # ==========================================
 # Model Info Endpoint
 # ==========================================
 @predict_bp.route('/api/model-info', methods=['GET'])
 def model_info():
     """Get model and dataset information"""
+    predictor = runtime.current().get('predictor')
     if not predictor:
         return jsonify({
             'success': False,
@@ -166,8 +242,10 @@ def model_info():
 # Filters Endpoint
 # ==========================================
 @predict_bp.route('/api/filters', methods=['GET'])
+@cached_json(version=lambda: runtime.current().version)
 def get_filters():
     """Get available branches, cities, categories"""
+    predictor = runtime.current().get('predictor')
     if not predictor:
         return jsonify({
             'success': False,
@@ -196,7 +274,9 @@ def search_colleges():
     """
     Search colleges/branches/cities
     Query: ?q=COEP&type=college
+    Add &fuzzy=1 for abbreviation and typo matches (?q=cumins, ?q=entc&type=branch)
     """
+    predictor = runtime.current().get('predictor')
     if not predictor:
         return jsonify({
             'success': False,
@@ -206,6 +286,7 @@ def search_colleges():
     try:
         query = request.args.get('q', '').lower()
         search_type = request.args.get('type', 'college')
+        fuzzy = request.args.get('fuzzy', '').lower() in ('1', 'true', 'yes')
 
         if not query:
             return jsonify({
@@ -215,17 +296,20 @@ def search_colleges():
 
         results = []
 
+        # Prebuilt typeahead indexes: same matches as the old scans (college
+        # names as a case-insensitive regex, branches/cities as plain text),
+        # ranked exact > prefix > word prefix > substring; fuzzy adds aliases
+        # before and typo matches after those
         if search_type == 'college':
-            matching = predictor.college_data[
-                predictor.college_data['college_name'].str.contains(query, case=False, na=False)
-            ]['college_name'].unique().tolist()
-            results = matching[:20]
+            results = predictor.search_indexes['college'].search_values(query, ranked=True, limit=20, fuzzy=fuzzy)
 
         elif search_type == 'branch':
-            results = [b for b in predictor.available_branches if query in b.lower()][:20]
+            results = predictor.search_indexes['branch'].search_values(query, ranked=True, limit=20, regex=False,
+                                                                       fuzzy=fuzzy)
 
         elif search_type == 'city':
-            results = [c for c in predictor.available_cities if query in c.lower()][:20]
+            results = predictor.search_indexes['city'].search_values(query, ranked=True, limit=20, regex=False,
+                                                                     fuzzy=fuzzy)
 
         return jsonify({
             'success': True,
@@ -248,6 +332,7 @@ def search_colleges():
 @predict_bp.route('/api/statistics', methods=['GET'])
 def get_statistics():
     """Get dataset statistics"""
+    predictor = runtime.current().get('predictor')
     if not predictor:
         return jsonify({
             'success': False,
@@ -1,12 +1,13 @@
 # backend/routes/resource_vault_route.py
 from flask import Blueprint, jsonify, request
 from services.resource_service import ResourceService
+from utils.http_cache import cached_json
 from functools import wraps
 
 # Create Blueprint
 resource_vault_bp = Blueprint('resource_vault', __name__, url_prefix='/api/resources')
 
-# Initialize service
+# Initialize service (static data: responses are pre-encoded once, see cached_json)
 resource_service = ResourceService()
 
 
@@ -34,6 +35,7 @@ def handle_errors(f):
 # ============= DOCUMENTS ROUTES =============
 
 @resource_vault_bp.route('/documents', methods=['GET'])
+@cached_json()
 @handle_errors
 def get_documents():
     """Get all documents or search documents"""
@@ -68,6 +70,7 @@ def get_documents():
 
 
 @resource_vault_bp.route('/documents/<category>', methods=['GET'])
+@cached_json()
 @handle_errors
 def get_documents_by_category(category):
     """Get documents for a specific category"""
@@ -97,6 +100,7 @@ def get_documents_by_category(category):
 # ============= SCHOLARSHIPS ROUTES =============
 
 @resource_vault_bp.route('/scholarships', methods=['GET'])
+@cached_json()
 @handle_errors
 def get_scholarships():
     """Get all scholarships or search scholarships"""
@@ -122,6 +126,7 @@ def get_scholarships():
 
 
 @resource_vault_bp.route('/scholarships/<int:scholarship_id>', methods=['GET'])
+@cached_json()
 @handle_errors
 def get_scholarship_by_id(scholarship_id):
     """Get a specific scholarship by ID"""
@@ -143,6 +148,7 @@ def get_scholarship_by_id(scholarship_id):
 # ============= LINKS ROUTES =============
 
 @resource_vault_bp.route('/links', methods=['GET'])
+@cached_json()
 @handle_errors
 def get_links():
     """Get all important links or links by category"""
@@ -174,6 +180,7 @@ def get_links():
 
 
 @resource_vault_bp.route('/links/<category>', methods=['GET'])
+@cached_json()
 @handle_errors
 def get_links_by_category(category):
     """Get links for a specific category"""
@@ -197,6 +204,7 @@ def get_links_by_category(category):
 # ============= CONTACTS ROUTES =============
 
 @resource_vault_bp.route('/contacts', methods=['GET'])
+@cached_json()
 @handle_errors
 def get_contacts():
     """Get all contact information"""
@@ -209,6 +217,7 @@ def get_contacts():
 
 
 @resource_vault_bp.route('/contacts/helplines', methods=['GET'])
+@cached_json()
 @handle_errors
 def get_helplines():
     """Get helpline contacts only"""
@@ -222,6 +231,7 @@ def get_helplines():
 
 
 @resource_vault_bp.route('/contacts/offices', methods=['GET'])
+@cached_json()
 @handle_errors
 def get_offices():
     """Get office contacts only"""
@@ -237,6 +247,7 @@ def get_offices():
 # ============= IMPORTANT DATES ROUTES =============
 
 @resource_vault_bp.route('/dates', methods=['GET'])
+@cached_json()
 @handle_errors
 def get_dates():
     """Get all important dates or dates by phase"""
@@ -279,6 +290,7 @@ def get_dates():
 
 
 @resource_vault_bp.route('/dates/<phase>', methods=['GET'])
+@cached_json()
 @handle_errors
 def get_dates_by_phase(phase):
     """Get dates for a specific phase"""
@@ -300,6 +312,7 @@ def get_dates_by_phase(phase):
 
 
 @resource_vault_bp.route('/dates/upcoming', methods=['GET'])
+@cached_json()
 @handle_errors
 def get_upcoming_dates():
     """Get all upcoming important dates"""
@@ -315,6 +328,7 @@ def get_upcoming_dates():
 # ============= TIPS ROUTES =============
 
 @resource_vault_bp.route('/tips', methods=['GET'])
+@cached_json()
 @handle_errors
 def get_tips():
     """Get all tips or tips by category"""
@@ -348,6 +362,7 @@ def get_tips():
 
 
 @resource_vault_bp.route('/tips/<category>', methods=['GET'])
+@cached_json()
 @handle_errors
 def get_tips_by_category(category):
     """Get tips for a specific category"""
@@ -373,6 +388,7 @@ def get_tips_by_category(category):
 # ============= SUMMARY/DASHBOARD ROUTES =============
 
 @resource_vault_bp.route('/summary', methods=['GET'])
+@cached_json()
 @handle_errors
 def get_summary():
     """Get summary statistics for dashboard"""
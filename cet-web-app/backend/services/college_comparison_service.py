@@ -73,13 +73,13 @@ class CollegeComparisonService:
                 return data
             
             # Otherwise return all data for this college
-            df = (self.comparator.merged_data if not self.comparator.merged_data.empty 
-                  else self.comparator.individual_data)
+            df = self.comparator.cutoff_data
             
             if df.empty:
                 return []
             
-            df_college = df[df['college_code'] == int(college_code)]
+            code = self.comparator.normalize_college_code(college_code)
+            df_college = df.iloc[self.comparator.cutoff_index.college_rows(code)]
             
             if filters:
                 if filters.get('year'):
@@ -114,8 +114,7 @@ class CollegeComparisonService:
     def get_recommendations(self, rank: int, category: str, preferences: Dict = None) -> List[Dict]:
         """Get college recommendations based on rank"""
         try:
-            df = (self.comparator.merged_data if not self.comparator.merged_data.empty 
-                  else self.comparator.individual_data)
+            df = self.comparator.cutoff_data
             
             if df.empty:
                 return []
@@ -137,14 +136,10 @@ class CollegeComparisonService:
                 
                 if preferences.get('branch'):
                     branch_normalized = self.comparator.normalize_branch(preferences['branch'])
-                    df_filtered = df_filtered[
-                        df_filtered['branch_name'].apply(self.comparator.normalize_branch) == branch_normalized
-                    ]
+                    df_filtered = df_filtered[df_filtered['branch_normalized'] == branch_normalized]
                 
                 if preferences.get('college_type'):
-                    df_filtered = df_filtered[
-                        df_filtered['type'].apply(self.comparator.normalize_college_type) == preferences['college_type']
-                    ]
+                    df_filtered = df_filtered[df_filtered['type_normalized'] == preferences['college_type']]
             
             # Get latest year data
             latest_year = df_filtered['year'].max() if len(df_filtered) > 0 else '2025'
@@ -154,7 +149,9 @@ class CollegeComparisonService:
             df_latest = df_latest.sort_values('closing_rank')
             
             # Get unique colleges
-            df_unique = df_latest.drop_duplicates(subset=['college_code'], keep='first').copy()
+            df_unique = df_latest.drop_duplicates(subset=['college_code'], keep='first').drop(
+                columns=self.comparator.NORMALIZED_COLUMNS
+            )
             
             # Add URLs
             df_unique['college_url'] = df_unique['college_code'].astype(str).map(
@@ -0,0 +1,118 @@
+import numpy as np
+from typing import Dict, Iterable, List, Optional
+
+
+class DirectoryIndex:
+    """
+    Read-only index over the built college directory used by /colleges/filter.
+
+    Built once per runtime version:
+    - the directory pre-sorted by display_cutoff (desc, stable), so filter
+      results come out already in response order
+    - per-city buckets and a has_cutoff flag over that order
+    - lowercase college name / code columns with trigram posting lists, so
+      substring search only verifies the few colleges that contain every
+      trigram of the query
+
+    All row sets are ascending int32 arrays of positions in the sorted order.
+    """
+
+    NGRAM = 3
+
+    # Per-college fields that make up most of the payload
+    DETAIL_FIELDS = ('cutoff_data', 'historical_cutoffs')
+
+    def __init__(self, colleges: List[Dict]):
+        self.colleges = colleges
+        self.sorted_colleges = sorted(colleges, key=lambda c: c['display_cutoff'], reverse=True)
+        self.by_code = {c['College Code']: c for c in colleges}
+        self.fields = tuple(colleges[0].keys()) if colleges else ()
+
+        n = len(self.sorted_colleges)
+        self.all_rows = np.arange(n, dtype=np.int32)
+        self.has_cutoff = np.array([bool(c['has_cutoff']) for c in self.sorted_colleges], dtype=bool)
+
+        buckets: Dict[str, list] = {}
+        for row, college in enumerate(self.sorted_colleges):
+            buckets.setdefault(college['City'], []).append(row)
+        self.city_rows = {city: np.array(rows, dtype=np.int32) for city, rows in buckets.items()}
+
+        self.names = [c['College Name'].lower() for c in self.sorted_colleges]
+        self.codes = [str(c['College Code']).lower() for c in self.sorted_colleges]
+
+        postings: Dict[str, set] = {}
+        for row, (name, code) in enumerate(zip(self.names, self.codes)):
+            for text in (name, code):
+                for gram in self._ngrams(text):
+                    postings.setdefault(gram, set()).add(row)
+        self._postings = {
+            gram: np.array(sorted(rows), dtype=np.int32) for gram, rows in postings.items()
+        }
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def _ngrams(cls, text: str) -> Iterable[str]:
+        return {text[i:i + cls.NGRAM] for i in range(len(text) - cls.NGRAM + 1)}
+
+    def _search_rows(self, search: str, rows: np.ndarray) -> np.ndarray:
+        """Rows (subset of `rows`) whose lowercase name or code contains `search`"""
+        if len(search) >= self.NGRAM:
+            grams = self._ngrams(search)
+            if any(gram not in self._postings for gram in grams):
+                return rows[:0]
+            # Intersect the rarest posting lists first
+            for gram in sorted(grams, key=lambda g: len(self._postings[g])):
+                rows = np.intersect1d(rows, self._postings[gram], assume_unique=True)
+                if not len(rows):
+                    return rows
+        names, codes = self.names, self.codes
+        keep = [row for row in rows.tolist() if search in names[row] or search in codes[row]]
+        return np.array(keep, dtype=np.int32)
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def filter(self, city: str = 'ALL', search: str = '', has_cutoff: str = 'all') -> np.ndarray:
+        """
+        Rows matching the /colleges/filter parameters, in display_cutoff order.
+        `search` must already be lowercased.
+        """
+        rows = self.all_rows if city == 'ALL' else self.city_rows.get(city, self.all_rows[:0])
+
+        if has_cutoff == 'yes':
+            rows = rows[self.has_cutoff[rows]]
+        elif has_cutoff == 'no':
+            rows = rows[~self.has_cutoff[rows]]
+
+        if search:
+            rows = self._search_rows(search, rows)
+        return rows
+
+    def resolve_fields(self, fields: Optional[str]) -> Optional[List[str]]:
+        """
+        Parse a `fields=` parameter: comma separated field names, or 'summary'
+        for every field except the per-branch cutoff details. None = all fields.
+        Raises ValueError for unknown field names.
+        """
+        if not fields:
+            return None
+        if fields == 'summary':
+            return [f for f in self.fields if f not in self.DETAIL_FIELDS]
+        requested = [f.strip() for f in fields.split(',') if f.strip()]
+        unknown = [f for f in requested if f not in self.fields]
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+        return requested
+
+    def page(self, rows: np.ndarray, offset: int = 0, limit: Optional[int] = None,
+             fields: Optional[List[str]] = None) -> List[Dict]:
+        """College dicts for rows[offset:offset + limit], optionally projected to `fields`"""
+        end = None if limit is None else offset + limit
+        colleges = [self.sorted_colleges[row] for row in rows[offset:end].tolist()]
+        if fields is None:
+            return colleges
+        return [{f: college[f] for f in fields} for college in colleges]
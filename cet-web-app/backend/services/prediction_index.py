@@ -0,0 +1,149 @@
+import numpy as np
+import pandas as pd
+from typing import Callable, Iterable, Optional, Sequence
+
+
+class PredictionIndex:
+    """
+    Columnar index over the flattened CAP dataset used by CollegePredictor.
+
+    Built once at startup:
+    - category, city, branch and college name dictionary-encoded into int32 arrays
+    - precomputed women-only flag and college name sort rank per row
+    - row-id posting lists per (category, branch, city) combination
+
+    Candidate rows for a request are selected by evaluating the filters on the
+    (small) dictionaries and gathering the matching posting lists, so the full
+    DataFrame is never copied or scanned with string operations per request.
+    """
+
+    def __init__(self, df: pd.DataFrame, is_women_only: Callable[[str], bool]):
+        self.n_rows = len(df)
+
+        self.category_codes, self.category_values = self._encode(df['category'])
+        self.branch_codes, self.branch_values = self._encode(df['branch_name'])
+        self.city_codes, self.city_values = self._encode(df['city'])
+        self.college_codes, self.college_values = self._encode(df['college_name'])
+
+        # Women-only flag evaluated once per unique college name
+        women_by_college = np.array(
+            [is_women_only(name) for name in self.college_values], dtype=bool
+        )
+        self.women_only = self._lookup(women_by_college, self.college_codes)
+
+        # Per-row rank of the college name in sorted order (groupby key order)
+        name_order = np.argsort(self.college_values.to_numpy(), kind='stable')
+        name_rank = np.empty(len(name_order), dtype=np.int32)
+        name_rank[name_order] = np.arange(len(name_order), dtype=np.int32)
+        self.college_rank = self._lookup(name_rank, self.college_codes)
+
+        # Posting lists keyed by (category, branch, city); +1 keeps NaN (-1) codes in range
+        n_branch = len(self.branch_values) + 1
+        n_city = len(self.city_values) + 1
+        keys = (
+            (self.category_codes.astype(np.int64) + 1) * n_branch
+            + (self.branch_codes + 1)
+        ) * n_city + (self.city_codes + 1)
+
+        order = np.argsort(keys, kind='stable')
+        unique_keys, starts, counts = np.unique(
+            keys[order], return_index=True, return_counts=True
+        )
+        self._posting_rows = order.astype(np.int32)
+        self._posting_starts = starts
+        self._posting_counts = counts
+        self._key_category = (unique_keys // (n_branch * n_city) - 1).astype(np.int32)
+        self._key_branch = ((unique_keys // n_city) % n_branch - 1).astype(np.int32)
+        self._key_city = (unique_keys % n_city - 1).astype(np.int32)
+
+    # ------------------------------------------------------------------
+    # Encoding helpers
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _encode(column: pd.Series):
+        codes, uniques = pd.factorize(column)
+        return codes.astype(np.int32), pd.Series(uniques, dtype=object)
+
+    @staticmethod
+    def _lookup(table: np.ndarray, codes: np.ndarray) -> np.ndarray:
+        """Index a per-dictionary-entry table by codes; NaN (-1) maps to False"""
+        return np.append(table, False)[codes]
+
+    def category_mask(self, categories: Iterable[str]) -> np.ndarray:
+        """Boolean table over category dictionary entries contained in `categories`"""
+        return self.category_values.isin(list(categories)).to_numpy()
+
+    def category_bitmask(self, category_sets: Sequence[Iterable[str]]) -> np.ndarray:
+        """
+        uint64 per category dictionary entry with bit k set when the entry is in
+        category_sets[k] (at most 64 sets); bitmask_table(bits, k) is then the
+        same table as category_mask(category_sets[k]).
+        """
+        if len(category_sets) > 64:
+            raise ValueError(f"At most 64 category sets fit a uint64 bitmask, got {len(category_sets)}")
+        bits = np.zeros(len(self.category_values), dtype=np.uint64)
+        for bit, categories in enumerate(category_sets):
+            bits[self.category_mask(categories)] |= np.uint64(1) << np.uint64(bit)
+        return bits
+
+    @staticmethod
+    def bitmask_table(bits: np.ndarray, bit: int) -> np.ndarray:
+        """Boolean table of the entries whose `bit` is set"""
+        return (bits & (np.uint64(1) << np.uint64(bit))) != 0
+
+    def _contains_mask(self, values: pd.Series, pattern: Optional[str]) -> np.ndarray:
+        """Same semantics as Series.str.contains(pattern, case=False, na=False)"""
+        if not pattern:
+            return np.ones(len(values), dtype=bool)
+        return values.str.contains(pattern, case=False, na=False).to_numpy(dtype=bool)
+
+    def branch_mask(self, branch: Optional[str]) -> np.ndarray:
+        return self._contains_mask(self.branch_values, branch)
+
+    def city_mask(self, city: Optional[str]) -> np.ndarray:
+        return self._contains_mask(self.city_values, city)
+
+    # ------------------------------------------------------------------
+    # Candidate selection
+    # ------------------------------------------------------------------
+
+    def select(self,
+               category_ok: np.ndarray,
+               branch_ok: Optional[np.ndarray] = None,
+               city_ok: Optional[np.ndarray] = None,
+               exclude_women_only: bool = False) -> np.ndarray:
+        """
+        Return sorted row ids matching all dictionary-level filters.
+
+        Args:
+            category_ok: Boolean table over category dictionary entries
+            branch_ok: Boolean table over branch dictionary entries (None = all)
+            city_ok: Boolean table over city dictionary entries (None = all)
+            exclude_women_only: Drop rows of women-only colleges
+
+        Returns:
+            Row positions (ascending, i.e. original dataset order)
+        """
+        key_ok = self._lookup(category_ok, self._key_category)
+        if branch_ok is not None:
+            key_ok &= self._lookup(branch_ok, self._key_branch)
+        if city_ok is not None:
+            key_ok &= self._lookup(city_ok, self._key_city)
+
+        rows = self._gather(np.flatnonzero(key_ok))
+        if exclude_women_only:
+            rows = rows[~self.women_only[rows]]
+        rows.sort()
+        return rows
+
+    def _gather(self, key_ids: np.ndarray) -> np.ndarray:
+        """Concatenate the posting lists of the given keys"""
+        counts = self._posting_counts[key_ids]
+        total = int(counts.sum())
+        if total == 0:
+            return np.empty(0, dtype=np.int32)
+        # Offset of each output slot inside its posting list
+        ends = np.cumsum(counts)
+        shift = np.repeat(self._posting_starts[key_ids] - (ends - counts), counts)
+        return self._posting_rows[np.arange(total) + shift]
@@ -1,9 +1,18 @@
-import joblib
 import pandas as pd
 import numpy as np
 import os
+import uuid
 from typing import List, Dict, Optional
 
+from services.prediction_index import PredictionIndex
+from services.ranking import best_per_college, top_k_per_group
+from utils.data_registry import get_dataset, get_model
+from utils.logger import get_logger, diagnostics_enabled
+from utils.fuzzy_match import BRANCH_ALIASES, COLLEGE_ALIASES
+from utils.search_index import SearchIndex
+
+logger = get_logger('predictor')
+
 class CollegePredictor:
     """
     Enhanced College Predictor with:
@@ -48,6 +57,9 @@ class CollegePredictor:
         'LVJS', 'LVJH',  # Ladies VJ
         'LEWSS', 'LEWSH'  # Ladies EWS
     ]
+    
+    # Normalized genders the allowed categories depend on (see normalize_gender)
+    GENDER_STATES = ('M', 'F', None)
 
     def __init__(self,
                  model_path: str = os.path.join('model', 'xgb_cap_model.pkl'),
@@ -57,30 +69,30 @@ class CollegePredictor:
         try:
             # Load XGBoost model
             if os.path.exists(model_path):
-                self.model = joblib.load(model_path)
-                print("✅ XGBoost model loaded successfully!")
+                self.model = get_model(model_path)
+                logger.info("✅ XGBoost model loaded successfully!")
             else:
                 raise FileNotFoundError(f"Model file not found: {model_path}")
 
             # Load main college dataframe
             if os.path.exists(data_path):
-                self.college_data = pd.read_excel(data_path)
-                print(f"✅ College data loaded: {len(self.college_data)} records")
+                self.college_data = get_dataset(data_path)
+                logger.info(f"✅ College data loaded: {len(self.college_data)} records")
             else:
                 raise FileNotFoundError(f"College data file not found: {data_path}")
 
             # Load 2025 cutoff data if available
             if os.path.exists(cutoff_2025_path):
-                self.cutoff_2025 = pd.read_csv(cutoff_2025_path)
-                print(f"✅ 2025 cutoff data loaded: {len(self.cutoff_2025)} records")
+                self.cutoff_2025 = get_dataset(cutoff_2025_path)
+                logger.info(f"✅ 2025 cutoff data loaded: {len(self.cutoff_2025)} records")
             else:
                 self.cutoff_2025 = None
-                print("⚠️ 2025 cutoff data not found, using existing data only")
+                logger.info("⚠️ 2025 cutoff data not found, using existing data only")
 
             # Load college list
             if os.path.exists(college_list_path):
-                self.college_list = pd.read_excel(college_list_path)
-                print(f"✅ College list loaded: {len(self.college_list)} colleges")
+                self.college_list = get_dataset(college_list_path)
+                logger.info(f"✅ College list loaded: {len(self.college_list)} colleges")
             else:
                 self.college_list = pd.DataFrame()
 
@@ -111,6 +123,9 @@ class CollegePredictor:
                 (self.max_cutoff - self.min_cutoff)
             )
 
+            # Score the whole dataset once; features are static per row
+            self._score_dataset()
+
             # Extract unique values
             self.available_branches = sorted(
                 self.college_data['branch_name'].dropna().unique().tolist()
@@ -122,25 +137,61 @@ class CollegePredictor:
                 self.college_data['category'].dropna().unique().tolist()
             )
 
-            print(f"🎓 Branches: {len(self.available_branches)}")
-            print(f"🏙️ Cities: {len(self.available_cities)}")
-            print(f"📊 Categories: {len(self.available_categories)}")
-            print(f"📉 Cutoff range: {self.min_cutoff:.2f}% - {self.max_cutoff:.2f}%")
+            logger.info(f"🎓 Branches: {len(self.available_branches)}")
+            logger.info(f"🏙️ Cities: {len(self.available_cities)}")
+            logger.info(f"📊 Categories: {len(self.available_categories)}")
+            logger.info(f"📉 Cutoff range: {self.min_cutoff:.2f}% - {self.max_cutoff:.2f}%")
+
+            # Columnar index for per-request candidate selection
+            self.index = PredictionIndex(self.college_data, self._is_women_only_college)
+            self._ladies_only_mask = self.index.category_mask(self.LADIES_ONLY_CATEGORIES)
+            # Allowed categories of every (category, gender) combination as one
+            # bit per combination over the category dictionary
+            combinations = [(category, gender) for category in self.CATEGORY_MAP for gender in self.GENDER_STATES]
+            self._category_bit = {combination: bit for bit, combination in enumerate(combinations)}
+            self._allowed_category_bits = self.index.category_bitmask(
+                [self._get_allowed_categories(category, gender) for category, gender in combinations]
+            )
+            self._raw_pred = self.college_data['raw_pred'].to_numpy()
+            self._closing_percentile = self.college_data['closing_percentile'].to_numpy(dtype=np.float64)
+            self._type_weight = self.college_data['Type_Weight'].to_numpy(dtype=np.float64)
+            logger.info(f"🗂️ Prediction index built: {len(self.index.category_values)} categories, "
+                  f"{len(self.index.branch_values)} branches, {len(self.index.city_values)} cities")
             
-            # Diagnostic: Check for key colleges
-            self._diagnostic_check_colleges()
+            # Typeahead indexes for /api/search (college names in first-appearance order, like .unique()),
+            # with the abbreviation tables for ?fuzzy=1
+            self.search_indexes = {
+                'college': SearchIndex(self.college_data['college_name'].dropna().unique().tolist(),
+                                       COLLEGE_ALIASES),
+                'branch': SearchIndex(self.available_branches, BRANCH_ALIASES),
+                'city': SearchIndex(self.available_cities)
+            }
+            
+            # Diagnostic: Check for key colleges (two regex scans, debug only)
+            if diagnostics_enabled():
+                self._diagnostic_check_colleges()
 
         except Exception as e:
-            print(f"❌ Error initializing predictor: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception(f"❌ Error initializing predictor: {e}")
             raise
 
+    def _score_dataset(self):
+        """
+        Run the XGBoost model over every row and store the raw output as `raw_pred`.
+        Both features (C_normalized, Type_Weight) depend only on the dataset, so
+        this must only be re-run when the data or the model changes.
+        """
+        X_all = self.college_data[['C_normalized', 'Type_Weight']]
+        self.college_data['raw_pred'] = self.model.predict(X_all)
+        # New token on every (re)score so caches keyed on it drop stale results
+        self.version = uuid.uuid4().hex[:12]
+        logger.info(f"🤖 Precomputed model scores for {len(self.college_data)} records")
+
     def _diagnostic_check_colleges(self):
         """Check if COEP and Cummins exist in dataset"""
-        print(f"\n{'='*60}")
-        print("🔍 DIAGNOSTIC: Checking for Key Colleges")
-        print(f"{'='*60}")
+        logger.debug(f"\n{'='*60}")
+        logger.debug("🔍 DIAGNOSTIC: Checking for Key Colleges")
+        logger.debug(f"{'='*60}")
         
         # Check COEP
         coep = self.college_data[
@@ -148,27 +199,27 @@ class CollegePredictor:
                                                            case=False, na=False, regex=True)
         ]
         if len(coep) > 0:
-            print(f"✅ COEP found: {len(coep)} records")
-            print(f"   Name: {coep['college_name'].iloc[0]}")
-            print(f"   Cutoff range: {coep['closing_percentile'].min():.1f}% - {coep['closing_percentile'].max():.1f}%")
-            print(f"   Categories: {coep['category'].unique()[:5].tolist()}")
+            logger.debug(f"✅ COEP found: {len(coep)} records")
+            logger.debug(f"   Name: {coep['college_name'].iloc[0]}")
+            logger.debug(f"   Cutoff range: {coep['closing_percentile'].min():.1f}% - {coep['closing_percentile'].max():.1f}%")
+            logger.debug(f"   Categories: {coep['category'].unique()[:5].tolist()}")
         else:
-            print("❌ COEP not found in dataset!")
+            logger.debug("❌ COEP not found in dataset!")
         
         # Check Cummins
         cummins = self.college_data[
             self.college_data['college_name'].str.contains('Cummins', case=False, na=False)
         ]
         if len(cummins) > 0:
-            print(f"✅ Cummins found: {len(cummins)} records")
-            print(f"   Name: {cummins['college_name'].iloc[0]}")
-            print(f"   Women-only: {self._is_women_only_college(cummins.iloc[0]['college_name'])}")
-            print(f"   Cutoff range: {cummins['closing_percentile'].min():.1f}% - {cummins['closing_percentile'].max():.1f}%")
-            print(f"   Categories: {cummins['category'].unique()[:5].tolist()}")
+            logger.debug(f"✅ Cummins found: {len(cummins)} records")
+            logger.debug(f"   Name: {cummins['college_name'].iloc[0]}")
+            logger.debug(f"   Women-only: {self._is_women_only_college(cummins.iloc[0]['college_name'])}")
+            logger.debug(f"   Cutoff range: {cummins['closing_percentile'].min():.1f}% - {cummins['closing_percentile'].max():.1f}%")
+            logger.debug(f"   Categories: {cummins['category'].unique()[:5].tolist()}")
         else:
-            print("❌ Cummins not found in dataset!")
+            logger.debug("❌ Cummins not found in dataset!")
         
-        print(f"{'='*60}\n")
+        logger.debug(f"{'='*60}\n")
 
     def _is_women_only_college(self, college_name: str) -> bool:
         """Check if college is women-only based on name"""
@@ -195,13 +246,7 @@ class CollegePredictor:
         user_category_upper = user_category.strip().upper()
         
         # Normalize gender input (handle 'Male'/'Female' from frontend)
-        gender_normalized = None
-        if gender:
-            gender_str = str(gender).strip().upper()
-            if gender_str in ['M', 'MALE']:
-                gender_normalized = 'M'
-            elif gender_str in ['F', 'FEMALE']:
-                gender_normalized = 'F'
+        gender_normalized = self.normalize_gender(gender)
         
         allowed = []
         
@@ -229,6 +274,299 @@ class CollegePredictor:
         
         return allowed
 
+    def _allowed_category_mask(self, user_category: str, gender: str = None) -> np.ndarray:
+        """
+        Boolean table over the category dictionary of _get_allowed_categories(),
+        read from the precomputed bitmask.
+        """
+        user_category_upper = user_category.strip().upper()
+        if user_category_upper not in self.CATEGORY_MAP:
+            # Unknown categories only get the OPEN seats, exactly like OPEN
+            user_category_upper = 'OPEN'
+        bit = self._category_bit[(user_category_upper, self.normalize_gender(gender))]
+        return self.index.bitmask_table(self._allowed_category_bits, bit)
+
+    @staticmethod
+    def normalize_gender(gender: Optional[str]) -> Optional[str]:
+        """
+        Map 'Male'/'Female'/'M'/'F' (any case) to 'M'/'F', anything else to None.
+        Public: callers keying on the gender (e.g. the /api/predict cache) use it too.
+        """
+        if gender:
+            gender_str = str(gender).strip().upper()
+            if gender_str in ['M', 'MALE']:
+                return 'M'
+            elif gender_str in ['F', 'FEMALE']:
+                return 'F'
+        return None
+
+    # Probability bands by percentile gap (checked in order, first match wins)
+    PROBABILITY_BANDS = [(5, 90.0), (3, 80.0), (0, 70.0), (-2, 60.0), (-5, 50.0), (-10, 40.0)]
+    DEFAULT_PROBABILITY = 30.0
+
+    def _admission_probability(self, gap: np.ndarray) -> np.ndarray:
+        """Admission probability band for each percentile gap"""
+        return np.select(
+            [gap >= threshold for threshold, _ in self.PROBABILITY_BANDS],
+            [probability for _, probability in self.PROBABILITY_BANDS],
+            default=self.DEFAULT_PROBABILITY
+        )
+
+    @staticmethod
+    def _category_tag(probability: np.ndarray) -> np.ndarray:
+        """HIGH (70%+), MODERATE (50-69%) or BACKUP (<50%) for each probability"""
+        return np.select(
+            [probability >= 70, probability >= 50],
+            ['HIGH', 'MODERATE'],
+            default='BACKUP'
+        )
+
+    # ========================================================================
+    # PREDICTION PIPELINE (shared by single and multi-branch prediction)
+    # ========================================================================
+
+    def _select_candidates(self,
+                           category: str,
+                           gender: Optional[str],
+                           city: Optional[str],
+                           branches: List[Optional[str]]):
+        """
+        Apply the gender, category and city filters once, then match every
+        requested branch in a single vectorised mask.
+
+        Returns:
+            (rows, groups) - candidate row ids stacked group-major (one group
+            per requested branch, original dataset order inside a group)
+        """
+        debug = diagnostics_enabled()
+        gender_normalized = self.normalize_gender(gender)
+        is_male = gender_normalized == 'M'
+
+        # === GENDER & WOMEN-ONLY COLLEGE FILTERING ===
+        # MALES: Exclude women-only colleges and ladies-only category codes
+        # (specific L-categories, NOT all L-prefix)
+        # FEMALES: Include ALL colleges (no filtering)
+        if debug and is_male:
+            logger.debug(f"✅ MALE FILTER: Excluding women-only colleges (Cummins, etc.) and "
+                         f"{len(self.LADIES_ONLY_CATEGORIES)} ladies-only categories")
+        elif debug and gender_normalized == 'F':
+            logger.debug("✅ FEMALE FILTER: All colleges and category codes included")
+
+        # === CATEGORY FILTERING (OPEN + Specific Caste) ===
+        # Precomputed per (category, gender); males' sets already leave out
+        # the ladies-only codes
+        category_ok = self._allowed_category_mask(category, gender)
+        if debug:
+            logger.debug(f"✅ CATEGORY FILTER ({category}): "
+                         f"{', '.join(self._get_allowed_categories(category, gender))}")
+
+        # === CITY FILTER ===
+        base_rows = self.index.select(
+            category_ok,
+            city_ok=self.index.city_mask(city) if city else None,
+            exclude_women_only=is_male
+        )
+        if debug:
+            logger.debug(f"✅ CITY FILTER ({city or 'All'}): {self.index.n_rows} → {len(base_rows)} records")
+
+        # === BRANCH FILTER (all branches at once) ===
+        # One row per requested branch over the branch dictionary; the extra
+        # last column is the slot for missing branch names (code -1)
+        n_branch_values = len(self.index.branch_values)
+        branch_table = np.zeros((len(branches), n_branch_values + 1), dtype=bool)
+        valid = np.ones(len(branches), dtype=bool)
+        for group, branch in enumerate(branches):
+            if not branch:
+                branch_table[group, :] = True
+                continue
+            try:
+                branch_table[group, :n_branch_values] = self.index.branch_mask(branch)
+            except Exception as e:
+                logger.warning(f"❌ Invalid branch filter '{branch}': {e}")
+                valid[group] = False
+
+        groups, positions = np.nonzero(branch_table[:, self.index.branch_codes[base_rows]])
+        rows = base_rows[positions]
+
+        # === FALLBACK IF NO RESULTS (per branch) ===
+        counts = np.bincount(groups, minlength=len(branches))
+        empty_groups = np.flatnonzero((counts == 0) & valid)
+        if len(empty_groups) > 0:
+            logger.info(f"⚠️ NO COLLEGES FOUND for {len(empty_groups)} branch filter(s)! Relaxing filters...")
+            # Reapply only gender filter as fallback
+            fallback_rows = self.index.select(
+                ~self._ladies_only_mask if is_male
+                else np.ones(len(self.index.category_values), dtype=bool),
+                exclude_women_only=is_male
+            )
+            if debug:
+                logger.debug(f"   Fallback: {len(fallback_rows)} records ({'males only' if is_male else 'all colleges'})")
+            rows = np.concatenate([rows] + [fallback_rows] * len(empty_groups))
+            groups = np.concatenate([groups] + [np.full(len(fallback_rows), g) for g in empty_groups])
+            order = np.argsort(groups, kind='stable')
+            rows, groups = rows[order], groups[order]
+
+        if debug:
+            for group, branch in enumerate(branches):
+                if branch:
+                    logger.debug(f"✅ BRANCH FILTER ({branch}): {len(base_rows)} → {int(np.sum(groups == group))} records")
+
+        return rows, groups
+
+    def _score_candidates(self, rows: np.ndarray, groups: np.ndarray,
+                          n_groups: int, percentile: float) -> Dict[str, np.ndarray]:
+        """
+        Renormalise the precomputed model scores per group, compute the gap to
+        the user's percentile and apply the (widened) realistic gap window.
+
+        Groups whose scores are all equal get a constant 50.0; those keep the
+        float64 arithmetic while the others stay in the model's float32, exactly
+        like the per-frame computation they replace.
+        """
+        raw = self._raw_pred[rows]
+
+        group_min = np.full(n_groups, np.inf, dtype=raw.dtype)
+        group_max = np.full(n_groups, -np.inf, dtype=raw.dtype)
+        np.minimum.at(group_min, groups, raw)
+        np.maximum.at(group_max, groups, raw)
+        low, high = group_min[groups], group_max[groups]
+        constant = ~(high > low)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            predicted = (raw - low) / (high - low) * 100
+        gap = percentile - predicted
+
+        # === DIAGNOSTIC: Check key colleges before gap filter (debug only) ===
+        debug = diagnostics_enabled()
+        if debug:
+            self._log_key_colleges(rows, np.where(constant, 50.0, predicted), percentile)
+
+        def window(below: float, above: float) -> np.ndarray:
+            in_window = (predicted >= percentile - below) & (predicted <= percentile + above)
+            constant_in_window = (50.0 >= percentile - below) and (50.0 <= percentile + above)
+            return np.where(constant, constant_in_window, in_window)
+
+        # === APPLY WIDENED GAP FILTERING ===
+        realistic = window(15, 10)
+        group_has_realistic = np.zeros(n_groups, dtype=bool)
+        group_has_realistic[groups[realistic]] = True
+        # === FALLBACK: Even wider range if needed ===
+        keep = np.where(group_has_realistic[groups], realistic, window(20, 15))
+
+        if debug:
+            logger.debug(f"🎯 GAP FILTER: {percentile - 15:.1f}% to {percentile + 10:.1f}% "
+                         f"(±20% fallback for {int(np.sum(~group_has_realistic))} group(s)) → "
+                         f"{int(np.sum(keep))} colleges")
+
+        gap = np.where(constant, percentile - 50.0, gap.astype(np.float64))
+        return {
+            'rows': rows[keep],
+            'groups': groups[keep],
+            'predicted': np.where(constant, 50.0, predicted.astype(np.float64))[keep],
+            'gap': gap[keep],
+            'closeness': np.abs(gap[keep]),
+        }
+
+    def _log_key_colleges(self, rows: np.ndarray, predicted: np.ndarray, percentile: float):
+        """Debug diagnostic: predicted range of COEP/Cummins among the candidates"""
+        logger.debug(f"🔍 KEY COLLEGES CHECK (Before Gap Filter) | Your percentile: {percentile}%")
+        names = self.college_data['college_name'].take(rows)
+        for label, pattern in [('COEP', 'COEP|College of Engineering.*Pune'), ('Cummins', 'Cummins')]:
+            matched = names.str.contains(pattern, case=False, na=False, regex=True).to_numpy()
+            if matched.any():
+                logger.debug(f"   ✅ {label}: {int(matched.sum())} records | Predicted: "
+                             f"{predicted[matched].min():.1f}% - {predicted[matched].max():.1f}%")
+
+    def _rank_candidates(self, scored: Dict[str, np.ndarray], limit: int) -> np.ndarray:
+        """
+        Keep the best row per (group, college) and order each group by
+        closeness, then closing percentile and type weight (both descending),
+        then college name. Returns positions into the scored arrays.
+        """
+        rows, groups, closeness = scored['rows'], scored['groups'], scored['closeness']
+        cutoff = self._closing_percentile[rows]
+        weight = self._type_weight[rows]
+        college = self.index.college_rank[rows]
+
+        # === DEDUPLICATE BY COLLEGE === (grouped arg-min, no full sort)
+        best = best_per_college(groups, college, len(self.index.college_values),
+                                closeness, cutoff, weight, rows)
+
+        # === TOP-K PER GROUP === (partial selection, only the head is sorted)
+        return top_k_per_group(groups, best, college, closeness, cutoff, weight, limit)
+
+    @staticmethod
+    def _rounded(values: np.ndarray) -> List[float]:
+        """round(float(v), 2) for every value, as plain Python floats"""
+        return [round(v, 2) for v in np.asarray(values, dtype=np.float64).tolist()]
+
+    def _build_results(self, scored: Dict[str, np.ndarray], selected: np.ndarray) -> List[Dict]:
+        """
+        Build the JSON-ready result records for the given scored positions, in
+        order. Every field is converted column-wise; records are only zipped
+        together at the end.
+        """
+        data = self.college_data
+        rows = scored['rows'][selected]
+        gap = scored['gap'][selected]
+        probability = self._admission_probability(gap)
+        tags = self._category_tag(probability).tolist()
+
+        def column(name: str) -> List[str]:
+            return data[name].to_numpy()[rows].astype(str).tolist()
+
+        n = len(rows)
+        closing_rank = data['closing_rank'].to_numpy()[rows].tolist()
+        columns = {
+            'rank': range(1, n + 1),
+            'college_name': column('college_name'),
+            'branch': column('branch_name'),
+            'branch_code': column('branch_code') if 'branch_code' in data else ['N/A'] * n,
+            'city': column('city'),
+            'type': column('type'),
+
+            # ML predictions
+            'predicted_cutoff': self._rounded(scored['predicted'][selected]),
+            'historical_cutoff': self._rounded(self._closing_percentile[rows]),
+            'cutoff_rank': [int(v) if pd.notna(v) else None for v in closing_rank],
+
+            'admission_probability': self._rounded(probability),
+            'percentile_gap': self._rounded(gap),
+            'closeness': self._rounded(scored['closeness'][selected]),
+
+            # Category
+            'category': tags,
+            'category_emoji': [self.get_category_emoji(tag) for tag in tags],
+
+            # Metadata
+            'quota_category': column('category'),
+            'round': data['round'].to_numpy()[rows].astype(int).tolist() if 'round' in data else [1] * n,
+            'is_women_only': self.index.women_only[rows].tolist(),
+            'ml_model': ['XGBoost (Enhanced)'] * n
+        }
+
+        keys = list(columns)
+        return [dict(zip(keys, values)) for values in zip(*columns.values())]
+
+    def _predict_branches(self,
+                          percentile: float,
+                          category: str,
+                          gender: Optional[str],
+                          city: Optional[str],
+                          branches: List[Optional[str]],
+                          limit: int):
+        """
+        Run filtering, scoring and ranking for every branch in one pass.
+
+        Returns:
+            (scored, selected) - scored candidate arrays and the positions of
+            each branch's top-`limit` colleges, ordered by branch then rank
+        """
+        rows, groups = self._select_candidates(category, gender, city, branches)
+        scored = self._score_candidates(rows, groups, len(branches), percentile)
+        selected = self._rank_candidates(scored, limit)
+        return scored, selected
+
     def predict_colleges(self,
                         rank: int,
                         percentile: float,
@@ -253,257 +591,38 @@ class CollegePredictor:
             List of college predictions
         """
         try:
-            print(f"\n{'='*60}")
-            print(f"🎯 PREDICTION WITH ENHANCED FILTERING")
-            print(f"{'='*60}")
-            print(f"Percentile: {percentile}% | Rank: {rank} | Category: {category}")
-            print(f"Gender: {gender or 'Not specified'} | City: {city or 'All'} | Branch: {branch or 'All'}")
-            print(f"{'='*60}\n")
-
-            # Normalize gender
-            gender_normalized = None
-            if gender:
-                gender_str = str(gender).strip().upper()
-                if gender_str in ['M', 'MALE']:
-                    gender_normalized = 'M'
-                elif gender_str in ['F', 'FEMALE']:
-                    gender_normalized = 'F'
-
-            # Start with full dataset
-            filtered_df = self.college_data.copy()
-            initial_count = len(filtered_df)
-
-            # === GENDER & WOMEN-ONLY COLLEGE FILTERING ===
-            if gender_normalized:
-                if gender_normalized == 'M':
-                    # MALES: Exclude women-only colleges
-                    filtered_df = filtered_df[
-                        ~filtered_df['college_name'].apply(self._is_women_only_college)
-                    ]
-                    # Exclude ladies-only category codes (specific L-categories, NOT all L-prefix)
-                    filtered_df = filtered_df[
-                        ~filtered_df['category'].isin(self.LADIES_ONLY_CATEGORIES)
-                    ]
-                    print(f"✅ MALE FILTER: {initial_count} → {len(filtered_df)} records")
-                    print(f"   Excluded women-only colleges (Cummins, etc.)")
-                    print(f"   Excluded ladies-only categories: {len(self.LADIES_ONLY_CATEGORIES)} types")
-                
-                elif gender_normalized == 'F':
-                    # FEMALES: Include ALL colleges (no filtering)
-                    print(f"✅ FEMALE FILTER: All {len(filtered_df)} records included")
-                    print(f"   ✓ Women-only colleges (Cummins): INCLUDED")
-                    print(f"   ✓ Co-ed colleges (COEP, etc.): INCLUDED")
-                    print(f"   ✓ All category codes: INCLUDED")
-
-            # === CATEGORY FILTERING (OPEN + Specific Caste) ===
-            allowed_categories = self._get_allowed_categories(category, gender)
-            
-            if allowed_categories:
-                before_cat = len(filtered_df)
-                filtered_df = filtered_df[
-                    filtered_df['category'].isin(allowed_categories)
-                ]
-                print(f"\n✅ CATEGORY FILTER ({category}): {before_cat} → {len(filtered_df)} records")
-                print(f"   Allowed categories: {', '.join(allowed_categories)}")
-                
-                # DIAGNOSTIC: Verify filtering for males
-                if gender_normalized == 'M':
-                    ladies_found = filtered_df[filtered_df['category'].isin(self.LADIES_ONLY_CATEGORIES)]
-                    if len(ladies_found) > 0:
-                        print(f"   ⚠️ WARNING: {len(ladies_found)} ladies-only records found for MALE!")
-                        print(f"   Ladies categories: {ladies_found['category'].unique()[:5]}")
-                    else:
-                        print(f"   ✓ Verified: No ladies-only categories for males")
-                        print(f"   ✓ DEF/PWD/TFWS seats: ALLOWED for males")
-
-            # === CITY FILTER ===
-            if city:
-                before_city = len(filtered_df)
-                filtered_df = filtered_df[
-                    filtered_df['city'].str.contains(city, case=False, na=False)
-                ]
-                print(f"✅ CITY FILTER ({city}): {before_city} → {len(filtered_df)} records")
-
-            # === BRANCH FILTER ===
-            if branch:
-                before_branch = len(filtered_df)
-                filtered_df = filtered_df[
-                    filtered_df['branch_name'].str.contains(branch, case=False, na=False)
-                ]
-                print(f"✅ BRANCH FILTER ({branch}): {before_branch} → {len(filtered_df)} records")
-
-            # === FALLBACK IF NO RESULTS ===
-            if filtered_df.empty:
-                print("\n⚠️ NO COLLEGES FOUND! Relaxing filters...")
-                filtered_df = self.college_data.copy()
-                
-                # Reapply only gender filter as fallback
-                if gender_normalized == 'M':
-                    filtered_df = filtered_df[
-                        ~filtered_df['college_name'].apply(self._is_women_only_college)
-                    ]
-                    filtered_df = filtered_df[
-                        ~filtered_df['category'].isin(self.LADIES_ONLY_CATEGORIES)
-                    ]
-                    print(f"   Fallback: {len(filtered_df)} records (males only)")
-                else:
-                    print(f"   Fallback: {len(filtered_df)} records (all colleges)")
-
-            # === ML PREDICTION ===
-            X_test = filtered_df[['C_normalized', 'Type_Weight']]
-            filtered_df['Predicted_Percentile'] = self.model.predict(X_test)
-
-            # Normalize predictions
-            pred_min = filtered_df['Predicted_Percentile'].min()
-            pred_max = filtered_df['Predicted_Percentile'].max()
-            
-            if pred_max > pred_min:
-                filtered_df['Predicted_Percentile'] = (
-                    (filtered_df['Predicted_Percentile'] - pred_min) / 
-                    (pred_max - pred_min)
-                ) * 100
-            else:
-                filtered_df['Predicted_Percentile'] = 50.0
-
-            # === CALCULATE GAP ===
-            filtered_df['percentile_gap'] = percentile - filtered_df['Predicted_Percentile']
-
-            # === DIAGNOSTIC: Check key colleges before gap filter ===
-            print(f"\n🔍 KEY COLLEGES CHECK (Before Gap Filter):")
-            print(f"   Your percentile: {percentile}%")
-            
-            coep_check = filtered_df[filtered_df['college_name'].str.contains(
-                'COEP|College of Engineering.*Pune', case=False, na=False, regex=True
-            )]
-            if len(coep_check) > 0:
-                print(f"   ✅ COEP: {len(coep_check)} records | Predicted: {coep_check['Predicted_Percentile'].min():.1f}% - {coep_check['Predicted_Percentile'].max():.1f}%")
-            
-            cummins_check = filtered_df[filtered_df['college_name'].str.contains(
-                'Cummins', case=False, na=False
-            )]
-            if len(cummins_check) > 0:
-                print(f"   ✅ Cummins: {len(cummins_check)} records | Predicted: {cummins_check['Predicted_Percentile'].min():.1f}% - {cummins_check['Predicted_Percentile'].max():.1f}%")
-
-            # === APPLY WIDENED GAP FILTERING ===
-            print(f"\n🎯 APPLYING WIDENED GAP FILTER:")
-            print(f"   Range: {percentile - 15:.1f}% to {percentile + 10:.1f}%")
-            
-            realistic_df = filtered_df[
-                (filtered_df['Predicted_Percentile'] >= percentile - 15) &
-                (filtered_df['Predicted_Percentile'] <= percentile + 10)
-            ].copy()
-
-            print(f"✅ After gap filtering: {len(realistic_df)} colleges")
-
-            # === FALLBACK: Even wider range if needed ===
-            if realistic_df.empty:
-                print("⚠️ No colleges in range! Using wider ±20% filter...")
-                realistic_df = filtered_df[
-                    (filtered_df['Predicted_Percentile'] >= percentile - 20) & 
-                    (filtered_df['Predicted_Percentile'] <= percentile + 15)
-                ].copy()
-                print(f"   Relaxed filter: {len(realistic_df)} colleges")
-
-            # === CALCULATE PROBABILITY ===
-            def calculate_probability(gap):
-                if gap >= 5:      return 90.0
-                elif gap >= 3:    return 80.0
-                elif gap >= 0:    return 70.0
-                elif gap >= -2:   return 60.0
-                elif gap >= -5:   return 50.0
-                elif gap >= -10:  return 40.0
-                else:             return 30.0
-
-            realistic_df['admission_probability'] = realistic_df['percentile_gap'].apply(
-                calculate_probability
-            )
-
-            # === CATEGORIZE ===
-            def categorize(prob):
-                if prob >= 70:    return "HIGH"
-                elif prob >= 50:  return "MODERATE"
-                else:             return "BACKUP"
-
-            realistic_df['category_tag'] = realistic_df['admission_probability'].apply(categorize)
-
-            # === CALCULATE CLOSENESS ===
-            realistic_df['closeness'] = abs(percentile - realistic_df['Predicted_Percentile'])
-
-            # === DEDUPLICATE BY COLLEGE ===
-            realistic_df = realistic_df.sort_values(
-                by=['closeness', 'closing_percentile', 'Type_Weight'],
-                ascending=[True, False, False]
-            )
-            
-            recommendations = realistic_df.groupby('college_name', as_index=False).first()
+            logger.info(f"🎯 PREDICT | Percentile: {percentile}% | Rank: {rank} | Category: {category} | "
+                        f"Gender: {gender or 'Not specified'} | City: {city or 'All'} | Branch: {branch or 'All'}")
 
-            # === FINAL SORT ===
-            recommendations = recommendations.sort_values(
-                by=['closeness', 'closing_percentile', 'Type_Weight'],
-                ascending=[True, False, False]
-            )
+            scored, selected = self._predict_branches(percentile, category, gender, city, [branch], limit)
+            results = self._build_results(scored, selected)
 
-            print(f"\n📊 FINAL RESULTS:")
-            high_prob = recommendations[recommendations['admission_probability'] >= 70]
-            mod_prob = recommendations[(recommendations['admission_probability'] >= 50) & 
-                                      (recommendations['admission_probability'] < 70)]
-            low_prob = recommendations[recommendations['admission_probability'] < 50]
-            
-            print(f"✅ HIGH (70%+): {len(high_prob)} colleges")
-            print(f"🔵 MODERATE (50-69%): {len(mod_prob)} colleges")
-            print(f"🟠 BACKUP (<50%): {len(low_prob)} colleges")
-
-            # === BUILD RESULT LIST ===
-            results = []
-            for idx, (_, row) in enumerate(recommendations.head(limit).iterrows(), 1):
-                result = {
-                    'rank': idx,
-                    'college_name': str(row['college_name']),
-                    'branch': str(row['branch_name']),
-                    'branch_code': str(row.get('branch_code', 'N/A')),
-                    'city': str(row['city']),
-                    'type': str(row['type']),
-                    
-                    # ML predictions
-                    'predicted_cutoff': round(float(row['Predicted_Percentile']), 2),
-                    'historical_cutoff': round(float(row['closing_percentile']), 2),
-                    'cutoff_rank': int(row['closing_rank']) if pd.notna(row.get('closing_rank')) else None,
-                    
-                    'admission_probability': round(float(row['admission_probability']), 2),
-                    'percentile_gap': round(float(row['percentile_gap']), 2),
-                    'closeness': round(float(row['closeness']), 2),
-                    
-                    # Category
-                    'category': str(row['category_tag']),
-                    'category_emoji': self.get_category_emoji(row['category_tag']),
-                    
-                    # Metadata
-                    'quota_category': str(row.get('category', 'N/A')),
-                    'round': int(row.get('round', 1)),
-                    'is_women_only': self._is_women_only_college(row['college_name']),
-                    'ml_model': 'XGBoost (Enhanced)'
-                }
-                results.append(result)
-
-            # Print top 10
-            print(f"\n📋 TOP 10 MATCHES (Closest to {percentile}%):")
-            print(f"{'#':<5}{'College':<40}{'Pred%':<8}{'Gap':<8}{'Prob%'}")
-            print("="*70)
-            for r in results[:10]:
-                college_short = r['college_name'][:38]
-                print(f"{r['rank']:<5}{college_short:<40}{r['predicted_cutoff']:<8.2f}{r['percentile_gap']:<8.2f}{r['admission_probability']:.1f}%")
-
-            print(f"\n✅ Total: {len(results)} realistic matches")
-            print(f"{'='*60}\n")
+            logger.info(f"✅ {len(results)} realistic matches | "
+                        f"HIGH: {sum(r['category'] == 'HIGH' for r in results)} | "
+                        f"MODERATE: {sum(r['category'] == 'MODERATE' for r in results)} | "
+                        f"BACKUP: {sum(r['category'] == 'BACKUP' for r in results)}")
+            if diagnostics_enabled():
+                self._log_top_matches(results, percentile)
 
             return results
 
         except Exception as e:
-            print(f"❌ Prediction error: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception(f"❌ Prediction error: {e}")
             return []
 
+    def _log_top_matches(self, results: List[Dict], percentile: float):
+        """Debug diagnostic: top 10 matches table"""
+        lines = [
+            f"📋 TOP 10 MATCHES (Closest to {percentile}%):",
+            f"{'#':<5}{'College':<40}{'Pred%':<8}{'Gap':<8}{'Prob%'}",
+            "=" * 70
+        ]
+        for r in results[:10]:
+            college_short = r['college_name'][:38]
+            lines.append(f"{r['rank']:<5}{college_short:<40}{r['predicted_cutoff']:<8.2f}"
+                         f"{r['percentile_gap']:<8.2f}{r['admission_probability']:.1f}%")
+        logger.debug("\n".join(lines))
+
     def predict_multiple_branches(self,
                                   rank: int,
                                   percentile: float,
@@ -512,38 +631,38 @@ class CollegePredictor:
                                   gender: Optional[str] = None,
                                   city: Optional[str] = None,
                                   limit: int = 100) -> List[Dict]:
-        """Predict for multiple branches with all filters"""
-        all_results = []
-        
-        for branch in branches:
-            results = self.predict_colleges(
-                rank=rank,
-                percentile=percentile,
-                category=category,
-                gender=gender,
-                city=city,
-                branch=branch,
-                limit=limit
+        """
+        Predict for multiple branches with all filters.
+
+        Shared filters run once and all branches are scored and ranked in a
+        single pass; each branch keeps its own renormalisation, gap window and
+        top-`limit` cut, as if predicted separately.
+        """
+        try:
+            logger.info(f"🎯 PREDICT | {len(branches)} branches | Percentile: {percentile}% | "
+                        f"Rank: {rank} | Category: {category} | Gender: {gender or 'Not specified'} | "
+                        f"City: {city or 'All'}")
+            scored, selected = self._predict_branches(
+                percentile, category, gender, city, list(branches), limit
             )
-            all_results.extend(results)
-        
-        # Deduplicate by branch_code
-        seen = set()
-        unique_results = []
-        for r in all_results:
-            key = r['branch_code']
-            if key not in seen:
-                seen.add(key)
-                unique_results.append(r)
-        
-        # Sort by closeness first, then quality
-        unique_results.sort(key=lambda x: (x['closeness'], -x['historical_cutoff']))
-        
-        # Re-assign ranks
-        for idx, r in enumerate(unique_results, 1):
-            r['rank'] = idx
-        
-        return unique_results[:limit]
+
+            # Deduplicate by branch_code (first branch wins)
+            branch_codes = (self.college_data['branch_code'].to_numpy()[scored['rows'][selected]].astype(str)
+                            if 'branch_code' in self.college_data else np.full(len(selected), 'N/A'))
+            _, first_seen = np.unique(branch_codes, return_index=True)
+            unique = selected[np.sort(first_seen)]
+
+            # Sort by closeness first, then quality (on the rounded values, as returned)
+            closeness = np.array([round(float(v), 2) for v in scored['closeness'][unique]])
+            cutoff = np.array([round(float(v), 2) for v in self._closing_percentile[scored['rows'][unique]]])
+            unique = unique[np.lexsort((-cutoff, closeness))]
+
+            # Only the final top-`limit` records are materialised; ranks follow the new order
+            return self._build_results(scored, unique[:limit])
+
+        except Exception as e:
+            logger.exception(f"❌ Prediction error: {e}")
+            return []
 
     def get_category_emoji(self, category: str) -> str:
         emojis = {
@@ -0,0 +1,89 @@
+"""
+Ranking primitives for CollegePredictor.
+
+Replace the sort -> groupby(college).first() -> sort -> head(limit) pipeline
+with a grouped arg-min (linear) and a per-group partial top-k selection.
+"""
+import numpy as np
+
+
+def _group_reduce(ufunc, keys: np.ndarray, values: np.ndarray, size: int, initial) -> np.ndarray:
+    """Reduce `values` per integer key with `ufunc` (e.g. np.minimum) into a dense table"""
+    table = np.full(size, initial, dtype=values.dtype)
+    ufunc.at(table, keys, values)
+    return table
+
+
+def best_per_college(groups: np.ndarray,
+                     college: np.ndarray,
+                     n_colleges: int,
+                     closeness: np.ndarray,
+                     cutoff: np.ndarray,
+                     weight: np.ndarray,
+                     order: np.ndarray) -> np.ndarray:
+    """
+    Grouped arg-min: position of the best row for every (group, college) pair.
+
+    "Best" is the lexicographic minimum of (closeness, -cutoff, -weight, order),
+    i.e. the first row of each college after a stable sort by closeness asc,
+    closing percentile desc and type weight desc. Runs in O(n) with no sort.
+
+    Args:
+        groups: Group id per row (e.g. requested branch)
+        college: Integer college id per row, 0 <= id < n_colleges
+        closeness, cutoff, weight: Ranking keys per row
+        order: Original position per row (final tie-break, must be unique per group)
+
+    Returns:
+        Positions of the winning rows (unordered)
+    """
+    if len(groups) == 0:
+        return np.empty(0, dtype=np.intp)
+
+    key = groups.astype(np.int64) * n_colleges + college
+    size = int(key.max()) + 1
+    candidate = np.arange(len(key))
+
+    # Narrow the candidates one ranking key at a time
+    for values, ufunc, initial in [(closeness, np.minimum, np.inf),
+                                   (cutoff, np.maximum, -np.inf),
+                                   (weight, np.maximum, -np.inf)]:
+        k, v = key[candidate], values[candidate]
+        target = _group_reduce(ufunc, k, v, size, initial)
+        candidate = candidate[v == target[k]]
+
+    k, v = key[candidate], order[candidate]
+    first = _group_reduce(np.minimum, k, v, size, np.iinfo(v.dtype).max)
+    return candidate[v == first[k]]
+
+
+def top_k_per_group(groups: np.ndarray,
+                    positions: np.ndarray,
+                    college: np.ndarray,
+                    closeness: np.ndarray,
+                    cutoff: np.ndarray,
+                    weight: np.ndarray,
+                    limit: int) -> np.ndarray:
+    """
+    Order the per-college winners of every group by closeness asc, closing
+    percentile desc, type weight desc, college id asc and keep the first
+    `limit` of each group. Uses partial selection on closeness so only the
+    rows that can make the cut (including boundary ties) are fully sorted.
+
+    Returns:
+        Positions ordered by group, then rank
+    """
+    if len(positions) == 0 or limit <= 0:
+        return np.empty(0, dtype=np.intp)
+
+    selected = []
+    for group in np.unique(groups[positions]):
+        members = positions[groups[positions] == group]
+        if len(members) > limit:
+            close = closeness[members]
+            boundary = np.partition(close, limit - 1)[limit - 1]
+            members = members[close <= boundary]
+        ranked = members[np.lexsort((college[members], -weight[members],
+                                     -cutoff[members], closeness[members]))]
+        selected.append(ranked[:limit])
+    return np.concatenate(selected)
@@ -0,0 +1,288 @@
+# backend/services/runtime.py
+"""
+Versioned runtime state (predictor, comparator, college directory, ...).
+
+Blueprints register a builder per component; the current RuntimeState holds
+one instance of each. reload() builds a complete new state in the
+background from freshly loaded data/model files and swaps it in with a
+single reference assignment:
+
+- requests grab `current()` once and keep using that state, so in-flight
+  requests finish on the old version
+- new requests see the new version as soon as it is fully built
+- if any component fails to build, the old state stays active
+
+Lazy components (e.g. the college directory) are built single-flight on
+first use, or ahead of traffic by warm_up(); ready() tells load balancers
+when everything is built.
+
+Set DATA_RELOAD_INTERVAL (seconds) to also poll the data/model files and
+reload automatically when they change (per worker process). WARMUP_ON_START=0
+disables warm-up (startup and after reloads).
+"""
+import hashlib
+import hmac
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from utils import data_registry
+from utils.data_snapshot import BACKEND_DIR, default_sources
+from utils.logger import get_logger
+
+logger = get_logger('runtime')
+
+# Files whose change means "new data/model version" (with the data sources,
+# including per-year files added later)
+WATCHED_MODELS = [os.path.join('model', 'xgb_cap_model.pkl')]
+RELOAD_INTERVAL = float(os.getenv('DATA_RELOAD_INTERVAL', '0'))
+WARMUP_ENABLED = os.getenv('WARMUP_ON_START', '1').lower() not in ('0', 'false', 'no', 'off')
+
+_builders: Dict[str, tuple] = {}
+_swap_hooks: List[Callable[['RuntimeState'], None]] = []
+_state_lock = threading.Lock()
+_reload_lock = threading.Lock()
+_current: Optional['RuntimeState'] = None
+_generation = 0
+_last_reload: Dict[str, Any] = {}
+_watcher_pid = None
+
+
+def data_fingerprint() -> str:
+    """Hash of size/mtime of every watched data and model file"""
+    digest = hashlib.sha1()
+    for relative_path in default_sources() + WATCHED_MODELS:
+        path = os.path.join(BACKEND_DIR, relative_path)
+        try:
+            stat = os.stat(path)
+            digest.update(f"{relative_path}:{stat.st_size}:{stat.st_mtime_ns};".encode())
+        except OSError:
+            digest.update(f"{relative_path}:missing;".encode())
+    return digest.hexdigest()[:10]
+
+
+class RuntimeState:
+    """One immutable-by-convention generation of the app's data-backed components"""
+
+    def __init__(self, generation: int, fingerprint: str):
+        self.generation = generation
+        self.fingerprint = fingerprint
+        self.version = f"{generation}-{fingerprint}"
+        self.loaded_at = datetime.now().isoformat(timespec='seconds')
+        self._components: Dict[str, Any] = {}
+        self._errors: Dict[str, str] = {}
+        self._building = set()
+        self._lock = threading.Lock()
+
+    def get(self, name: str) -> Any:
+        """
+        Component instance; lazy ones are built on first use. None if the
+        builder failed (eager components are not retried within a version).
+        """
+        if name in self._components:
+            return self._components[name]
+        with self._lock:
+            if name not in self._components:
+                self._build(name)
+        return self._components.get(name)
+
+    def built(self) -> List[str]:
+        return [name for name, value in self._components.items() if value is not None]
+
+    def _build(self, name: str) -> bool:
+        builder, lazy = _builders[name]
+        self._building.add(name)
+        try:
+            self._components[name] = builder()
+            self._errors.pop(name, None)
+            return True
+        except Exception as e:
+            logger.exception(f"❌ Failed to build '{name}' for version {self.version}: {e}")
+            self._errors[name] = str(e)
+            if not lazy:
+                self._components[name] = None
+            # Lazy components stay unset so the next get() retries
+            return False
+        finally:
+            self._building.discard(name)
+
+    def ready(self) -> bool:
+        """True once every registered component is built successfully"""
+        return all(self._components.get(name) is not None for name in _builders)
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            'version': self.version,
+            'generation': self.generation,
+            'data_fingerprint': self.fingerprint,
+            'loaded_at': self.loaded_at,
+            'components': {
+                name: ('ready' if self._components.get(name) is not None
+                       else 'building' if name in self._building
+                       else 'failed' if name in self._errors else 'not_loaded')
+                for name in _builders
+            },
+            'ready': self.ready()
+        }
+
+
+def register(name: str, builder: Callable[[], Any], lazy: bool = False) -> None:
+    """
+    Register a component builder. Eager components are built into the current
+    state right away (keeps import-time startup and gunicorn preload working);
+    lazy ones on first `get()`.
+    """
+    _builders[name] = (builder, lazy)
+    state = current()
+    if not lazy:
+        state.get(name)
+
+
+def on_swap(hook: Callable[['RuntimeState'], None]) -> None:
+    """Call `hook(new_state)` after every successful reload (e.g. to clear caches)"""
+    _swap_hooks.append(hook)
+
+
+def current() -> RuntimeState:
+    global _current, _generation
+    state = _current
+    if state is None:
+        with _state_lock:
+            if _current is None:
+                _generation += 1
+                _current = RuntimeState(_generation, data_fingerprint())
+            state = _current
+    _ensure_watcher()
+    return state
+
+
+def warm_up(wait: bool = False) -> Optional[threading.Thread]:
+    """
+    Build all lazy components of the current state ahead of traffic (no-op
+    when WARMUP_ON_START is off or everything is built). Runs in a
+    background thread unless `wait`.
+    """
+    state = current()
+    if not WARMUP_ENABLED or state.ready():
+        return None
+
+    def run():
+        started = time.perf_counter()
+        for name in _builders:
+            state.get(name)
+        logger.info(f"🔥 Warm-up of version {state.version} finished in "
+                    f"{time.perf_counter() - started:.2f}s (ready: {state.ready()})")
+
+    if wait:
+        run()
+        return None
+    thread = threading.Thread(target=run, name='runtime-warmup', daemon=True)
+    thread.start()
+    return thread
+
+
+def ready() -> bool:
+    return current().ready()
+
+
+def reload_allowed(token: Optional[str]) -> bool:
+    """
+    True when a reload may be triggered with this X-Reload-Token value:
+    always when RELOAD_TOKEN is unset, otherwise only with a matching token.
+    """
+    reload_token = os.getenv('RELOAD_TOKEN')
+    if not reload_token:
+        return True
+    return hmac.compare_digest((token or '').encode(), reload_token.encode())
+
+
+def reload(wait: bool = False) -> Dict[str, Any]:
+    """
+    Build a new state in the background and swap it in. Returns immediately
+    (or after the swap when `wait`) with the reload status.
+    """
+    if not _reload_lock.acquire(blocking=False):
+        return {'started': False, 'message': 'Reload already in progress', **reload_status()}
+
+    thread = threading.Thread(target=_reload_locked, name='runtime-reload', daemon=True)
+    thread.start()
+    if wait:
+        thread.join()
+    return {'started': True, **reload_status()}
+
+
+def reload_status() -> Dict[str, Any]:
+    return {'active': current().status(), 'last_reload': dict(_last_reload)}
+
+
+def _reload_locked() -> None:
+    global _current, _generation
+    started = time.perf_counter()
+    old = current()
+    try:
+        # Drop the shared frames/models whose files changed so the new state
+        # reads them again (unchanged ones stay shared); the old state keeps
+        # its own references until it is garbage
+        data_registry.invalidate_changed()
+
+        with _state_lock:
+            _generation += 1
+            new = RuntimeState(_generation, data_fingerprint())
+
+        # Rebuild every eager component plus lazy ones that were warm (or all with warm-up on)
+        names = [name for name, (_, lazy) in _builders.items()
+                 if not lazy or WARMUP_ENABLED or name in old.built()]
+        failed = [name for name in names if not new._build(name)]
+        if failed:
+            raise RuntimeError(f"components failed to build: {', '.join(failed)}")
+
+        with _state_lock:
+            _current = new
+        for hook in _swap_hooks:
+            try:
+                hook(new)
+            except Exception as e:
+                logger.warning(f"⚠️ Swap hook failed: {e}")
+
+        _last_reload.update({
+            'status': 'ok', 'version': new.version, 'error': None, 'failed_fingerprint': None,
+            'finished_at': datetime.now().isoformat(timespec='seconds'),
+            'duration_seconds': round(time.perf_counter() - started, 2)
+        })
+        logger.info(f"🔁 Runtime reloaded: {old.version} → {new.version} "
+                    f"in {_last_reload['duration_seconds']}s")
+    except Exception as e:
+        _last_reload.update({
+            'status': 'failed', 'version': old.version, 'error': str(e),
+            'failed_fingerprint': data_fingerprint(),
+            'finished_at': datetime.now().isoformat(timespec='seconds'),
+            'duration_seconds': round(time.perf_counter() - started, 2)
+        })
+        logger.error(f"❌ Reload failed, keeping version {old.version}: {e}")
+    finally:
+        _reload_lock.release()
+
+
+def _ensure_watcher() -> None:
+    """Start the file watcher once per process (threads don't survive fork)"""
+    global _watcher_pid
+    if RELOAD_INTERVAL <= 0 or _watcher_pid == os.getpid():
+        return
+    with _state_lock:
+        if _watcher_pid == os.getpid():
+            return
+        _watcher_pid = os.getpid()
+    threading.Thread(target=_watch, name='runtime-watcher', daemon=True).start()
+
+
+def _watch() -> None:
+    while True:
+        time.sleep(RELOAD_INTERVAL)
+        fingerprint = data_fingerprint()
+        # Don't retry a failed reload until the files change again
+        if fingerprint in (current().fingerprint, _last_reload.get('failed_fingerprint')):
+            continue
+        logger.info("📂 Data/model files changed, reloading")
+        reload(wait=True)
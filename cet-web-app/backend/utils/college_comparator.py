@@ -3,6 +3,16 @@ import numpy as np
 from typing import List, Dict, Optional, Tuple
 import os
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.cutoff_index import CutoffIndex
+from utils.data_registry import get_dataset
+from utils.data_snapshot import year_files
+from utils.fuzzy_match import COLLEGE_ALIASES
+from utils.search_index import SearchIndex
+
+# Threads used to load the per-year cutoff files
+YEAR_LOAD_WORKERS = int(os.getenv('YEAR_LOAD_WORKERS', '4'))
 
 class CollegeComparator:
     """
@@ -216,16 +226,17 @@ class CollegeComparator:
         """
         try:
             # Load merged cutoff data (2021-2025)
-            self.merged_data = self._load_merged_data(merged_data_path)
+            merged_data = self._load_merged_data(merged_data_path)
             
-            # Load individual year files as fallback
-            self.individual_data = self._load_individual_data(individual_data_dir)
+            # Load individual year files (fill in what the merged file lacks)
+            individual_data = self._load_individual_data(individual_data_dir)
             
             # Load college URLs
             self.college_urls = self._load_college_urls(colleges_url_path)
             
             # Load main college metadata
             self.college_metadata = self._load_college_metadata(main_data_path)
+            self.college_cities = self._build_college_cities(self.college_metadata)
             
             # Build reverse category mapping for normalization
             self.category_code_to_group = {}
@@ -245,18 +256,27 @@ class CollegeComparator:
                 for variation in variations:
                     self.type_name_to_group[variation.lower()] = group
             
+            # One canonical cutoff table that every lookup reads, plus its
+            # (college, branch, category) index
+            self.cutoff_data = self._build_cutoff_store(merged_data, individual_data)
+            self.cutoff_index = CutoffIndex(self.cutoff_data)
+            # Typeahead index over the distinct college names (search_colleges)
+            self.name_index = SearchIndex(
+                self.cutoff_data['college_name'].cat.categories.tolist() if not self.cutoff_data.empty else [],
+                COLLEGE_ALIASES
+            )
+            
             print("✅ College Comparator initialized successfully!")
-            print(f"   - Merged data: {len(self.merged_data)} records")
-            print(f"   - Individual data: {len(self.individual_data)} records")
+            print(f"   - Merged data: {len(merged_data)} records")
+            print(f"   - Individual data: {len(individual_data)} records")
+            print(f"   - Cutoff store: {len(self.cutoff_data)} records")
             print(f"   - College URLs: {len(self.college_urls)} colleges")
             print(f"   - Category groups: {len(self.CATEGORY_GROUPS)}")
             print(f"   - Branch groups: {len(self.BRANCH_GROUPS)}")
             
             # Debug: Print sample data columns
-            if not self.merged_data.empty:
-                print(f"   - Merged data columns: {list(self.merged_data.columns)}")
-            if not self.individual_data.empty:
-                print(f"   - Individual data columns: {list(self.individual_data.columns)}")
+            if not self.cutoff_data.empty:
+                print(f"   - Cutoff store columns: {list(self.cutoff_data.columns)}")
             
         except Exception as e:
             print(f"❌ Error initializing College Comparator: {e}")
@@ -272,7 +292,7 @@ class CollegeComparator:
         """Load merged cutoff data (2021-2025)"""
         try:
             if os.path.exists(path):
-                df = pd.read_csv(path)
+                df = get_dataset(path)
                 # Ensure college_code is string for consistent comparison
                 df['college_code'] = df['college_code'].astype(str).str.strip()
                 df['year'] = df['year'].astype(str)
@@ -290,24 +310,24 @@ class CollegeComparator:
             return pd.DataFrame()
     
     def _load_individual_data(self, dir_path: str) -> pd.DataFrame:
-        """Load individual year files (2021-2025) as fallback"""
+        """
+        Load individual year files (<year>.csv in dir_path) as fallback.
+        
+        Years are discovered from the directory and loaded concurrently. The
+        files go through the shared data registry, which keeps each parsed
+        year until its file changes, so adding a year only parses that file.
+        """
         try:
             if not os.path.exists(dir_path):
                 print(f"⚠️ Individual data directory not found: {dir_path}")
                 return pd.DataFrame()
             
-            all_data = []
-            for year in ['2021', '2022', '2023', '2024', '2025']:
-                file_path = os.path.join(dir_path, f"{year}.csv")
-                if os.path.exists(file_path):
-                    df_year = pd.read_csv(file_path)
-                    df_year['year'] = year
-                    # Ensure consistent data types
-                    df_year['college_code'] = df_year['college_code'].astype(str).str.strip()
-                    df_year['category'] = df_year['category'].astype(str).str.strip().str.upper()
-                    df_year['branch_name'] = df_year['branch_name'].astype(str).str.strip()
-                    all_data.append(df_year)
-                    print(f"   ✓ Loaded {year}: {len(df_year)} records")
+            files = year_files(dir_path)
+            workers = max(1, min(YEAR_LOAD_WORKERS, len(files)))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='year-loader') as pool:
+                all_data = list(pool.map(lambda item: self._load_year(*item), files))
+            for (year, _), df_year in zip(files, all_data):
+                print(f"   ✓ Loaded {year}: {len(df_year)} records")
             
             if all_data:
                 df_combined = pd.concat(all_data, ignore_index=True)
@@ -323,11 +343,21 @@ class CollegeComparator:
             traceback.print_exc()
             return pd.DataFrame()
     
+    def _load_year(self, year: str, file_path: str) -> pd.DataFrame:
+        """One year file with the columns cleaned like the merged data"""
+        df_year = get_dataset(file_path)
+        df_year['year'] = year
+        # Ensure consistent data types
+        df_year['college_code'] = self._clean_column(df_year['college_code'], str.strip)
+        df_year['category'] = self._clean_column(df_year['category'], lambda v: v.strip().upper())
+        df_year['branch_name'] = self._clean_column(df_year['branch_name'], str.strip)
+        return df_year
+    
     def _load_college_urls(self, path: str) -> Dict[str, str]:
         """Load college URLs from Excel file"""
         try:
             if os.path.exists(path):
-                df = pd.read_excel(path)
+                df = get_dataset(path)
                 
                 # Debug: Print column names to see what we have
                 print(f"   URL file columns: {list(df.columns)}")
@@ -340,9 +370,9 @@ class CollegeComparator:
                     
                     # Check for College Code column
                     if 'College Code' in df.columns:
-                        college_code = str(row['College Code']).strip()
+                        college_code = self.normalize_college_code(row['College Code'])
                     elif 'college_code' in df.columns:
-                        college_code = str(row['college_code']).strip()
+                        college_code = self.normalize_college_code(row['college_code'])
                     
                     # Check for URL column
                     if 'URL' in df.columns:
@@ -383,7 +413,7 @@ class CollegeComparator:
         """Load main college metadata"""
         try:
             if os.path.exists(path):
-                df = pd.read_excel(path)
+                df = get_dataset(path)
                 print(f"✅ Loaded college metadata: {len(df)} records")
                 return df
             else:
@@ -393,10 +423,100 @@ class CollegeComparator:
             print(f"❌ Error loading college metadata: {e}")
             return pd.DataFrame()
     
+    def _build_college_cities(self, metadata: pd.DataFrame) -> Dict[str, str]:
+        """Normalized college code -> city from the CAP metadata (the cutoff files carry no city)"""
+        if metadata.empty or 'college_code' not in metadata or 'city' not in metadata:
+            return {}
+        pairs = metadata[['college_code', 'city']].dropna().drop_duplicates('college_code')
+        return {self.normalize_college_code(code): str(city)
+                for code, city in zip(pairs['college_code'], pairs['city'])}
+    
+    def _build_cutoff_store(self, merged_data: pd.DataFrame, individual_data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Merge the merged file and the per-year files into one cutoff table:
+        - college codes canonicalised ("01002" -> "1002")
+        - normalized branch/category/type columns added
+        - per-year rows dropped where the merged file already has the same
+          (college, branch group, category, year); exact duplicate rows dropped
+        - compact dtypes: categoricals for strings (year ordered), int32 ints
+        """
+        frames = []
+        for df in (merged_data, individual_data):
+            if df.empty:
+                continue
+            df = df.copy()
+            df['college_code'] = self._normalize_column(df['college_code'], self.normalize_college_code).astype(object)
+            self._add_normalized_columns(df)
+            frames.append(df)
+        if not frames:
+            return pd.DataFrame()
+        
+        before = sum(df.memory_usage(deep=True).sum() for df in frames)
+        
+        if len(frames) == 2:
+            key_columns = ['college_code', 'branch_normalized', 'category', 'year']
+            merged_keys = pd.MultiIndex.from_frame(frames[0][key_columns].astype(str))
+            in_merged = pd.MultiIndex.from_frame(frames[1][key_columns].astype(str)).isin(merged_keys)
+            frames[1] = frames[1][~in_merged]
+        
+        store = pd.concat(frames, ignore_index=True)
+        store = store.drop_duplicates(ignore_index=True)
+        
+        for column in store.columns:
+            values = store[column]
+            if column == 'year':
+                store[column] = pd.Categorical(values, categories=sorted(values.dropna().unique()), ordered=True)
+            elif values.dtype == object or isinstance(values.dtype, pd.CategoricalDtype):
+                store[column] = values.astype('category')
+            elif values.dtype.kind == 'i' and len(values) and \
+                    np.iinfo(np.int32).min <= values.min() and values.max() <= np.iinfo(np.int32).max:
+                store[column] = values.astype(np.int32)
+        
+        after = store.memory_usage(deep=True).sum()
+        print(f"💾 Cutoff store: {after / 1e6:.1f} MB "
+              f"(merged + per-year tables: {before / 1e6:.1f} MB)")
+        return store
+    
     # ============================================================================
     # NORMALIZATION METHODS
     # ============================================================================
     
+    # Columns added by _add_normalized_columns (not part of the source files)
+    NORMALIZED_COLUMNS = ['branch_normalized', 'category_normalized', 'type_normalized']
+    
+    @staticmethod
+    def _clean_column(column: pd.Series, clean) -> np.ndarray:
+        """`column.astype(str)` passed through clean(), calling clean once per distinct value"""
+        codes, uniques = pd.factorize(column)
+        # Trailing slot: missing values (code -1) become 'nan' like astype(str)
+        table = np.array([clean(str(v)) for v in uniques] + [clean('nan')], dtype=object)
+        return table[codes]
+    
+    @staticmethod
+    def _normalize_column(column: pd.Series, normalize) -> pd.Categorical:
+        """`column.apply(normalize)` as a categorical, calling normalize once per distinct value"""
+        codes, uniques = pd.factorize(column)
+        # Trailing slot: missing values (code -1) normalize like NaN
+        table = np.array([normalize(v) for v in uniques] + [normalize(np.nan)], dtype=object)
+        return pd.Categorical(table[codes])
+    
+    def _add_normalized_columns(self, df: pd.DataFrame) -> None:
+        """Add branch_normalized / category_normalized / type_normalized to a cutoff table"""
+        if df.empty:
+            return
+        df['branch_normalized'] = self._normalize_column(df['branch_name'], self.normalize_branch)
+        df['category_normalized'] = self._normalize_column(df['category'], self.normalize_category)
+        if 'type' in df.columns:
+            df['type_normalized'] = self._normalize_column(df['type'], self.normalize_college_type)
+        else:
+            df['type_normalized'] = pd.Categorical(['Unknown'] * len(df))
+    
+    @staticmethod
+    def normalize_college_code(college_code) -> str:
+        """Canonical college code: 1002, '1002 ' and '01002' all become '1002'"""
+        code = str(college_code).strip()
+        return code.lstrip('0') or code
+    
     def normalize_category(self, category_code: str) -> str:
         """Normalize category code to group name"""
         if pd.isna(category_code):
@@ -453,27 +573,14 @@ class CollegeComparator:
         print(f"\n🔍 Getting data for college {college_code}, branch: {branch}, category: {category}")
         
         # Normalize inputs
-        college_code = str(college_code).strip()
+        college_code = self.normalize_college_code(college_code)
         category = str(category).strip().upper()
         branch_normalized = self.normalize_branch(branch)
         
         print(f"   Normalized branch: {branch_normalized}")
         print(f"   Category (uppercase): {category}")
         
-        # Try merged data first
-        data = self._get_from_merged(college_code, branch, branch_normalized, category)
-        print(f"   Found {len(data)} records from merged data")
-        
-        # Fallback to individual files if merged data is incomplete
-        if len(data) < 3:  # If less than 3 years of data
-            individual_data = self._get_from_individual(college_code, branch, branch_normalized, category)
-            print(f"   Found {len(individual_data)} records from individual data")
-            
-            # Merge results, preferring merged data for overlapping years
-            existing_years = {str(d['year']) for d in data}
-            for record in individual_data:
-                if str(record['year']) not in existing_years:
-                    data.append(record)
+        data = self._get_records(college_code, branch, branch_normalized, category)
         
         # Sort by year
         data.sort(key=lambda x: x['year'])
@@ -481,112 +588,35 @@ class CollegeComparator:
         print(f"   Total data points: {len(data)}")
         return data
     
-    def _get_from_merged(self, college_code: str, branch: str, 
-                         branch_normalized: str, category: str) -> List[Dict]:
-        """Get data from merged file"""
-        if self.merged_data.empty:
+    def _get_records(self, college_code: str, branch: str,
+                     branch_normalized: str, category: str) -> List[Dict]:
+        """Get records from the cutoff store"""
+        if self.cutoff_data.empty:
             return []
         
         try:
-            # Filter by college code (string comparison)
-            df = self.merged_data[
-                self.merged_data['college_code'] == college_code
-            ].copy()
-            
-            print(f"      Merged - After college filter: {len(df)} records")
-            
-            if len(df) == 0:
-                return []
-            
-            # Filter by branch (check both original and normalized)
-            branch_mask = (
-                (df['branch_name'].str.lower() == branch.lower()) |
-                (df['branch_name'].apply(self.normalize_branch) == branch_normalized)
-            )
-            df = df[branch_mask]
-            
-            print(f"      Merged - After branch filter: {len(df)} records")
-            
-            if len(df) == 0:
-                # Debug: Show available branches
-                available = self.merged_data[
-                    self.merged_data['college_code'] == college_code
-                ]['branch_name'].unique()
-                print(f"      Available branches: {list(available)[:5]}")
-                return []
-            
-            # Filter by category
-            df = df[df['category'] == category]
+            positions = self.cutoff_index.rows(college_code, branch, branch_normalized, category)
             
-            print(f"      Merged - After category filter: {len(df)} records")
+            print(f"      Matching records: {len(positions)}")
             
-            if len(df) == 0:
-                # Debug: Show available categories
-                available = self.merged_data[
-                    self.merged_data['college_code'] == college_code
-                ]['category'].unique()
-                print(f"      Available categories: {list(available)[:10]}")
+            if len(positions) == 0:
+                # Debug: Show available branches/categories
+                available = self.cutoff_data.iloc[self.cutoff_index.college_rows(college_code)]
+                print(f"      Available branches: {list(available['branch_name'].unique())[:5]}")
+                print(f"      Available categories: {list(available['category'].unique())[:10]}")
                 return []
             
-            # Add normalized fields
-            df['branch_normalized'] = df['branch_name'].apply(self.normalize_branch)
-            df['category_normalized'] = df['category'].apply(self.normalize_category)
-            df['type_normalized'] = df['type'].apply(self.normalize_college_type) if 'type' in df.columns else 'Unknown'
+            records = self.cutoff_index.records(positions)
             
-            # Add college URL
-            df['college_url'] = self.college_urls.get(college_code, '')
+            # Add college URL (normalized fields are precomputed columns)
+            college_url = self.college_urls.get(college_code, '')
+            for record in records:
+                record['college_url'] = college_url
             
-            return df.to_dict('records')
+            return records
             
         except Exception as e:
-            print(f"⚠️ Error getting merged data for {college_code}: {e}")
-            import traceback
-            traceback.print_exc()
-            return []
-    
-    def _get_from_individual(self, college_code: str, branch: str,
-                            branch_normalized: str, category: str) -> List[Dict]:
-        """Get data from individual year files"""
-        if self.individual_data.empty:
-            return []
-        
-        try:
-            # Filter by college code (string comparison)
-            df = self.individual_data[
-                self.individual_data['college_code'] == college_code
-            ].copy()
-            
-            if len(df) == 0:
-                return []
-            
-            # Filter by branch
-            branch_mask = (
-                (df['branch_name'].str.lower() == branch.lower()) |
-                (df['branch_name'].apply(self.normalize_branch) == branch_normalized)
-            )
-            df = df[branch_mask]
-            
-            if len(df) == 0:
-                return []
-            
-            # Filter by category
-            df = df[df['category'] == category]
-            
-            if len(df) == 0:
-                return []
-            
-            # Add normalized fields
-            df['branch_normalized'] = df['branch_name'].apply(self.normalize_branch)
-            df['category_normalized'] = df['category'].apply(self.normalize_category)
-            df['type_normalized'] = df['type'].apply(self.normalize_college_type) if 'type' in df.columns else 'Unknown'
-            
-            # Add college URL
-            df['college_url'] = self.college_urls.get(college_code, '')
-            
-            return df.to_dict('records')
-            
-        except Exception as e:
-            print(f"⚠️ Error getting individual data for {college_code}: {e}")
+            print(f"⚠️ Error getting cutoff data for {college_code}: {e}")
             import traceback
             traceback.print_exc()
             return []
@@ -601,11 +631,15 @@ class CollegeComparator:
         Returns:
             List of unique college records
         """
-        # Use merged data, fallback to individual
-        df = self.merged_data if not self.merged_data.empty else self.individual_data
+        df_unique = self.get_all_colleges_frame(filters)
+        return df_unique.to_dict('records') if df_unique is not None else []
+    
+    def get_all_colleges_frame(self, filters: Dict = None) -> Optional[pd.DataFrame]:
+        """get_all_colleges() as a DataFrame (None without data), for streamed exports"""
+        df = self.cutoff_data
         
         if df.empty:
-            return []
+            return None
         
         df_filtered = df.copy()
         
@@ -618,7 +652,7 @@ class CollegeComparator:
             
             if filters.get('type'):
                 df_filtered = df_filtered[
-                    df_filtered['type'].apply(self.normalize_college_type) == filters['type']
+                    df_filtered['type_normalized'] == filters['type']
                 ]
         
         # Get latest year data
@@ -626,27 +660,26 @@ class CollegeComparator:
         df_latest = df_filtered[df_filtered['year'] == latest_year]
         
         # Get unique colleges (group by college_code)
-        df_unique = df_latest.drop_duplicates(subset=['college_code'], keep='first').copy()
-        
-        # Add normalized fields
-        df_unique['type_normalized'] = df_unique['type'].apply(self.normalize_college_type) if 'type' in df_unique.columns else 'Unknown'
+        df_unique = df_latest.drop_duplicates(subset=['college_code'], keep='first').drop(
+            columns=['branch_normalized', 'category_normalized']
+        )
         
         # Add URLs
         df_unique['college_url'] = df_unique['college_code'].map(self.college_urls)
         
-        return df_unique.to_dict('records')
+        return df_unique
     
-    def search_colleges(self, query: str, filters: Dict = None) -> List[Dict]:
-        """Search colleges by name"""
-        df = self.merged_data if not self.merged_data.empty else self.individual_data
+    def search_colleges(self, query: str, filters: Dict = None, fuzzy: bool = False) -> List[Dict]:
+        """Search colleges by name (fuzzy: also abbreviations and typos, best match first)"""
+        df = self.cutoff_data
         
         if df.empty:
             return []
         
-        # Apply search query
-        df_filtered = df[
-            df['college_name'].str.contains(query, case=False, na=False)
-        ].copy()
+        # Apply search query: names matching like str.contains(query, case=False),
+        # looked up in the name index, then their rows by category code
+        matched = self.name_index.search(query, fuzzy=fuzzy)
+        df_filtered = df[np.isin(df['college_name'].cat.codes.to_numpy(), matched)].copy()
         
         # Apply filters
         if filters:
@@ -657,16 +690,23 @@ class CollegeComparator:
             
             if filters.get('type'):
                 df_filtered = df_filtered[
-                    df_filtered['type'].apply(self.normalize_college_type) == filters['type']
+                    df_filtered['type_normalized'] == filters['type']
                 ]
         
         # Get unique colleges
         latest_year = df_filtered['year'].max() if len(df_filtered) > 0 else '2025'
         df_latest = df_filtered[df_filtered['year'] == latest_year]
-        df_unique = df_latest.drop_duplicates(subset=['college_code'], keep='first').copy()
+        df_unique = df_latest.drop_duplicates(subset=['college_code'], keep='first').drop(
+            columns=['branch_normalized', 'category_normalized']
+        )
         
-        # Add normalized fields and URLs
-        df_unique['type_normalized'] = df_unique['type'].apply(self.normalize_college_type) if 'type' in df_unique.columns else 'Unknown'
+        if fuzzy:
+            # Best name match first
+            name_rank = {code: rank for rank, code in enumerate(matched)}
+            order = np.argsort([name_rank[code] for code in df_unique['college_name'].cat.codes], kind='stable')
+            df_unique = df_unique.iloc[order]
+        
+        # Add URLs
         df_unique['college_url'] = df_unique['college_code'].map(self.college_urls)
         
         return df_unique.to_dict('records')
@@ -686,7 +726,7 @@ class CollegeComparator:
             category: Category code (will be uppercased)
         
         Returns:
-            Dictionary mapping college_code to list of year data
+            Dictionary mapping college_code (as requested) to list of year data
         """
         comparison_data = {}
         
@@ -695,9 +735,9 @@ class CollegeComparator:
         print(f"   Category: {category}")
         
         for college_code in college_codes:
-            # Ensure college_code is string
+            # Ensure college_code is string; lookups use the normalized code
             college_code = str(college_code).strip()
-            data = self.get_college_data(college_code, branch, category)
+            data = self.get_college_data(self.normalize_college_code(college_code), branch, category)
             comparison_data[college_code] = data
             
             print(f"   {college_code}: {len(data)} years of data")
@@ -707,6 +747,130 @@ class CollegeComparator:
         
         return comparison_data
     
+    def compare_colleges_columnar(self, college_codes: List[str], branch: str,
+                                  category: str) -> Dict:
+        """
+        Batched comparison in one columnar payload
+        
+        Args:
+            college_codes: List of college codes to compare
+            branch: Branch name (will be normalized)
+            category: Category code (will be uppercased)
+        
+        Returns:
+            Dictionary with:
+            - years: every year with data for any of the colleges
+            - colleges: per-college info (code as requested, name, type, URL)
+            - closing_rank / closing_percentile: years x colleges arrays
+              (None where a college has no data for a year; the first record
+              of the year, like the per-college comparison_data)
+            - trends: per-college get_trend_analysis() result (without
+              all_years_data) plus least-squares slopes per year
+            - stats: per-college rank/percentile statistics for the branch
+              and category
+        """
+        category = str(category).strip().upper()
+        branch_normalized = self.normalize_branch(branch)
+        requested = [str(code).strip() for code in college_codes]
+        codes = [self.normalize_college_code(code) for code in requested]
+        index = self.cutoff_index
+        
+        per_college = []
+        for college_code in codes:
+            if self.cutoff_data.empty:
+                positions = np.empty(0, dtype=np.intp)
+            else:
+                positions = index.rows(college_code, branch, branch_normalized, category)
+            if len(positions):
+                years = index.column('year', positions)
+                # Stable sort by year keeps table order within a year
+                order = np.argsort(years, kind='stable')
+                positions, years = positions[order], years[order]
+            else:
+                years = np.empty(0, dtype=object)
+            per_college.append((college_code, positions, years))
+        
+        all_years = sorted({year for _, _, years in per_college for year in years})
+        year_slot = {year: i for i, year in enumerate(all_years)}
+        ranks = [[None] * len(codes) for _ in all_years]
+        percentiles = [[None] * len(codes) for _ in all_years]
+        
+        colleges, trends, stats = [], [], []
+        for j, (college_code, positions, years) in enumerate(per_college):
+            if len(positions):
+                rank_values = index.column('closing_rank', positions)
+            else:
+                rank_values = np.empty(0)
+            if len(positions) and 'closing_percentile' in self.cutoff_data:
+                percentile_values = index.column('closing_percentile', positions)
+            else:
+                percentile_values = np.full(len(positions), np.nan)
+            
+            # First record of each year fills the year's cell
+            seen = set()
+            for year, rank, percentile in zip(years, rank_values, percentile_values):
+                if year in seen:
+                    continue
+                seen.add(year)
+                ranks[year_slot[year]][j] = self._json_number(rank)
+                percentiles[year_slot[year]][j] = self._json_number(percentile)
+            
+            first = index.records(positions[:1])[0] if len(positions) else {}
+            colleges.append({
+                'college_code': requested[j],
+                'college_name': first.get('college_name'),
+                'college_type': first.get('college_type'),
+                'branch_name': first.get('branch_name'),
+                'college_url': self.college_urls.get(college_code, ''),
+                'years_available': len(seen)
+            })
+            
+            rank_column = [row[j] for row in ranks]
+            trend = self._trend_summary(list(years), [self._json_number(r) for r in rank_values])
+            trend['rank_slope_per_year'] = self._slope(all_years, rank_column)
+            trend['percentile_slope_per_year'] = self._slope(all_years, [row[j] for row in percentiles])
+            trends.append(trend)
+            
+            latest = [i for i, rank in enumerate(rank_column) if rank is not None]
+            valid_ranks = rank_values[~pd.isna(rank_values)]
+            valid_percentiles = percentile_values[~pd.isna(percentile_values)]
+            stats.append({
+                'records': int(len(positions)),
+                'min_closing_rank': int(valid_ranks.min()) if len(valid_ranks) else None,
+                'max_closing_rank': int(valid_ranks.max()) if len(valid_ranks) else None,
+                'avg_closing_rank': int(valid_ranks.mean()) if len(valid_ranks) else None,
+                'min_closing_percentile': float(valid_percentiles.min()) if len(valid_percentiles) else None,
+                'max_closing_percentile': float(valid_percentiles.max()) if len(valid_percentiles) else None,
+                'avg_closing_percentile': float(valid_percentiles.mean()) if len(valid_percentiles) else None,
+                'latest_year': all_years[latest[-1]] if latest else None,
+                'latest_rank': rank_column[latest[-1]] if latest else None
+            })
+        
+        return {
+            'years': all_years,
+            'colleges': colleges,
+            'closing_rank': ranks,
+            'closing_percentile': percentiles,
+            'trends': trends,
+            'stats': stats
+        }
+    
+    @staticmethod
+    def _json_number(value):
+        """numpy scalar as int/float for JSON, None for missing values"""
+        if value is None or pd.isna(value):
+            return None
+        return value.item() if isinstance(value, np.generic) else value
+    
+    @staticmethod
+    def _slope(years: List[str], values: List) -> Optional[float]:
+        """Least-squares change per year of the non-missing values (None below 2 points)"""
+        points = [(int(year), value) for year, value in zip(years, values) if value is not None]
+        if len(points) < 2:
+            return None
+        x, y = np.array(points, dtype=float).T
+        return round(float(np.polyfit(x, y, 1)[0]), 4)
+    
     def get_available_branches(self, college_codes: List[str] = None) -> List[str]:
         """
         Get all available branches, optionally filtered by college codes
@@ -717,15 +881,15 @@ class CollegeComparator:
         Returns:
             List of available branch names
         """
-        df = self.merged_data if not self.merged_data.empty else self.individual_data
+        df = self.cutoff_data
+        index = self.cutoff_index
         
         if df.empty:
             return []
         
         # Filter by college codes if provided
         if college_codes:
-            college_codes = [str(c).strip() for c in college_codes]
-            df = df[df['college_code'].isin(college_codes)]
+            df = df.iloc[index.colleges_rows(self.normalize_college_code(c) for c in college_codes)]
         
         # Get unique branches
         branches = df['branch_name'].dropna().unique().tolist()
@@ -743,22 +907,22 @@ class CollegeComparator:
         Returns:
             List of category codes
         """
-        df = self.merged_data if not self.merged_data.empty else self.individual_data
+        df = self.cutoff_data
+        index = self.cutoff_index
         
         if df.empty:
             return []
         
         # Filter by college codes if provided
         if college_codes:
-            college_codes = [str(c).strip() for c in college_codes]
-            df = df[df['college_code'].isin(college_codes)]
+            df = df.iloc[index.colleges_rows(self.normalize_college_code(c) for c in college_codes)]
         
         # Filter by branch if provided
         if branch:
             branch_normalized = self.normalize_branch(branch)
             branch_mask = (
                 (df['branch_name'].str.lower() == branch.lower()) |
-                (df['branch_name'].apply(self.normalize_branch) == branch_normalized)
+                (df['branch_normalized'] == branch_normalized)
             )
             df = df[branch_mask]
         
@@ -766,7 +930,7 @@ class CollegeComparator:
     
     def get_available_cities(self) -> List[str]:
         """Get all available cities"""
-        df = self.merged_data if not self.merged_data.empty else self.individual_data
+        df = self.cutoff_data
         
         if df.empty:
             return []
@@ -797,13 +961,14 @@ class CollegeComparator:
     
     def get_college_stats(self, college_code: str) -> Dict:
         """Get comprehensive statistics for a college"""
-        df = self.merged_data if not self.merged_data.empty else self.individual_data
+        df = self.cutoff_data
+        index = self.cutoff_index
         
         if df.empty:
             return {}
         
-        college_code = str(college_code).strip()
-        df_college = df[df['college_code'] == college_code]
+        college_code = self.normalize_college_code(college_code)
+        df_college = df.iloc[index.college_rows(college_code)]
         
         if len(df_college) == 0:
             return {}
@@ -814,7 +979,7 @@ class CollegeComparator:
         stats = {
             'college_code': college_code,
             'college_name': latest['college_name'],
-            'city': latest['city'],
+            'city': latest.get('city', self.college_cities.get(college_code, 'Unknown')),
             'type': latest.get('type', 'Unknown'),
             'type_normalized': self.normalize_college_type(latest.get('type', '')),
             'college_url': self.college_urls.get(college_code, ''),
@@ -822,7 +987,7 @@ class CollegeComparator:
             'total_branches': int(df_college['branch_name'].nunique()),
             'available_branches': df_college['branch_name'].unique().tolist(),
             'available_branches_normalized': list(set(
-                df_college['branch_name'].apply(self.normalize_branch).tolist()
+                df_college['branch_normalized'].tolist()
             )),
             
             'available_categories': df_college['category'].unique().tolist(),
@@ -841,18 +1006,26 @@ class CollegeComparator:
         """Get trend analysis for specific college-branch-category combination"""
         data = self.get_college_data(college_code, branch, category)
         
-        if len(data) < 2:
+        # Sort by year
+        data.sort(key=lambda x: x['year'])
+        
+        analysis = self._trend_summary([d['year'] for d in data],
+                                       [d.get('closing_rank', 0) for d in data])
+        if 'first_rank' in analysis:
+            analysis['all_years_data'] = data
+        return analysis
+    
+    def _trend_summary(self, years: List[str], ranks: List) -> Dict:
+        """Trend of year-sorted records given their years and closing ranks"""
+        if len(years) < 2:
             return {
                 'trend': 'insufficient_data',
-                'years_available': len(data),
+                'years_available': len(years),
                 'message': 'Need at least 2 years of data for trend analysis'
             }
         
-        # Sort by year
-        data.sort(key=lambda x: x['year'])
-        
         # Calculate rank changes
-        ranks = [d.get('closing_rank', 0) for d in data if d.get('closing_rank')]
+        ranks = [rank for rank in ranks if rank]
         
         if len(ranks) < 2:
             return {
@@ -876,12 +1049,11 @@ class CollegeComparator:
         
         return {
             'trend': trend,
-            'years_available': len(data),
-            'first_year': data[0]['year'],
-            'last_year': data[-1]['year'],
+            'years_available': len(years),
+            'first_year': years[0],
+            'last_year': years[-1],
             'first_rank': first_rank,
             'last_rank': last_rank,
             'rank_change': rank_change,
-            'rank_change_percent': round(rank_change_percent, 2),
-            'all_years_data': data
+            'rank_change_percent': round(rank_change_percent, 2)
         }
\ No newline at end of file
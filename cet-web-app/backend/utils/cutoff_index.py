@@ -0,0 +1,86 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, Iterable, List
+
+_EMPTY = np.empty(0, dtype=np.intp)
+
+
+class CutoffIndex:
+    """
+    Hash index over a cutoff table (merged or per-year data) used by
+    CollegeComparator.
+
+    Built once at load time:
+    - college_code -> row positions
+    - (college_code, branch_normalized, category) -> row positions
+    - (college_code, lowercase branch_name, category) -> row positions
+
+    Every posting array is ascending, so a lookup returns rows in table order
+    (one row per year and CAP round) without scanning the table. Requires the
+    columns added by CollegeComparator._add_normalized_columns.
+
+    records() and column() decode rows straight from the column arrays
+    (categoricals via their codes), which is much cheaper than iloc + to_dict
+    for a few rows.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        self.df = df
+        self._columns = []
+        for name in df.columns:
+            values = df[name]
+            if isinstance(values.dtype, pd.CategoricalDtype):
+                # Trailing NaN slot so missing (-1) codes decode like to_dict()
+                table = np.append(values.cat.categories.to_numpy(dtype=object), np.nan)
+                self._columns.append((name, values.cat.codes.to_numpy(), table))
+            else:
+                self._columns.append((name, values.to_numpy(), None))
+
+        if df.empty:
+            self._by_college, self._by_group, self._by_name = {}, {}, {}
+            return
+
+        self._by_college = df.groupby('college_code', sort=False, observed=True).indices
+        self._by_group = df.groupby(
+            ['college_code', 'branch_normalized', 'category'], sort=False, observed=True
+        ).indices
+        self._by_name = pd.DataFrame({
+            'college_code': df['college_code'],
+            'branch_lower': df['branch_name'].str.lower(),
+            'category': df['category']
+        }).groupby(['college_code', 'branch_lower', 'category'], sort=False, observed=True).indices
+
+    def college_rows(self, college_code: str) -> np.ndarray:
+        """Positions of every row of a college"""
+        return self._by_college.get(college_code, _EMPTY)
+
+    def colleges_rows(self, college_codes: Iterable[str]) -> np.ndarray:
+        """Positions of every row of any of the colleges, in table order"""
+        parts = [self.college_rows(code) for code in college_codes]
+        return np.unique(np.concatenate(parts)) if parts else _EMPTY
+
+    def rows(self, college_code: str, branch: str, branch_normalized: str, category: str) -> np.ndarray:
+        """
+        Positions of the rows for a college/category whose branch matches
+        `branch` case-insensitively or belongs to the same branch group
+        """
+        by_group = self._by_group.get((college_code, branch_normalized, category), _EMPTY)
+        by_name = self._by_name.get((college_code, branch.lower(), category), _EMPTY)
+        return np.union1d(by_group, by_name)
+
+    def column(self, name: str, positions: np.ndarray) -> np.ndarray:
+        """Values of one column at `positions` (categoricals decoded, missing as NaN)"""
+        for column_name, values, table in self._columns:
+            if column_name == name:
+                taken = values[positions]
+                return table[taken] if table is not None else taken
+        raise KeyError(name)
+
+    def records(self, positions: np.ndarray) -> List[Dict]:
+        """Rows at `positions` as dicts, same as df.iloc[positions].to_dict('records')"""
+        columns = []
+        for name, values, table in self._columns:
+            taken = values[positions]
+            columns.append(table[taken].tolist() if table is not None else taken.tolist())
+        names = [name for name, _, _ in self._columns]
+        return [dict(zip(names, row)) for row in zip(*columns)]
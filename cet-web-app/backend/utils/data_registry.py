@@ -0,0 +1,210 @@
+# backend/utils/data_registry.py
+"""
+Process-wide registry of datasets and models.
+
+Every blueprint used to load its own copy of the CAP workbook, the college
+URL list and the XGBoost pickle. The registry loads each source once (via
+the binary snapshots in utils.data_snapshot), converts it to the compact
+dtypes of utils.data_schema and hands out read-only views:
+
+- get_dataset() returns a shallow copy of the master frame. Consumers may
+  add or replace columns on their view without affecting anyone else;
+  numeric buffers are frozen, so writing into shared values raises
+  "assignment destination is read-only" instead of silently changing the
+  data for everyone.
+- get_model() returns the single shared model object.
+
+Different sources load concurrently (one lock per source), and each entry
+remembers its file's size/mtime so invalidate_changed() only drops what
+changed on disk (a reload after adding data/cutoff_trends/2026.csv parses
+just that file).
+
+Loading everything in the gunicorn master (preload_app, see
+gunicorn.conf.py) lets forked workers share these pages copy-on-write.
+"""
+import os
+import threading
+from typing import Any, Dict, List, Optional
+
+import joblib
+import pandas as pd
+
+from utils.data_schema import apply_schema, categorical_columns, default_dtype_bytes, numeric_dtypes
+from utils.data_snapshot import load_table
+from utils.logger import get_logger
+
+logger = get_logger('data_registry')
+
+_lock = threading.RLock()
+_datasets: Dict[tuple, pd.DataFrame] = {}
+_models: Dict[str, Any] = {}
+_default_dtype_bytes: Dict[tuple, int] = {}
+_signatures: Dict[Any, Optional[tuple]] = {}
+_loading: Dict[tuple, threading.Lock] = {}
+
+
+def _key(path: str) -> str:
+    return os.path.realpath(path)
+
+
+def _signature(path: str) -> Optional[tuple]:
+    """(size, mtime) of a file, None when it is missing"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
+def _freeze(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Mark the frame's numeric column buffers read-only. Object (string) blocks
+    stay writeable: several pandas Cython helpers (e.g. deep memory_usage)
+    reject read-only object buffers.
+    """
+    for block in df._mgr.blocks:
+        values = getattr(block, 'values', None)
+        if hasattr(values, 'flags') and values.dtype != object:
+            values.flags.writeable = False
+    return df
+
+
+def get_dataset(path: str, **read_kwargs) -> pd.DataFrame:
+    """
+    Shared read-only view of an xlsx/csv dataset, loaded once per process.
+
+    Raises FileNotFoundError like the pandas readers when `path` is missing.
+    """
+    key = (_key(path), tuple(sorted(read_kwargs.items())))
+    with _lock:
+        master = _datasets.get(key)
+        if master is not None:
+            return master.copy(deep=False)
+        source_lock = _loading.setdefault(key, threading.Lock())
+
+    # Parse outside the registry lock so other sources can load in parallel
+    with source_lock:
+        with _lock:
+            master = _datasets.get(key)
+        if master is None:
+            signature = _signature(path)
+            master = load_table(path, categorical=categorical_columns(path), dtypes=numeric_dtypes(path),
+                                **read_kwargs)
+            master = _freeze(apply_schema(master, path))
+            loaded_bytes = default_dtype_bytes(master)
+            with _lock:
+                _datasets[key] = master
+                _default_dtype_bytes[key] = loaded_bytes
+                _signatures[key] = signature
+            logger.info(f"📦 Registered dataset {os.path.basename(path)}: {len(master)} rows, "
+                        f"{_frame_bytes(master) / 1e6:.1f} MB "
+                        f"(default dtypes: {loaded_bytes / 1e6:.1f} MB)")
+    return master.copy(deep=False)
+
+
+def get_model(path: str) -> Any:
+    """Shared model object (joblib pickle), loaded once per process"""
+    key = _key(path)
+    with _lock:
+        model = _models.get(key)
+        if model is None:
+            if not os.path.exists(path):
+                raise FileNotFoundError(f"Model file not found: {path}")
+            signature = _signature(path)
+            model = joblib.load(path)
+            _models[key] = model
+            _signatures[key] = signature
+            logger.info(f"📦 Registered model {os.path.basename(path)}")
+    return model
+
+
+def invalidate(path: Optional[str] = None) -> None:
+    """Forget one source (or everything) so the next access reloads it"""
+    with _lock:
+        if path is None:
+            _datasets.clear()
+            _default_dtype_bytes.clear()
+            _models.clear()
+            _signatures.clear()
+            return
+        key = _key(path)
+        for dataset_key in [k for k in _datasets if k[0] == key]:
+            del _datasets[dataset_key]
+            _default_dtype_bytes.pop(dataset_key, None)
+            _signatures.pop(dataset_key, None)
+        _models.pop(key, None)
+        _signatures.pop(key, None)
+
+
+def invalidate_changed() -> List[str]:
+    """
+    Forget the sources whose file size/mtime changed (or that were removed)
+    since they were loaded; returns their paths. Unchanged sources stay
+    shared, so the next access only re-reads what changed.
+    """
+    with _lock:
+        stale = set()
+        for key in list(_datasets) + list(_models):
+            path = key[0] if isinstance(key, tuple) else key
+            if _signature(path) != _signatures.get(key):
+                stale.add(path)
+    for path in stale:
+        invalidate(path)
+    if stale:
+        logger.info(f"🔄 Changed sources: {', '.join(sorted(os.path.basename(p) for p in stale))}")
+    return sorted(stale)
+
+
+def _frame_bytes(df: pd.DataFrame) -> int:
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+
+def _process_rss() -> Optional[int]:
+    """Resident set size of this process in bytes (Linux), None elsewhere"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def memory_report(frames: Optional[Dict[str, pd.DataFrame]] = None) -> Dict[str, Any]:
+    """
+    Per-dataset memory usage of the shared copies (bytes, deep), with the
+    size the same data had with default dtypes. `frames` adds other
+    DataFrames by name (e.g. component-owned tables); views of shared
+    datasets count the shared columns again.
+    """
+    with _lock:
+        datasets = []
+        for (path, read_kwargs), df in _datasets.items():
+            datasets.append({
+                'name': os.path.basename(path),
+                'path': path,
+                'read_kwargs': dict(read_kwargs),
+                'rows': len(df),
+                'columns': len(df.columns),
+                'bytes': _frame_bytes(df),
+                'default_dtype_bytes': _default_dtype_bytes.get((path, read_kwargs))
+            })
+        models = [{
+            'name': os.path.basename(path),
+            'path': path,
+            'file_bytes': os.path.getsize(path) if os.path.exists(path) else None
+        } for path in _models]
+
+    other_frames = [{
+        'name': name,
+        'rows': len(df),
+        'columns': len(df.columns),
+        'bytes': _frame_bytes(df)
+    } for name, df in (frames or {}).items() if df is not None]
+
+    return {
+        'datasets': datasets,
+        'models': models,
+        'frames': other_frames,
+        'total_dataset_bytes': sum(d['bytes'] for d in datasets),
+        'total_default_dtype_bytes': sum(d['default_dtype_bytes'] or d['bytes'] for d in datasets),
+        'process_rss_bytes': _process_rss()
+    }
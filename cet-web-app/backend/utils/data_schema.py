@@ -0,0 +1,128 @@
+# backend/utils/data_schema.py
+"""
+Column dtypes for the known data sources.
+
+With default dtypes every college/branch/category/city/type string in the
+CAP table is a separate Python object (~30 MB for 61k rows) and every
+integer is int64. apply_schema() stores repeated strings as categoricals
+and integers in the narrowest type the schema names, once, when the
+registry loads a source.
+
+A column is only converted when the cast is lossless (no missing values
+in integer columns, values within range); otherwise it keeps its dtype.
+"""
+import fnmatch
+import os
+import sys
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from utils.logger import get_logger
+
+logger = get_logger('data_schema')
+
+_COLLEGE_LIST = {
+    'Sr. No': 'int16',
+    'College Code': 'int32',
+    'City': 'category',
+}
+
+# Glob patterns matched against the end of the source path ('/' separated)
+SCHEMAS: Dict[str, Dict[str, str]] = {
+    'flattened_CAP_data*.xlsx': {
+        'college_code': 'int32',
+        'college_name': 'category',
+        'branch_code': 'category',
+        'branch_name': 'category',
+        'category': 'category',
+        'closing_rank': 'int32',
+        'year': 'int16',
+        'city': 'category',
+        'type': 'category',
+    },
+    'cutoff_trends/*.csv': {
+        'college_code': 'int32',
+        'college_name': 'category',
+        'college_type': 'category',
+        'branch_code': 'int32',
+        'branch_name': 'category',
+        'cap_round': 'category',
+        'category': 'category',
+        'closing_rank': 'int32',
+    },
+    'unique_colleges_with_city_*.xlsx': _COLLEGE_LIST,
+    'Colleges_URL.xlsx': _COLLEGE_LIST,
+}
+
+
+def schema_for(path: str) -> Optional[Dict[str, str]]:
+    """Schema of the first pattern matching `path`, None for unknown sources"""
+    normalized = '/' + os.path.abspath(path).replace(os.sep, '/')
+    for pattern, schema in SCHEMAS.items():
+        if fnmatch.fnmatch(normalized, '*/' + pattern):
+            return schema
+    return None
+
+
+def _cast(column: pd.Series, dtype: str) -> Optional[pd.Series]:
+    """`column` as `dtype`, or None if the cast would lose information"""
+    if dtype == 'category':
+        return column.astype('category')
+
+    target = np.dtype(dtype)
+    if target.kind in 'iu':
+        if column.dtype.kind not in 'iu' or column.isna().any():
+            return None
+        info = np.iinfo(target)
+        if len(column) and (column.min() < info.min or column.max() > info.max):
+            return None
+    return column.astype(target)
+
+
+def categorical_columns(path: str) -> List[str]:
+    """Columns the schema of `path` stores as categoricals (for load_table)"""
+    return [name for name, dtype in (schema_for(path) or {}).items() if dtype == 'category']
+
+
+def numeric_dtypes(path: str) -> Dict[str, str]:
+    """Narrow numeric dtypes of the schema of `path` (for load_table)"""
+    return {name: dtype for name, dtype in (schema_for(path) or {}).items() if dtype != 'category'}
+
+
+def default_dtype_bytes(df: pd.DataFrame) -> int:
+    """
+    memory_usage(deep=True) the frame would have with default dtypes
+    (object strings, 64-bit numbers), computed without converting it back
+    """
+    total = int(df.index.memory_usage(deep=True))
+    for name in df.columns:
+        column = df[name]
+        if isinstance(column.dtype, pd.CategoricalDtype):
+            # One pointer per row plus the size of the row's string object
+            sizes = np.array([sys.getsizeof(v) for v in column.cat.categories] + [sys.getsizeof(np.nan)])
+            total += 8 * len(column) + int(sizes[column.cat.codes.to_numpy()].sum())
+        elif column.dtype.kind in 'iuf':
+            total += 8 * len(column)
+        else:
+            total += int(column.memory_usage(index=False, deep=True))
+    return total
+
+
+def apply_schema(df: pd.DataFrame, path: str) -> pd.DataFrame:
+    """Convert the columns of a loaded source to its schema dtypes (in place)"""
+    return apply_dtypes(df, schema_for(path) or {}, os.path.basename(path))
+
+
+def apply_dtypes(df: pd.DataFrame, dtypes: Dict[str, str], source: str = '') -> pd.DataFrame:
+    """Convert the named columns to the given dtypes where lossless (in place)"""
+    for name, dtype in dtypes.items():
+        if name not in df.columns or str(df[name].dtype) == dtype:
+            continue
+        converted = _cast(df[name], dtype)
+        if converted is None:
+            logger.warning(f"⚠️ {source}: kept {name} as {df[name].dtype} (not losslessly {dtype})")
+            continue
+        df[name] = converted
+    return df
@@ -0,0 +1,292 @@
+# backend/utils/data_snapshot.py
+"""
+Binary snapshots of the xlsx/csv data sources.
+
+Parsing the CAP workbook with openpyxl takes seconds and used to happen
+several times per boot. load_table() compiles each source once into a typed
+columnar snapshot (one .npy file per column, string columns dictionary
+encoded as int32 codes + a fixed-width unicode value table) and memory-maps
+it on every later load. Numeric columns are served straight from those
+read-only maps, so processes loading the same snapshot share their pages.
+
+A snapshot is rebuilt only when the source file's content hash changes; the
+file size/mtime are kept in the manifest so the hash is only recomputed when
+they differ.
+
+Compile all known sources ahead of time (e.g. in a deploy step):
+    python -m utils.data_snapshot
+"""
+import hashlib
+import json
+import os
+import re
+import shutil
+import sys
+import tempfile
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from utils.data_schema import apply_dtypes, numeric_dtypes
+from utils.logger import get_logger
+
+logger = get_logger('data_snapshot')
+
+SNAPSHOT_FORMAT = 1
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SNAPSHOT_DIR = os.getenv('DATA_SNAPSHOT_DIR', os.path.join(BACKEND_DIR, 'data', '.cache'))
+
+# Sources compiled by `python -m utils.data_snapshot` (relative to backend/),
+# plus every per-year file in YEAR_DATA_DIR (see default_sources())
+DEFAULT_SOURCES = [
+    os.path.join('data', 'flattened_CAP_data done.xlsx'),
+    os.path.join('data', 'unique_colleges_with_city_CAP1_2025.xlsx'),
+    os.path.join('data', 'Colleges_URL.xlsx'),
+]
+YEAR_DATA_DIR = os.path.join('data', 'cutoff_trends')
+YEAR_FILE_PATTERN = re.compile(r'^(\d{4})\.csv$')
+
+_NUMERIC_KINDS = 'biufcmM'
+
+
+# ============================================================================
+# PUBLIC API
+# ============================================================================
+
+def load_table(path: str, categorical: Iterable[str] = (), dtypes: Optional[Dict[str, str]] = None,
+               **read_kwargs) -> pd.DataFrame:
+    """
+    Drop-in replacement for pd.read_excel / pd.read_csv (chosen by extension)
+    that serves the data from a binary snapshot.
+
+    Extra keyword arguments are passed to the pandas reader and are part of
+    the snapshot identity. Snapshot I/O problems never fail the load: the
+    source is parsed directly instead.
+
+    String columns named in `categorical` come back as pandas categoricals
+    (sorted categories, like astype('category')); from a snapshot they are
+    built straight from the stored codes, without per-row string objects.
+
+    Numeric columns named in `dtypes` (e.g. {'closing_rank': 'int32'}) are
+    narrowed where lossless before the snapshot is written. Numeric columns
+    of a snapshot are read-only memory maps: copy a column before writing
+    into it.
+    """
+    categorical = set(categorical)
+    dtypes = dict(dtypes or {})
+    source = os.path.abspath(path)
+    stat = os.stat(source)  # FileNotFoundError like the pandas readers
+    snapshot_dir = _snapshot_path(source, read_kwargs, dtypes)
+
+    try:
+        manifest = _read_manifest(snapshot_dir)
+        if manifest is not None and _is_current(manifest, snapshot_dir, source, stat):
+            return _load_snapshot(snapshot_dir, manifest, categorical)
+    except Exception as e:
+        logger.warning(f"⚠️ Snapshot unreadable for {os.path.basename(source)}, rebuilding: {e}")
+
+    df = apply_dtypes(_read_source(source, read_kwargs), dtypes, os.path.basename(source))
+    try:
+        _write_snapshot(df, snapshot_dir, source, stat, read_kwargs)
+    except Exception as e:
+        logger.warning(f"⚠️ Could not write snapshot for {os.path.basename(source)}: {e}")
+    for name in categorical:
+        if name in df.columns and df[name].dtype == object:
+            df[name] = df[name].astype('category')
+    return df
+
+
+def year_files(directory: str) -> List[Tuple[str, str]]:
+    """(year, path) of every <year>.csv in `directory`, oldest first"""
+    try:
+        names = os.listdir(directory)
+    except OSError:
+        return []
+    matches = (YEAR_FILE_PATTERN.match(name) for name in names)
+    return sorted((m.group(1), os.path.join(directory, m.group(0))) for m in matches if m)
+
+
+def default_sources() -> List[str]:
+    """DEFAULT_SOURCES plus the per-year files currently present (relative to backend/)"""
+    year_dir = os.path.join(BACKEND_DIR, YEAR_DATA_DIR)
+    return DEFAULT_SOURCES + [os.path.relpath(path, BACKEND_DIR) for _, path in year_files(year_dir)]
+
+
+def file_hash(path: str) -> str:
+    """sha256 of a file's content"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+# ============================================================================
+# SNAPSHOT INTERNALS
+# ============================================================================
+
+def _snapshot_path(source: str, read_kwargs: Dict, dtypes: Dict) -> str:
+    identity = [source, read_kwargs] + ([dtypes] if dtypes else [])
+    identity = json.dumps(identity, sort_keys=True, default=str)
+    name = os.path.basename(source).replace(' ', '_')
+    return os.path.join(SNAPSHOT_DIR, f"{name}-{hashlib.sha1(identity.encode()).hexdigest()[:10]}")
+
+
+def _read_source(source: str, read_kwargs: Dict) -> pd.DataFrame:
+    if source.lower().endswith('.csv'):
+        return pd.read_csv(source, **read_kwargs)
+    if source.lower().endswith(('.xlsx', '.xls')):
+        return pd.read_excel(source, **read_kwargs)
+    raise ValueError(f"Unsupported data file type: {source}")
+
+
+def _read_manifest(snapshot_dir: str) -> Optional[Dict]:
+    try:
+        with open(os.path.join(snapshot_dir, 'manifest.json'), encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return manifest if manifest.get('format') == SNAPSHOT_FORMAT else None
+
+
+def _is_current(manifest: Dict, snapshot_dir: str, source: str, stat: os.stat_result) -> bool:
+    """Fast path on size/mtime, content hash when they changed"""
+    if manifest['size'] == stat.st_size and manifest['mtime_ns'] == stat.st_mtime_ns:
+        return True
+    if manifest['size'] != stat.st_size or manifest['sha256'] != file_hash(source):
+        return False
+
+    # Same content, touched file: remember the new mtime to skip hashing next time
+    manifest['mtime_ns'] = stat.st_mtime_ns
+    try:
+        _dump_manifest(snapshot_dir, manifest)
+    except OSError:
+        pass
+    return True
+
+
+def _dump_manifest(directory: str, manifest: Dict) -> None:
+    tmp_path = os.path.join(directory, 'manifest.json.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, os.path.join(directory, 'manifest.json'))
+
+
+def _encode_strings(column: pd.Series) -> Optional[tuple]:
+    """(codes, values) for a column of str/NaN, None if it holds anything else"""
+    codes, uniques = pd.factorize(column)
+    if not all(isinstance(v, str) for v in uniques):
+        return None
+    if column.isna().any() and not column[column.isna()].map(lambda v: isinstance(v, float)).all():
+        return None  # None/NaT missing markers would not round-trip as NaN
+    return codes.astype(np.int32), np.array(list(uniques), dtype=str)
+
+
+def _write_columns(df: pd.DataFrame, directory: str) -> Optional[list]:
+    """Save every column as .npy; None if some column can't be stored that way"""
+    if not isinstance(df.index, pd.RangeIndex) or df.index.start != 0 or df.index.step != 1:
+        return None
+    if not all(isinstance(name, str) for name in df.columns) or df.columns.has_duplicates:
+        return None
+
+    columns = []
+    for i, name in enumerate(df.columns):
+        column = df[name]
+        if isinstance(column.dtype, np.dtype) and column.dtype.kind in _NUMERIC_KINDS:
+            np.save(os.path.join(directory, f'c{i}.npy'), column.to_numpy())
+            columns.append({'name': name, 'kind': 'numeric'})
+        elif column.dtype == object and (encoded := _encode_strings(column)) is not None:
+            np.save(os.path.join(directory, f'c{i}.codes.npy'), encoded[0])
+            np.save(os.path.join(directory, f'c{i}.values.npy'), encoded[1])
+            columns.append({'name': name, 'kind': 'string'})
+        else:
+            return None
+    return columns
+
+
+def _write_snapshot(df: pd.DataFrame, snapshot_dir: str, source: str,
+                    stat: os.stat_result, read_kwargs: Dict) -> None:
+    os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+    tmp_dir = tempfile.mkdtemp(prefix='.build-', dir=SNAPSHOT_DIR)
+    try:
+        columns = _write_columns(df, tmp_dir)
+        pickled = columns is None
+        if pickled:
+            # Mixed/extension dtypes or a custom index: still far cheaper to load than the source
+            df.to_pickle(os.path.join(tmp_dir, 'frame.pkl'))
+
+        _dump_manifest(tmp_dir, {
+            'format': SNAPSHOT_FORMAT,
+            'source': source,
+            'read_kwargs': {k: str(v) for k, v in read_kwargs.items()},
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'sha256': file_hash(source),
+            'rows': len(df),
+            'pickled': pickled,
+            'columns': columns
+        })
+
+        if os.path.isdir(snapshot_dir):
+            shutil.rmtree(snapshot_dir, ignore_errors=True)
+        try:
+            os.replace(tmp_dir, snapshot_dir)
+        except OSError:
+            # Another worker published the same snapshot first
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            return
+        logger.info(f"💾 Snapshot built for {os.path.basename(source)}: {len(df)} rows")
+    except Exception:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+
+
+def _load_snapshot(snapshot_dir: str, manifest: Dict, categorical: set) -> pd.DataFrame:
+    if manifest['pickled']:
+        df = pd.read_pickle(os.path.join(snapshot_dir, 'frame.pkl'))
+        for name in categorical:
+            if name in df.columns and df[name].dtype == object:
+                df[name] = df[name].astype('category')
+        return df
+
+    data = {}
+    for i, entry in enumerate(manifest['columns']):
+        if entry['kind'] == 'numeric':
+            data[entry['name']] = np.load(os.path.join(snapshot_dir, f'c{i}.npy'), mmap_mode='r')
+        else:
+            codes = np.load(os.path.join(snapshot_dir, f'c{i}.codes.npy'), mmap_mode='r')
+            values = np.load(os.path.join(snapshot_dir, f'c{i}.values.npy'), mmap_mode='r')
+            if entry['name'] in categorical:
+                # Re-code against sorted categories; -1 (missing) stays -1
+                order = np.argsort(values, kind='stable')
+                rank = np.empty(len(order) + 1, dtype=np.int32)
+                rank[order] = np.arange(len(order), dtype=np.int32)
+                rank[-1] = -1
+                data[entry['name']] = pd.Categorical.from_codes(
+                    rank[codes], categories=pd.Index(values[order].astype(object))
+                )
+                continue
+            # Trailing NaN slot so missing (-1) codes decode to NaN like the readers
+            table = np.append(values.astype(object), np.nan)
+            data[entry['name']] = table[codes]
+    # copy=False keeps every numeric column a view of its read-only map
+    return pd.DataFrame(data, copy=False)
+
+
+# ============================================================================
+# CLI
+# ============================================================================
+
+def main(paths=None) -> None:
+    """Compile snapshots for the given (or default) data sources"""
+    for path in paths or [os.path.join(BACKEND_DIR, p) for p in default_sources()]:
+        if os.path.exists(path):
+            df = load_table(path, dtypes=numeric_dtypes(path))
+            logger.info(f"✅ {path}: {len(df)} rows")
+        else:
+            logger.info(f"⚠️ Skipping missing source: {path}")
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
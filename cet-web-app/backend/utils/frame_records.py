@@ -0,0 +1,35 @@
+# backend/utils/frame_records.py
+"""
+Rows of a DataFrame as JSON-ready dicts.
+
+Same result as df.where(pd.notna(df), None).to_dict('records') for a slice
+of rows, without copying the frame: each column is converted once with
+tolist() (categoricals via their codes), missing values become None.
+"""
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+
+def column_values(column: pd.Series) -> list:
+    """Python values of a column, None for missing values"""
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        table = np.append(column.cat.categories.to_numpy(dtype=object), None)
+        return table[column.cat.codes.to_numpy()].tolist()
+    values = column.to_numpy()
+    missing = pd.isna(values)
+    if not missing.any():
+        return values.tolist()
+    values = values.astype(object)
+    values[missing] = None
+    return values.tolist()
+
+
+def frame_records(df: pd.DataFrame, start: int = 0, stop: Optional[int] = None,
+                  columns: Optional[Sequence[str]] = None) -> List[Dict]:
+    """Rows start:stop of `df` (optionally only `columns`) as dicts"""
+    names = list(columns) if columns is not None else list(df.columns)
+    rows = df.iloc[start:stop]
+    values = [column_values(rows[name]) for name in names]
+    return [dict(zip(names, row)) for row in zip(*values)]
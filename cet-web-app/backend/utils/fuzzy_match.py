@@ -0,0 +1,328 @@
+import re
+from bisect import bisect_left
+from collections import Counter
+from functools import lru_cache
+from itertools import chain
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+# Abbreviations students type that can't be derived from the names' initials.
+# alias -> lowercase text contained in the value(s) it stands for
+COLLEGE_ALIASES: Dict[str, Tuple[str, ...]] = {
+    'coep': ('coep technological university',),
+    'mkssss': ("cummins college of engineering for women",),
+    'vit': ('vishwakarma institute of technology',),
+    'viit': ('vishwakarma institute of information technology',),
+    'pccoe': ('pimpri chinchwad college of engineering',),
+    'mit': ('mit academy of engineering', 'maharashtra institute of technology'),
+    'dypatil': ('d. y. patil', 'd.y. patil', 'd y patil', 'dr. d. y. patil', 'dr. d.y. patil'),
+    'djsce': ('dwarkadas j. sanghvi',),
+    'tsec': ('thadomal shahani',),
+    'sggs': ('shri guru gobind singhji',),
+    'gcoe': ('government college of engineering',),
+    'gec': ('government college of engineering',),
+    'govt': ('government',),
+    'ict': ('institute of chemical technology',),
+    'wce': ('walchand college of engineering',),
+}
+
+BRANCH_ALIASES: Dict[str, Tuple[str, ...]] = {
+    'cs': ('computer science',),
+    'cse': ('computer science and engineering', 'computer engineering'),
+    'comp': ('computer engineering', 'computer science'),
+    'it': ('information technology',),
+    'infotech': ('information technology',),
+    'entc': ('electronics & telecommunication', 'electronics and telecommunication'),
+    'extc': ('electronics & telecommunication', 'electronics and telecommunication'),
+    'etc': ('electronics & telecommunication', 'electronics and telecommunication'),
+    'ece': ('electronics and communication',),
+    'eee': ('electrical and electronics',),
+    'ee': ('electrical engineering',),
+    'mech': ('mechanical engineering', 'mechanical'),
+    'chem': ('chemical',),
+    'aids': ('artificial intelligence and data science', 'artificial intelligence (ai) and data science'),
+    'aiml': ('artificial intelligence and machine learning',),
+    'ai': ('artificial intelligence',),
+    'ds': ('data science',),
+    'iot': ('internet of things', '(iot)'),
+    'prod': ('production',),
+    'instru': ('instrumentation',),
+}
+
+# Words skipped in the second acronym variant ("pccoe" and "pcce")
+ACRONYM_STOPWORDS = frozenset({'of', 'and', 'for', 'the', 'in', 'at'})
+
+_WORD = re.compile(r'[^\W_]+')
+_POSSESSIVE = re.compile(r"['’]s\b")
+_SEGMENT = re.compile(r'[,()\[\]\-–]')
+
+
+def normalize_alias(text: str) -> str:
+    """Lowercase letters and digits only: 'AI&DS' -> 'aids', 'D.Y. Patil' -> 'dypatil'"""
+    return ''.join(_WORD.findall(text.lower()))
+
+
+def words(text: str) -> List[str]:
+    """Lowercase words of `text`, possessive 's dropped"""
+    return _WORD.findall(_POSSESSIVE.sub('', text.lower()))
+
+
+def index_words(text: str) -> List[str]:
+    """words() plus runs of initials joined up ("D. Y. Patil" also gives 'dy')"""
+    tokens = words(text)
+    joined = []
+    run = ''
+    for token in tokens + ['']:
+        if len(token) == 1:
+            run += token
+            continue
+        if len(run) > 1:
+            joined.append(run)
+        run = ''
+    return tokens + joined
+
+
+def edit_distance(a: str, b: str, max_distance: int, prefix: bool = False) -> int:
+    """
+    Optimal string alignment distance (insert, delete, substitute, swap two
+    neighbours) between `a` and `b` (with `prefix`, the closest start of
+    `b`), or max_distance + 1 as soon as it is known to be larger: the cost
+    is bounded by the band, not len(a) * len(b).
+    """
+    k = max_distance
+    too_far = k + 1
+    if prefix:
+        b = b[:len(a) + k]
+    if len(a) - len(b) > k or (len(b) - len(a) > k and not prefix):
+        return too_far
+    if a == b or (prefix and b.startswith(a)):
+        return 0
+    # A shared start (and, for whole words, end) never needs edits
+    start = 0
+    while start < len(a) and start < len(b) and a[start] == b[start]:
+        start += 1
+    end = 0
+    while not prefix and end < len(a) - start and end < len(b) - start and a[-1 - end] == b[-1 - end]:
+        end += 1
+    a, b = a[start:len(a) - end], b[start:len(b) - end]
+    if not a:
+        return 0 if prefix else min(len(b), too_far)
+    if not b:
+        return min(len(a), too_far)
+    # Only cells within k of the diagonal can stay <= k; the rest hold too_far
+    previous2: Optional[List[int]] = None
+    previous = [j if j <= k else too_far for j in range(len(b) + 1)]
+    for i in range(1, len(a) + 1):
+        current = [too_far] * (len(b) + 1)
+        if i <= k:
+            current[0] = i
+        ca = a[i - 1]
+        row_min = current[0]
+        for j in range(max(1, i - k), min(len(b), i + k) + 1):
+            cb = b[j - 1]
+            value = previous[j - 1] if ca == cb else previous[j - 1] + 1
+            if previous[j] + 1 < value:
+                value = previous[j] + 1
+            if current[j - 1] + 1 < value:
+                value = current[j - 1] + 1
+            if previous2 is not None and j > 1 and ca == b[j - 2] and a[i - 2] == cb \
+                    and previous2[j - 2] + 1 < value:
+                value = previous2[j - 2] + 1
+            current[j] = value
+            if value < row_min:
+                row_min = value
+        if row_min > k:
+            return too_far
+        previous2, previous = previous, current
+    return min(min(previous) if prefix else previous[-1], too_far)
+
+
+class FuzzyMatcher:
+    """
+    Typo- and abbreviation-tolerant lookup over a fixed list of strings.
+
+    Built once per data version over the distinct values:
+    - aliases: the initials of every name segment (before commas/brackets),
+      with and without stop words, and their tails ('spit' for "Bhartiya
+      Vidya Bhavan's Sardar Patel Institute of Technology"), plus the
+      curated `aliases` table resolved against the values
+    - the distinct words of all values (and joined initials: 'dy' for
+      "D. Y. Patil"), with the values they occur in and a posting list of
+      their trigrams (front-padded with '$')
+
+    alias_matches() looks the whole query up in the aliases. match()
+    matches every query word to the value words sharing the most trigrams
+    with it (at most WORD_CANDIDATES of them), re-ranked by bounded edit
+    distance, either to the whole word or (slightly lower) its start, so
+    any query word may also be a word start ("pune inst comp"); a query
+    word that is an alias matches its values ("govt amravati"). A value
+    must match every query word; values are ranked by the summed word
+    similarity.
+    """
+
+    # Trigram-sharing words re-ranked by edit distance per query word
+    WORD_CANDIDATES = 12
+    # Query words whose matches are memoized (typeahead repeats the
+    # earlier words of a query on every keystroke)
+    WORD_CACHE_SIZE = 1024
+    # Shortest acronym tail kept as an alias
+    MIN_ACRONYM = 3
+
+    def __init__(self, values: Sequence[str], aliases: Optional[Dict[str, Iterable[str]]] = None):
+        self.values = list(values)
+        lower = [value.lower() for value in self.values]
+
+        # Alias -> positions, the curated table's before the derived acronyms'
+        derived: Dict[str, Set[int]] = {}
+        for position, value in enumerate(self.values):
+            for key in self._acronyms(value):
+                derived.setdefault(key, set()).add(position)
+        curated: Dict[str, List[int]] = {}
+        for alias, needles in (aliases or {}).items():
+            rows = self._needle_rows(lower, [needle.lower() for needle in needles])
+            if rows:
+                curated[normalize_alias(alias)] = rows
+        self._aliases = {
+            key: curated.get(key, []) + sorted(derived.get(key, set()).difference(curated.get(key, ())))
+            for key in set(derived) | set(curated)
+        }
+        self._alias_keys = sorted(self._aliases)
+
+        # Word vocabulary, word -> values, trigram -> words
+        word_ids: Dict[str, int] = {}
+        word_rows: List[Set[int]] = []
+        for position, value in enumerate(self.values):
+            for word in index_words(value):
+                word_id = word_ids.setdefault(word, len(word_ids))
+                if word_id == len(word_rows):
+                    word_rows.append(set())
+                word_rows[word_id].add(position)
+        self._words = list(word_ids)
+        self._word_ids = word_ids
+        self._sorted_words = sorted(self._words)
+        self._word_rows = [frozenset(rows) for rows in word_rows]
+        grams: Dict[str, List[int]] = {}
+        for word_id, word in enumerate(self._words):
+            for gram in set(self._trigrams(word)):
+                grams.setdefault(gram, []).append(word_id)
+        self._grams = grams
+        self._word_matches = lru_cache(maxsize=self.WORD_CACHE_SIZE)(self._word_matches)
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _trigrams(word: str) -> List[str]:
+        padded = '$' + word
+        return [padded[i:i + 3] for i in range(max(len(padded) - 2, 1))]
+
+    @staticmethod
+    def _needle_rows(lower: List[str], needles: List[str]) -> List[int]:
+        """
+        Positions of the values containing one of `needles`: equal to a needle
+        first, then starting with one, then the rest; ties by needle order
+        and position ('cse' lists "Computer Science and Engineering" first).
+        """
+        keys = {}
+        for position, text in enumerate(lower):
+            for order, needle in enumerate(needles):
+                if needle in text:
+                    tier = 0 if text == needle else 1 if text.startswith(needle) else 2
+                    key = (tier, order, position)
+                    keys[position] = min(key, keys.get(position, key))
+        return sorted(keys, key=keys.get)
+
+    @classmethod
+    def _acronyms(cls, value: str) -> Set[str]:
+        keys = set()
+        for segment in _SEGMENT.split(value):
+            tokens = words(segment)
+            for variant in (tokens, [t for t in tokens if t not in ACRONYM_STOPWORDS]):
+                initials = ''.join(token[0] for token in variant)
+                if len(initials) < 2:
+                    continue
+                keys.add(initials)
+                keys.update(initials[i:] for i in range(1, len(initials) - cls.MIN_ACRONYM + 1))
+        return keys
+
+    @staticmethod
+    def max_distance(word: str) -> int:
+        """Edits tolerated for a query word of this length"""
+        if len(word) <= 3:
+            return 0
+        if len(word) <= 5:
+            return 1
+        if len(word) <= 9:
+            return 2
+        return 3
+
+    def _candidate_words(self, query_word: str) -> List[str]:
+        """Words starting with `query_word` plus (if typos are allowed) those sharing most trigrams"""
+        lo = bisect_left(self._sorted_words, query_word)
+        hi = bisect_left(self._sorted_words, query_word + chr(0x10FFFF))
+        candidates = self._sorted_words[lo:hi]
+        if self.max_distance(query_word):
+            counts = Counter(chain.from_iterable(
+                self._grams.get(gram, ()) for gram in set(self._trigrams(query_word))
+            ))
+            candidates += [self._words[w] for w, _ in counts.most_common(self.WORD_CANDIDATES)]
+        return list(dict.fromkeys(candidates))
+
+    def _word_matches(self, query_word: str) -> Dict[int, float]:
+        """Value position -> best similarity (0-1] of one of its words to `query_word` (read-only)"""
+        limit = self.max_distance(query_word)
+        # An abbreviation inside a longer query ("govt amravati") counts as exact
+        scores: Dict[int, float] = dict.fromkeys(self._aliases.get(query_word, ()), 1.0)
+        for word in self._candidate_words(query_word):
+            distance = edit_distance(query_word, word, limit)
+            if distance > limit:
+                # Half-typed or shortened word: compare with the word's start,
+                # scored half an edit lower than a whole-word match
+                distance = edit_distance(query_word, word, limit, prefix=True) + 0.5
+                if distance > limit + 0.5:
+                    continue
+            score = 1.0 - distance / (len(query_word) + 1)
+            for position in self._word_rows[self._word_ids[word]]:
+                if score > scores.get(position, 0.0):
+                    scores[position] = score
+        return scores
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def alias_matches(self, query: str) -> Tuple[List[int], List[int]]:
+        """
+        Positions whose alias equals the query (curated aliases first), and
+        (for 3+ characters) those with an alias starting with it.
+        """
+        key = normalize_alias(query)
+        if not key:
+            return [], []
+        exact = self._aliases.get(key, [])
+        prefix: Set[int] = set()
+        if len(key) >= self.MIN_ACRONYM:
+            lo = bisect_left(self._alias_keys, key)
+            hi = bisect_left(self._alias_keys, key + chr(0x10FFFF))
+            for alias in self._alias_keys[lo:hi]:
+                if alias != key:
+                    prefix.update(self._aliases[alias])
+        return list(exact), sorted(prefix.difference(exact))
+
+    def match(self, query: str, limit: Optional[int] = None) -> List[int]:
+        """Positions of the values matching every query word within its edit budget, best first"""
+        query_words = words(query)
+        if not query_words:
+            return []
+        totals: Optional[Dict[int, float]] = None
+        for query_word in query_words:
+            scores = self._word_matches(query_word)
+            if totals is None:
+                totals = scores
+            else:
+                totals = {p: totals[p] + s for p, s in scores.items() if p in totals}
+            if not totals:
+                return []
+        # Ties: the shorter value has fewer unmatched words
+        ranked = sorted(totals, key=lambda p: (-totals[p], len(self.values[p]), p))
+        return ranked if limit is None else ranked[:limit]
@@ -0,0 +1,92 @@
+# backend/utils/http_cache.py
+"""
+Pre-encoded JSON responses for endpoints whose output only changes when the
+data reloads.
+
+    @bp.route('/colleges/stats')
+    @cached_json(version=lambda: runtime.current().version)
+    def get_college_stats(): ...
+
+The first successful (200, JSON) response per version and query string is
+kept as bytes together with a gzip copy and a strong ETag. Later requests
+are answered from those bytes; a matching If-None-Match gets 304 without
+calling the view at all. Error and streamed responses are never cached.
+"""
+import gzip
+import hashlib
+import os
+from functools import wraps
+from typing import Callable, Hashable, Optional
+
+from flask import Response, request
+
+from utils.cache import LRUCache
+from utils.streaming import stream_format
+
+GZIP_MIN_BYTES = int(os.getenv('GZIP_MIN_BYTES', '1024'))
+
+
+class EncodedPayload:
+    """One rendered response body plus its validators"""
+
+    __slots__ = ('body', 'gzipped', 'etag')
+
+    def __init__(self, body: bytes):
+        self.body = body
+        self.etag = hashlib.sha256(body).hexdigest()[:32]
+        self.gzipped = gzip.compress(body, compresslevel=6, mtime=0) if len(body) >= GZIP_MIN_BYTES else None
+
+    def response(self) -> Response:
+        use_gzip = self.gzipped is not None and request.accept_encodings['gzip'] > 0
+        body = self.gzipped if use_gzip else self.body
+        etag = f"{self.etag}-gz" if use_gzip else self.etag
+
+        if request.if_none_match.contains(self.etag) or request.if_none_match.contains(f"{self.etag}-gz"):
+            response = Response(status=304)
+        else:
+            response = Response(body, mimetype='application/json')
+            if use_gzip:
+                response.headers['Content-Encoding'] = 'gzip'
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = 'no-cache'
+        if self.gzipped is not None:
+            response.vary.add('Accept-Encoding')
+        return response
+
+
+def cached_json(version: Optional[Callable[[], Hashable]] = None, maxsize: int = 32):
+    """
+    Cache a view's JSON response per data `version` (a callable, e.g. the
+    runtime version; None for data that never changes) and query string.
+    """
+    def decorator(view):
+        cache = LRUCache(maxsize=maxsize, name=f"payload:{view.__name__}")
+
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            try:
+                streamed = stream_format() is not None
+            except ValueError:
+                streamed = False  # the view reports the bad format
+            if streamed:
+                # NDJSON/CSV exports (utils.streaming) are produced per request
+                return view(*args, **kwargs)
+            current = version() if version is not None else None
+            cache.bind_version(current)
+            # The version is part of the key too: a response rendered just
+            # before a reload must not be stored as the new version's payload
+            key = (current, request.path, request.query_string)
+            payload = cache.get(key)
+            if payload is None:
+                result = view(*args, **kwargs)
+                response = result[0] if isinstance(result, tuple) else result
+                status = result[1] if isinstance(result, tuple) and len(result) > 1 else response.status_code
+                # Streamed bodies (e.g. full-table exports) are never buffered
+                if status != 200 or not response.is_json or response.is_streamed:
+                    return result
+                payload = EncodedPayload(response.get_data())
+                cache.set(key, payload)
+            return payload.response()
+
+        return wrapper
+    return decorator
@@ -0,0 +1,124 @@
+# backend/utils/logger.py
+"""
+Structured logging for the backend.
+
+- Level comes from the LOG_LEVEL environment variable (default INFO)
+- Handlers only enqueue records; a background QueueListener does the actual
+  stdout writes, so request threads never block on console I/O
+- A per-request debug flag (X-Debug header or ?debug=1) lets DEBUG records
+  and expensive diagnostics through for that single request, even when the
+  process runs at INFO
+"""
+import atexit
+import contextvars
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+
+ROOT_LOGGER_NAME = 'cet'
+DEFAULT_FORMAT = '%(message)s'
+
+_request_debug = contextvars.ContextVar('request_debug', default=False)
+_setup_lock = threading.Lock()
+_listener = None
+_level = logging.INFO
+
+
+class _LevelOrRequestDebugFilter(logging.Filter):
+    """Pass records at/above the configured level, or anything when request debug is on"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return record.levelno >= _level or _request_debug.get()
+
+
+def setup_logging(level: str = None, fmt: str = None) -> logging.Logger:
+    """Configure the 'cet' logger tree once (idempotent)"""
+    global _listener, _level
+
+    with _setup_lock:
+        root = logging.getLogger(ROOT_LOGGER_NAME)
+        if _listener is not None:
+            return root
+
+        _level = logging.getLevelName((level or os.getenv('LOG_LEVEL', 'INFO')).upper())
+        if not isinstance(_level, int):
+            _level = logging.INFO
+
+        stream_handler = logging.StreamHandler(sys.stdout)
+        stream_handler.setFormatter(logging.Formatter(fmt or os.getenv('LOG_FORMAT', DEFAULT_FORMAT)))
+
+        log_queue = queue.SimpleQueue()
+        queue_handler = logging.handlers.QueueHandler(log_queue)
+        queue_handler.addFilter(_LevelOrRequestDebugFilter())
+
+        # Logger stays at DEBUG so per-request debug records are created;
+        # the handler filter decides what is actually emitted
+        root.setLevel(logging.DEBUG)
+        root.addHandler(queue_handler)
+        root.propagate = False
+
+        _listener = logging.handlers.QueueListener(log_queue, stream_handler)
+        _listener.start()
+        atexit.register(_stop_listener)
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=_restart_listener)
+        return root
+
+
+def _stop_listener() -> None:
+    if _listener is not None:
+        _listener.stop()
+
+
+def _restart_listener() -> None:
+    """Threads don't survive fork (gunicorn preload): give the child its own listener"""
+    global _listener
+    if _listener is None:
+        return
+    _listener = logging.handlers.QueueListener(_listener.queue, *_listener.handlers)
+    _listener.start()
+
+
+def get_logger(name: str) -> logging.Logger:
+    """Get a child logger of the application logger ('cet.<name>')"""
+    setup_logging()
+    return logging.getLogger(f'{ROOT_LOGGER_NAME}.{name}')
+
+
+def diagnostics_enabled() -> bool:
+    """True when debug diagnostics should run (DEBUG level or per-request debug)"""
+    return _level <= logging.DEBUG or _request_debug.get()
+
+
+def set_request_debug(enabled: bool) -> contextvars.Token:
+    """Enable/disable debug output for the current request; returns a reset token"""
+    return _request_debug.set(bool(enabled))
+
+
+def reset_request_debug(token: contextvars.Token) -> None:
+    try:
+        _request_debug.reset(token)
+    except ValueError:
+        # Token from another context (e.g. request handled across threads)
+        _request_debug.set(False)
+
+
+def init_app(app) -> None:
+    """Bind the per-request debug flag to Flask requests (X-Debug header or ?debug=1)"""
+    from flask import g, request
+
+    truthy = {'1', 'true', 'yes', 'on'}
+
+    @app.before_request
+    def _bind_request_debug():
+        flag = request.headers.get('X-Debug') or request.args.get('debug') or ''
+        g._request_debug_token = set_request_debug(flag.strip().lower() in truthy)
+
+    @app.teardown_request
+    def _reset_request_debug(exc=None):
+        token = g.pop('_request_debug_token', None)
+        if token is not None:
+            reset_request_debug(token)
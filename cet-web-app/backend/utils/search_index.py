@@ -0,0 +1,178 @@
+import re
+from bisect import bisect_left, bisect_right
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from utils.fuzzy_match import FuzzyMatcher
+
+
+class SearchIndex:
+    """
+    Typeahead index over a fixed list of strings (college names, branches,
+    cities, ...), matching like pandas `str.contains(query, case=False)`,
+    or like `query.lower() in value.lower()` with regex=False.
+
+    Built once per data version:
+    - lowercase copies of the values
+    - posting sets for every 1-, 2- and 3-gram, so a literal query only
+      verifies the values that contain all of its n-grams (a 1-3 character
+      query is a posting key itself)
+    - the sorted values and a sorted array of in-value word-start suffixes,
+      so the values that start with the query (or have a word that does)
+      are found by bisection for ranking
+
+    Queries containing regex syntax (or non-ASCII characters) are matched
+    with the same regex str.contains would use, against the distinct values
+    only. Values with non-ASCII characters skip the postings and are always
+    checked directly (with re.IGNORECASE in regex mode), so case folding
+    never differs from the scan it replaces.
+
+    search() returns positions into `values`: in value order, or ranked
+    (exact match, prefix, word prefix, other substring; ties in value order).
+    With fuzzy=True the query is plain text and the substring matches are
+    framed by a utils.fuzzy_match.FuzzyMatcher: abbreviations ("vjti",
+    "entc") first, typo-tolerant matches ("cumins") after.
+    """
+
+    MAX_GRAM = 3
+    # Intersect at most this many (rarest) trigram postings, and stop once
+    # this few candidates are left: verifying them is cheaper
+    MAX_INTERSECT = 4
+    VERIFY_CANDIDATES = 16
+    REGEX_CHARS = frozenset('.^$*+?{}[]\\|()')
+
+    def __init__(self, values: Sequence[str], aliases: Optional[Dict[str, Iterable[str]]] = None):
+        self.values = list(values)
+        self.lower = [value.lower() for value in self.values]
+        self.fuzzy = FuzzyMatcher(self.values, aliases)
+
+        postings: Dict[str, Set[int]] = {}
+        self._irregular = []
+        for position, text in enumerate(self.lower):
+            if not self.values[position].isascii():
+                self._irregular.append(position)
+                continue
+            for gram in self._ngrams(text, range(1, self.MAX_GRAM + 1)):
+                postings.setdefault(gram, set()).add(position)
+        self._postings = {gram: frozenset(positions) for gram, positions in postings.items()}
+
+        # Sorted (text, position) for whole values and for the suffixes that
+        # start right after a non-alphanumeric character
+        values = sorted((text, position) for position, text in enumerate(self.lower))
+        words = sorted(
+            (text[i:], position)
+            for position, text in enumerate(self.lower)
+            for i in range(1, len(text))
+            if not text[i - 1].isalnum()
+        )
+        self._value_keys = [text for text, _ in values]
+        self._value_rows = [position for _, position in values]
+        self._word_keys = [text for text, _ in words]
+        self._word_rows = [position for _, position in words]
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _ngrams(text: str, sizes: Sequence[int]) -> Set[str]:
+        return {text[i:i + n] for n in sizes for i in range(len(text) - n + 1)}
+
+    @classmethod
+    def is_literal(cls, query: str) -> bool:
+        """True when `query` means the same as a regex and as plain text (ASCII)"""
+        return query.isascii() and not cls.REGEX_CHARS.intersection(query)
+
+    def _regex_matches(self, pattern: 're.Pattern', positions) -> List[int]:
+        values = self.values
+        return [p for p in positions if pattern.search(values[p])]
+
+    def _literal_matches(self, query: str, regex: bool) -> List[int]:
+        needle = query.lower()
+        if len(needle) <= self.MAX_GRAM:
+            candidates = self._postings.get(needle, frozenset())
+        else:
+            grams = sorted(self._ngrams(needle, (self.MAX_GRAM,)),
+                           key=lambda g: len(self._postings.get(g, ())))
+            candidates = self._postings.get(grams[0], frozenset())
+            for gram in grams[1:self.MAX_INTERSECT]:
+                if len(candidates) <= self.VERIFY_CANDIDATES:
+                    break
+                candidates = candidates & self._postings.get(gram, frozenset())
+        lower = self.lower
+        matches = [p for p in candidates if needle in lower[p]]
+        if self._irregular:
+            if regex:
+                pattern = re.compile(re.escape(query), re.IGNORECASE)
+                matches += self._regex_matches(pattern, self._irregular)
+            else:
+                matches += [p for p in self._irregular if needle in lower[p]]
+        return sorted(matches)
+
+    @staticmethod
+    def _prefix_range(keys: List[str], prefix: str) -> Tuple[int, int]:
+        """Slice of the sorted `keys` that start with `prefix`"""
+        return bisect_left(keys, prefix), bisect_left(keys, prefix + chr(0x10FFFF))
+
+    def _rank(self, query: str, positions: List[int], limit: Optional[int]) -> List[int]:
+        """Exact, prefix and word-prefix matches first, then the rest; ties in value order"""
+        needle = query.lower()
+        lo, hi = self._prefix_range(self._value_keys, needle)
+        exact_end = bisect_right(self._value_keys, needle, lo, hi)
+        exact = sorted(self._value_rows[lo:exact_end])
+        prefix = sorted(self._value_rows[exact_end:hi])
+        lo, hi = self._prefix_range(self._word_keys, needle)
+        word = sorted(set(self._word_rows[lo:hi]).difference(exact, prefix))
+        if not (exact or prefix or word):
+            return positions
+
+        matched = set(positions)
+        head = [p for p in exact + prefix + word if p in matched]
+        if limit is not None and len(head) >= limit:
+            return head
+        ranked = set(head)
+        return head + [p for p in positions if p not in ranked]
+
+    def _fuzzy_search(self, query: str, limit: Optional[int]) -> List[int]:
+        """Alias matches, ranked substring matches, alias-prefix and typo matches"""
+        exact_alias, prefix_alias = self.fuzzy.alias_matches(query)
+        head = exact_alias + self._rank(query, self._literal_matches(query, regex=False), None)
+        head += prefix_alias
+        if limit is None or len(set(head)) < limit:
+            head += self.fuzzy.match(query)
+        return list(dict.fromkeys(head))
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def search(self, query: str, ranked: bool = False, limit: Optional[int] = None,
+               regex: bool = True, fuzzy: bool = False) -> List[int]:
+        """
+        Positions of the values containing `query`, case-insensitively. With
+        `regex` (default) a query with regex syntax is a pattern, as in
+        str.contains, and an invalid pattern raises re.error; otherwise the
+        query is plain text. `fuzzy` also returns abbreviation and typo
+        matches, always ranked (see the class docstring).
+        """
+        if fuzzy and query.strip():
+            positions = self._fuzzy_search(query.strip(), limit)
+            return positions if limit is None else positions[:limit]
+        if not query:
+            positions = list(range(len(self.values)))
+        elif not regex or self.is_literal(query):
+            positions = self._literal_matches(query, regex)
+        else:
+            pattern = re.compile(query, re.IGNORECASE)
+            positions = self._regex_matches(pattern, range(len(self.values)))
+        if ranked:
+            positions = self._rank(query, positions, limit)
+        return positions if limit is None else positions[:limit]
+
+    def search_values(self, query: str, ranked: bool = False, limit: Optional[int] = None,
+                      regex: bool = True, fuzzy: bool = False) -> List[str]:
+        """Matching values themselves (see search())"""
+        positions = self.search(query, ranked=ranked, limit=limit, regex=regex, fuzzy=fuzzy)
+        return [self.values[p] for p in positions]
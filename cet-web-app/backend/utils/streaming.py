@@ -0,0 +1,119 @@
+# backend/utils/streaming.py
+"""
+Streamed NDJSON/CSV exports for endpoints that return large row sets.
+
+    fmt = stream_format()           # None -> the endpoint's normal JSON
+    if fmt:
+        return stream_rows(frame_rows(df), fmt, filename='colleges')
+
+A client asks for a stream with ?format=ndjson / ?format=csv, or with
+`Accept: application/x-ndjson`. Rows are pulled from an iterator and
+encoded a chunk at a time, so memory stays flat (one chunk of dicts and
+its encoded text) and the first bytes go out before the last row is read.
+"""
+import csv
+import io
+import json
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional
+
+import pandas as pd
+from flask import Response, current_app, request, stream_with_context
+
+from utils.frame_records import frame_records
+
+NDJSON_MIMETYPE = 'application/x-ndjson'
+STREAM_FORMATS = ('ndjson', 'csv')
+
+# Rows encoded per yielded chunk
+STREAM_CHUNK_ROWS = 2000
+
+
+def stream_format() -> Optional[str]:
+    """
+    'ndjson' or 'csv' when the current request asks for a streamed export,
+    None for the normal JSON response. Raises ValueError for an unknown
+    ?format= value.
+    """
+    fmt = request.args.get('format', '').strip().lower()
+    if fmt:
+        if fmt == 'json':
+            return None
+        if fmt not in STREAM_FORMATS:
+            raise ValueError(f"format must be one of: json, {', '.join(STREAM_FORMATS)}")
+        return fmt
+    # Only an explicit preference: browsers send */* and get JSON
+    if request.accept_mimetypes.best == NDJSON_MIMETYPE:
+        return 'ndjson'
+    return None
+
+
+def frame_rows(df: pd.DataFrame, columns: Optional[List[str]] = None,
+               start: int = 0, stop: Optional[int] = None,
+               chunk_rows: int = STREAM_CHUNK_ROWS) -> Iterator[Dict]:
+    """Rows start:stop of `df` as dicts, converted one chunk at a time"""
+    stop = len(df) if stop is None else min(stop, len(df))
+    for chunk_start in range(start, stop, chunk_rows):
+        yield from frame_records(df, chunk_start, min(chunk_start + chunk_rows, stop), columns)
+
+
+def stream_rows(rows: Iterable[Dict], fmt: str, columns: Optional[List[str]] = None,
+                filename: str = 'export') -> Response:
+    """
+    Streamed response of `rows` as NDJSON (one object per line) or CSV
+    (header from `columns`, or the first row's keys). In CSV, list/dict
+    values are written as JSON and None as an empty cell.
+    """
+    if fmt == 'csv':
+        body = _csv_chunks(iter(rows), columns)
+        response = Response(stream_with_context(body), mimetype='text/csv')
+        response.headers['Content-Disposition'] = f'attachment; filename="{filename}.csv"'
+    else:
+        body = _ndjson_chunks(iter(rows), columns)
+        response = Response(stream_with_context(body), mimetype=NDJSON_MIMETYPE)
+    # Let proxies pass chunks through as they are produced
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+
+def _chunks(rows: Iterator[Dict]) -> Iterator[List[Dict]]:
+    while True:
+        chunk = list(islice(rows, STREAM_CHUNK_ROWS))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _ndjson_chunks(rows: Iterator[Dict], columns: Optional[List[str]]) -> Iterator[str]:
+    # One encoder with the app's JSON settings (provider.dumps per row is
+    # several times slower)
+    provider = current_app.json
+    encode = json.JSONEncoder(ensure_ascii=provider.ensure_ascii, sort_keys=provider.sort_keys,
+                              separators=(',', ':'), default=provider.default).encode
+    for chunk in _chunks(rows):
+        if columns is not None:
+            chunk = [{name: row.get(name) for name in columns} for row in chunk]
+        yield ''.join(encode(row) + '\n' for row in chunk)
+
+
+def _csv_value(value):
+    if isinstance(value, (list, dict)):
+        return json.dumps(value, default=str)
+    return value
+
+
+def _csv_chunks(rows: Iterator[Dict], columns: Optional[List[str]]) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = None
+    for chunk in _chunks(rows):
+        if writer is None:
+            columns = columns if columns is not None else list(chunk[0].keys())
+            writer = csv.writer(buffer)
+            writer.writerow(columns)
+        writer.writerows([_csv_value(row.get(name)) for name in columns] for row in chunk)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if writer is None and columns is not None:
+        # No rows: still send the header
+        yield ','.join(columns) + '\r\n'
@@ -78,7 +78,7 @@ export default function CollegeDirectory() {
     if (result.success) {
       setColleges(result.colleges);
       setAvailableCities(result.cities || []);
-      setLastUpdated(result.timestamp);
+      setLastUpdated(result.data_version_loaded_at);
       toast.success(`Loaded ${result.colleges.length} colleges`);
     } else {
       toast.error(result.error || 'Failed to load colleges');
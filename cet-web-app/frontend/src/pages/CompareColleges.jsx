@@ -9,7 +9,7 @@ import ComparisonGraph from '../components/compare/ComparisonGraph';
 import SelectedColleges from '../components/compare/SelectedColleges';
 import TrendInsights from '../components/compare/TrendInsights';
 import BranchCategorySelector from '../components/compare/BranchCategorySelector';
-import { debounce } from '../utils/helpers';
+import { columnarToComparisonData, debounce } from '../utils/helpers';
 import { MAX_COLLEGES_TO_COMPARE, STATUS_MESSAGES } from '../utils/constants';
 
 const CompareColleges = () => {
@@ -65,7 +65,7 @@ const CompareColleges = () => {
     try {
       setLoading(true);
       setError(null);
-      const data = await collegeApi.searchColleges(query, filters);
+      const data = await collegeApi.searchColleges(query, { ...filters, fuzzy: true });
       setColleges(Array.isArray(data) ? data : []);
     } catch (error) {
       console.error('Error searching colleges:', error);
@@ -92,9 +92,10 @@ const CompareColleges = () => {
       setError(null);
       
       const collegeCodes = selectedColleges.map(c => c.college_code);
-      const response = await collegeApi.compareColleges(collegeCodes, selectedBranch, selectedCategory);
+      // One columnar payload: every year and metric, no per-college follow-up calls
+      const response = await collegeApi.compareCollegesColumnar(collegeCodes, selectedBranch, selectedCategory);
       
-      const comparisonDataToSet = response.comparison_data || response;
+      const comparisonDataToSet = columnarToComparisonData(response);
       
       console.log('Comparison response:', response);
       console.log('Setting comparison data:', comparisonDataToSet);
@@ -91,12 +91,13 @@ export const collegeApi = {
     }
   },
 
-  // Search colleges by name
+  // Search colleges by name (filters.fuzzy: also match abbreviations and typos)
   searchColleges: async (query, filters = {}) => {
     try {
       const params = new URLSearchParams({ q: query });
       if (filters.city) params.append('city', filters.city);
       if (filters.type) params.append('type', filters.type);
+      if (filters.fuzzy) params.append('fuzzy', '1');
       
       const response = await api.get(`/colleges/search?${params.toString()}`);
       return response.data;
@@ -152,6 +153,23 @@ export const collegeApi = {
     }
   },
 
+  // Compare colleges in one columnar payload: years x colleges rank/percentile
+  // arrays plus per-college trends and stats (no per-college follow-up calls)
+  compareCollegesColumnar: async (collegeCodes, branch, category) => {
+    try {
+      const response = await api.post('/colleges/compare', {
+        college_codes: collegeCodes,
+        branch: branch,
+        category: category,
+        format: 'columnar',
+      });
+      return response.data;
+    } catch (error) {
+      console.error('Error comparing colleges (columnar):', error);
+      throw error;
+    }
+  },
+
   // Get recommendations based on rank
   getRecommendations: async (rank, category, preferences = {}) => {
     try {
@@ -139,6 +139,29 @@ export const calculateAverageRank = (data) => {
   return Math.round(sum / data.length);
 };
 
+/**
+ * Per-college year records ({ college_code: [{ year, closing_rank, ... }] })
+ * from a columnar /colleges/compare response (years x colleges arrays)
+ */
+export const columnarToComparisonData = (columnar) => {
+  const comparisonData = {};
+  (columnar.colleges || []).forEach((college, j) => {
+    comparisonData[college.college_code] = columnar.years
+      .map((year, i) => ({
+        year,
+        college_code: college.college_code,
+        college_name: college.college_name,
+        college_type: college.college_type,
+        branch_name: college.branch_name,
+        college_url: college.college_url,
+        closing_rank: columnar.closing_rank[i][j],
+        closing_percentile: columnar.closing_percentile[i][j]
+      }))
+      .filter(record => record.closing_rank !== null || record.closing_percentile !== null);
+  });
+  return comparisonData;
+};
+
 /**
  * Get college type short name
  */